@@ -1,10 +1,13 @@
 import logging
 
 from .annotation_helpers import (
-    add_annotation_bbox_to_json, add_annotation_cuboid_to_json,
-    add_annotation_ellipse_to_json, add_annotation_point_to_json,
-    add_annotation_polygon_to_json, add_annotation_polyline_to_json,
-    add_annotation_template_to_json
+    add_annotation_bbox_to_json, add_annotation_bboxes_to_json,
+    add_annotation_cuboid_to_json, add_annotation_ellipse_to_json,
+    add_annotation_point_to_json, add_annotation_points_to_json,
+    add_annotation_polygon_to_json, add_annotation_polygons_to_json,
+    add_annotation_polyline_to_json, add_annotation_template_to_json,
+    edit_annotation_json, edit_annotation_jsons_in_folder,
+    label_map_to_pixel_annotation, label_maps_to_pixel_preannotations
 )
 from .api import API
 from .common import (
@@ -15,26 +18,30 @@ from .common import (
 from .db.annotation_classes import (
     create_annotation_class, create_annotation_classes_from_classes_json,
     delete_annotation_class, download_annotation_classes_json,
-    search_annotation_classes
+    iter_annotation_classes, search_annotation_classes
 )
 from .db.exports import download_export, get_exports, prepare_export
 from .db.images import (
     add_annotation_bbox_to_image, add_annotation_cuboid_to_image,
     add_annotation_ellipse_to_image, add_annotation_point_to_image,
     add_annotation_polygon_to_image, add_annotation_polyline_to_image,
-    add_annotation_template_to_image, delete_image, download_image,
+    add_annotation_template_to_image, build_image_metadata_index,
+    clear_image_metadata_index, delete_image, download_image,
     download_image_annotations, download_image_preannotations,
-    get_image_annotations, get_image_bytes, get_image_metadata,
-    get_image_preannotations, search_images, set_image_annotation_status,
-    upload_annotations_from_json_to_image
+    edit_images_annotations, get_image_annotations, get_image_bytes,
+    get_image_metadata, get_images_annotations, get_image_preannotations,
+    iter_images, search_images, set_image_annotation_status,
+    set_images_annotation_statuses, upload_annotations_from_json_to_image
 )
 from .db.projects import (
-    copy_image, create_project, delete_project, get_project_image_count,
-    get_project_metadata, move_image, search_projects, share_project,
-    unshare_project, upload_annotations_from_folder_to_project,
-    upload_image_to_project, upload_images_from_folder_to_project,
+    copy_image, create_project, delete_project, download_images_from_project,
+    get_project_image_count, get_project_metadata, iter_projects, move_image,
+    search_projects, share_project, unshare_project,
+    upload_annotations_from_folder_to_project, upload_image_to_project,
+    upload_images_from_folder_to_project,
     upload_images_from_s3_bucket_to_project, upload_images_to_project,
-    upload_preannotations_from_folder_to_project
+    upload_preannotations_from_folder_to_project,
+    upload_preannotations_from_iterable
 )
 from .db.teams import (
     delete_team_contributor_invitation, invite_contributor_to_team
@@ -0,0 +1,8 @@
+"""asyncio variants of the SDK remote functions. Requires aiohttp
+(pip install -r requirements_aio.txt) and superannotate.init to be called
+before use.
+"""
+from .api import AsyncAPI
+from .exports import wait_for_export
+from .images import get_image_annotations, get_image_metadata, search_images
+from .projects import download_images_from_project, upload_images_to_project
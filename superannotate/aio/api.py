@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import os
+import weakref
+from pathlib import Path
+
+import aiohttp
+
+from ..api import API
+from ..exceptions import SABaseException
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+# same policy as the urllib3.Retry of the synchronous API session
+_RETRY_TOTAL = 5
+_RETRY_BACKOFF_FACTOR = 0.3
+_RETRY_STATUSES = (501, 502, 503, 504, 505, 506, 507, 508, 510, 511)
+_DEFAULT_LIMIT = 100
+
+
+def _should_retry(status, num_retry):
+    return status in _RETRY_STATUSES and num_retry < _RETRY_TOTAL
+
+
+def _retry_backoff(num_retry):
+    if num_retry <= 1:
+        return 0
+    return _RETRY_BACKOFF_FACTOR * (2**(num_retry - 1))
+
+
+class AsyncResponse:
+    """Fully read response with the requests.Response attributes used by the
+    SDK.
+    """
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncAPI:
+    """asyncio counterpart of the API class. Authenticates with the
+    configuration of superannotate.init. There is one instance per event loop,
+    used by all superannotate.aio functions. Use AsyncAPI.get_instance() and
+    close it with await close() before the loop finishes.
+    """
+    __instances = weakref.WeakKeyDictionary()
+
+    def __init__(self, limit=_DEFAULT_LIMIT):
+        self._api = API.get_instance()
+        self._limit = limit
+        self._session = None
+        self._download_session = None
+
+    @staticmethod
+    def get_instance(limit=None):
+        """Returns the instance of the running event loop.
+
+        :param limit: if not None, sets the maximum number of simultaneous
+         connections of each of the instance's sessions (API and storage).
+         Can be changed only before the first request or after close().
+        :type limit: int
+
+        :return: AsyncAPI of the event loop
+        :rtype: AsyncAPI
+        """
+        loop = asyncio.get_event_loop()
+        if loop not in AsyncAPI.__instances:
+            AsyncAPI.__instances[loop] = AsyncAPI()
+        instance = AsyncAPI.__instances[loop]
+        if limit is not None and limit != instance._limit:
+            sessions = (instance._session, instance._download_session)
+            if any(session is not None for session in sessions):
+                raise SABaseException(
+                    0, "AsyncAPI connection limit can't be changed while "
+                    "its sessions are open, close() it first"
+                )
+            instance._limit = limit
+        return instance
+
+    @property
+    def team_id(self):
+        return self._api.team_id
+
+    async def close(self):
+        for session in (self._session, self._download_session):
+            if session is not None:
+                await session.close()
+        self._session = None
+        self._download_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _create_session(self, headers):
+        connector = aiohttp.TCPConnector(
+            limit=self._limit, ssl=None if self._api._verify else False
+        )
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+
+    async def _request(self, session, method, url, **kwargs):
+        num_retry = 0
+        while True:
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+                    if not _should_retry(response.status, num_retry):
+                        return AsyncResponse(
+                            response.status, response.headers, content
+                        )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if num_retry == _RETRY_TOTAL:
+                    raise
+            num_retry += 1
+            await asyncio.sleep(_retry_backoff(num_retry))
+
+    async def send_request(self, req_type, path, params=None, json_req=None):
+        if self._api._main_endpoint is None:
+            raise SABaseException(
+                0, "superannotate.init should be called before AsyncAPI use"
+            )
+        if self._session is None:
+            self._session = self._create_session(self._api._default_headers)
+        if params is not None:
+            # same query encoding as requests
+            params = {
+                key: str(value)
+                for key, value in params.items() if value is not None
+            }
+        return await self._request(
+            self._session,
+            req_type,
+            self._api._main_endpoint + path,
+            params=params,
+            json=json_req
+        )
+
+    def _get_download_session(self):
+        if self._download_session is None:
+            self._download_session = self._create_session(None)
+        return self._download_session
+
+    async def download_request(self, url, headers=None):
+        """GET request to a (presigned) storage URL, without the API
+        authorization headers.
+        """
+        return await self._request(
+            self._get_download_session(), 'GET', url, headers=headers
+        )
+
+    async def download_to_file(
+        self, url, filepath, headers=None, chunk_size=1024 * 1024
+    ):
+        """Streams (presigned) storage URL to filepath through a temporary
+        .part file. Existing file is kept if its size matches the response
+        Content-Length.
+
+        :return: True if the file was downloaded, False if kept
+        :rtype: bool
+        """
+        filepath = Path(filepath)
+        session = self._get_download_session()
+        num_retry = 0
+        while True:
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if not _should_retry(response.status, num_retry):
+                        return await self._write_response(
+                            response, filepath, chunk_size
+                        )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if num_retry == _RETRY_TOTAL:
+                    raise
+            num_retry += 1
+            await asyncio.sleep(_retry_backoff(num_retry))
+
+    @staticmethod
+    async def _write_response(response, filepath, chunk_size):
+        if response.status >= 400:
+            raise SABaseException(
+                response.status, "Couldn't download " + filepath.name
+            )
+        content_length = response.content_length
+        if filepath.is_file() and content_length == filepath.stat().st_size:
+            return False
+        part_filepath = filepath.with_name(filepath.name + ".part")
+        with open(part_filepath, "wb") as f:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                f.write(chunk)
+        os.replace(part_filepath, filepath)
+        return True
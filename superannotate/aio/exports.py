@@ -0,0 +1,43 @@
+import logging
+
+from ..db.exports import _check_export_status, _log_export_wait
+from ..exceptions import SABaseException
+from ..waiter import async_wait_until
+from .api import AsyncAPI
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+
+async def _get_export(export):
+    params = {'team_id': export["team_id"], 'project_id': export["project_id"]}
+    response = await AsyncAPI.get_instance().send_request(
+        req_type='GET', path=f'/export/{export["id"]}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't get export. " + response.text
+        )
+    return response.json()
+
+
+async def wait_for_export(export, timeout=None):
+    """Waits until the prepared export finishes on server, polling its status
+    with exponential backoff.
+
+    :param export: metadata of the prepared export, returned from prepare_export
+    :type export: dict
+    :param timeout: seconds after which SABaseException is raised. If None waits indefinitely.
+    :type timeout: float
+
+    :return: metadata of the finished export, with "download" URL of the zip file
+    :rtype: dict
+    """
+    async def check():
+        return _check_export_status(await _get_export(export))
+
+    return await async_wait_until(
+        check,
+        timeout=timeout,
+        description=f"export ID {export['id']}",
+        on_wait=_log_export_wait
+    )
@@ -0,0 +1,194 @@
+import asyncio
+import io
+import logging
+
+from ..common import annotation_status_str_to_int
+from ..db.annotation_classes import _get_annotation_classes_id_to_name
+from ..db.images import (
+    _image_indexes, _image_indexes_lock, _root_folder_ids_cache
+)
+from ..exceptions import SABaseException
+from .api import AsyncAPI
+from .pagination import get_all_items
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+
+async def _get_project_root_folder_id(project):
+    # shares the root folder IDs cache with the synchronous API
+    folder_id = _root_folder_ids_cache.lookup(project["id"])
+    if folder_id is not None:
+        return folder_id
+    params = {'team_id': project['team_id']}
+    response = await AsyncAPI.get_instance().send_request(
+        req_type='GET', path=f'/project/{project["id"]}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    folder_id = response.json()['folder_id']
+    _root_folder_ids_cache.set(project["id"], folder_id)
+    return folder_id
+
+
+async def search_images(
+    project,
+    image_name_prefix=None,
+    annotation_status=None,
+    return_metadata=False
+):
+    """Search images by name_prefix (case-insensitive) and annotation status
+
+    :param project: project metadata in which the images are searched
+    :type project: dict
+    :param image_name_prefix: image name prefix for search
+    :type image_name_prefix: str
+    :param annotation_status: if not None, annotation statuses of images to filter,
+                              should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+
+    :param return_metadata: return metadata of images instead of names
+    :type return_metadata: bool
+
+    :return: metadata of found images or image names
+    :rtype: list of dicts or strs
+    """
+    team_id, project_id = project["team_id"], project["id"]
+    folder_id = await _get_project_root_folder_id(project)
+    if annotation_status is not None:
+        annotation_status = annotation_status_str_to_int(annotation_status)
+    params = {
+        'team_id': team_id,
+        'project_id': project_id,
+        'folder_id': folder_id,
+        'annotation_status': annotation_status
+    }
+    if image_name_prefix is not None:
+        params['name'] = image_name_prefix
+    images = await get_all_items('/images', params, "Couldn't search images ")
+    if return_metadata:
+        return images
+    return [image["name"] for image in images]
+
+
+async def get_image_metadata(project, image_name):
+    """Returns image metadata
+
+    :param project: project metadata
+    :type project: dict
+    :param image_name: image name
+    :type image: str
+
+    :return: metadata of image
+    :rtype: dict
+    """
+    with _image_indexes_lock:
+        index = _image_indexes.get(project["id"])
+        if index is not None and image_name in index:
+            return dict(index[image_name])
+    images = await search_images(project, image_name, return_metadata=True)
+    for image in images:
+        if image["name"] == image_name:
+            return image
+    raise SABaseException(
+        0, "Image " + image_name + " doesn't exist in the project " +
+        project["name"]
+    )
+
+
+async def _fill_annotation_class_names(project, annotation_json):
+    # unclassified instances have negative class IDs
+    class_ids = [
+        r["classId"] for r in annotation_json
+        if isinstance(r.get("classId"), int) and r["classId"] > 0
+    ]
+    # annotation classes cache is synchronous, misses are loaded off the loop
+    id_to_name = await asyncio.get_event_loop().run_in_executor(
+        None, _get_annotation_classes_id_to_name, project, class_ids
+    )
+    for r in annotation_json:
+        if "classId" in r and r["classId"] in id_to_name:
+            r["className"] = id_to_name[r["classId"]]
+
+
+async def get_image_annotations(project, image_name, project_type=None):
+    """Get annotations of the image.
+
+    :param project: project metadata
+    :type project: dict
+    :param image_name: image name or image metadata
+    :type image: str or dict
+
+    :return: dict object with following keys:
+        "annotation_json": dict object of the annotation,
+        "annotation_json_filename": filename on server,
+        "annotation_mask": mask (for pixel),
+        "annotation_mask_filename": mask filename on server
+    :rtype: dict
+    """
+    api = AsyncAPI.get_instance()
+    if isinstance(image_name, dict):
+        image = image_name
+    else:
+        image = await get_image_metadata(project, image_name)
+    team_id, project_id, image_id, folder_id = image["team_id"], image[
+        "project_id"], image["id"], image['folder_id']
+    if project_type is None:
+        project_type = project["type"]
+    params = {
+        'team_id': team_id,
+        'project_id': project_id,
+        'folder_id': folder_id
+    }
+    response = await api.send_request(
+        req_type='GET',
+        path=f'/image/{image_id}/annotation/getAnnotationDownloadToken',
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    res = response.json()
+
+    if project_type == 1:  # vector
+        url = res["objects"]["url"]
+        annotation_json_filename = url.rsplit('/', 1)[-1]
+        headers = res["objects"]["headers"]
+        response = await api.download_request(url, headers=headers)
+        if response.ok:
+            res_json = response.json()
+            await _fill_annotation_class_names(project, res_json)
+            return {
+                "annotation_json_filename": annotation_json_filename,
+                "annotation_json": res_json
+            }
+        if response.status_code == 403:
+            return {"annotation_json": None, "annotation_json_filename": None}
+        raise SABaseException(response.status_code, response.text)
+    else:  # pixel
+        url = res["pixelObjects"]["url"]
+        annotation_json_filename = url.rsplit('/', 1)[-1]
+        headers = res["pixelObjects"]["headers"]
+        response = await api.download_request(url, headers=headers)
+        if response.status_code == 403:
+            return {
+                "annotation_json": None,
+                "annotation_json_filename": None,
+                "annotation_mask": None,
+                "annotation_mask_filename": None
+            }
+        elif not response.ok:
+            raise SABaseException(response.status_code, response.text)
+        res_json = response.json()
+        await _fill_annotation_class_names(project, res_json)
+        url = res["pixelSave"]["url"]
+        annotation_mask_filename = url.rsplit('/', 1)[-1]
+        headers = res["pixelSave"]["headers"]
+        response = await api.download_request(url, headers=headers)
+        if not response.ok:
+            raise SABaseException(response.status_code, response.text)
+        mask = io.BytesIO(response.content)
+        return {
+            "annotation_json": res_json,
+            "annotation_json_filename": annotation_json_filename,
+            "annotation_mask": mask,
+            "annotation_mask_filename": annotation_mask_filename
+        }
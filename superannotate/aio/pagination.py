@@ -0,0 +1,52 @@
+import asyncio
+
+from ..db.pagination import _NUM_PAGE_THREADS
+from ..exceptions import SABaseException
+from .api import AsyncAPI
+
+
+async def _get_page(path, params, offset, error_message):
+    response = await AsyncAPI.get_instance().send_request(
+        req_type='GET', path=path, params=dict(params, offset=offset)
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, error_message + response.text
+        )
+    return response.json()
+
+
+async def get_all_items(
+    path, params, error_message, num_concurrent=_NUM_PAGE_THREADS
+):
+    """Returns all items of an offset paginated GET endpoint in order.
+    Coroutine counterpart of superannotate.db.pagination.iter_items: the
+    pages after the first one are requested concurrently, falling back to
+    sequential requests if a page comes back short.
+    """
+    res = await _get_page(path, params, 0, error_message)
+    items, count = res["data"], res["count"]
+    page_size = len(items)
+    if page_size > 0 and count > page_size:
+        semaphore = asyncio.Semaphore(num_concurrent)
+
+        async def get_page(offset):
+            async with semaphore:
+                return await _get_page(path, params, offset, error_message)
+
+        pages = await asyncio.gather(
+            *
+            (get_page(offset) for offset in range(page_size, count, page_size))
+        )
+        for res in pages:
+            items += res["data"]
+            count = res["count"]
+            if len(res["data"]) != page_size:
+                break
+    while count > len(items):
+        res = await _get_page(path, params, len(items), error_message)
+        count = res["count"]
+        if not res["data"]:
+            break
+        items += res["data"]
+    return items
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tqdm import tqdm
+
+from ..common import annotation_status_str_to_int
+from ..db.projects import (
+    _get_project_default_image_quality_in_editor, _get_sdk_image_upload_token,
+    _upload_image_to_aws, _UploadToken
+)
+from ..exceptions import SABaseException
+from .api import AsyncAPI
+from .images import search_images
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_NUM_WORKERS = 10
+_NUM_DOWNLOADS = 32
+
+
+async def _download_image_to_file(image, variant, filepath):
+    api = AsyncAPI.get_instance()
+    params = {
+        'team_id': image["team_id"],
+        'project_id': image["project_id"],
+        'folder_id': image["folder_id"],
+        'include_original': 1
+    }
+    response = await api.send_request(
+        req_type='GET',
+        path=f'/image/{image["id"]}/annotation/getAnnotationDownloadToken',
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't get image " + response.text
+        )
+    res = response.json()[variant]
+    return await api.download_to_file(
+        res["url"], filepath, headers=res["headers"]
+    )
+
+
+async def download_images_from_project(
+    project,
+    local_dir_path=".",
+    image_name_prefix=None,
+    annotation_status=None,
+    variant='original',
+    num_downloads=None
+):
+    """Downloads images of the project to local_dir_path. At most
+    num_downloads images are downloaded concurrently. Images already present
+    in local_dir_path with the same size are not downloaded again.
+
+    :param project: project metadata
+    :type project: dict
+    :param local_dir_path: where to download the images
+    :type local_dir_path: Pathlike (str or Path)
+    :param image_name_prefix: if not None, only images with the name prefix are downloaded
+    :type image_name_prefix: str
+    :param annotation_status: if not None, only images with the annotation status are downloaded,
+                              should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+    :param variant: which resolution to download, can be 'original' or 'lores'
+     (low resolution used in web editor)
+    :type variant: str
+    :param num_downloads: number of concurrent downloads. If None default value will be used.
+    :type num_downloads: int
+
+    :return: filepaths of downloaded (or already present) images and names of images that couldn't be downloaded
+    :rtype: tuple (list of strs, list of strs)
+    """
+    if not Path(local_dir_path).is_dir():
+        raise SABaseException(
+            0, f"local_dir_path {local_dir_path} is not an existing directory"
+        )
+    if num_downloads is None:
+        num_downloads = _NUM_DOWNLOADS
+    images = await search_images(
+        project,
+        image_name_prefix,
+        annotation_status=annotation_status,
+        return_metadata=True
+    )
+    logger.info(
+        "Downloading %s images from project %s to %s.", len(images),
+        project["name"], local_dir_path
+    )
+    semaphore = asyncio.Semaphore(num_downloads)
+    downloaded = [False] * len(images)
+    filepaths = []
+    for image in images:
+        image_name = image["name"]
+        if variant == "lores":
+            image_name += "___lores.jpg"
+        filepaths.append(Path(local_dir_path) / image_name)
+
+    with tqdm(total=len(images)) as pbar:
+
+        async def download(i):
+            async with semaphore:
+                try:
+                    await _download_image_to_file(
+                        images[i], variant, filepaths[i]
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Couldn't download image %s: %s", images[i]["name"], e
+                    )
+                else:
+                    downloaded[i] = True
+                pbar.update(1)
+
+        await asyncio.gather(*(download(i) for i in range(len(images))))
+    failed_images = [
+        image["name"] for i, image in enumerate(images) if not downloaded[i]
+    ]
+    logger.info(
+        "Downloaded %s images, %s failed.",
+        len(images) - len(failed_images), len(failed_images)
+    )
+    downloaded_filepaths = [
+        str(filepaths[i]) for i in range(len(images)) if downloaded[i]
+    ]
+    return downloaded_filepaths, failed_images
+
+
+async def _create_images(project, img_paths, annotation_status, remote_dir):
+    data = {
+        "project_id": str(project["id"]),
+        "team_id": str(project["team_id"]),
+        "images":
+            [
+                {
+                    "name": Path(path).name,
+                    "path": remote_dir + Path(path).name
+                } for path in img_paths
+            ],
+        "annotation_status": annotation_status
+    }
+    response = await AsyncAPI.get_instance().send_request(
+        req_type='POST', path='/image/ext-create', json_req=data
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't ext-create image " + response.text
+        )
+
+
+async def upload_images_to_project(
+    project,
+    img_paths,
+    annotation_status="NotStarted",
+    from_s3_bucket=None,
+    image_quality_in_editor=None,
+    num_workers=None
+):
+    """Uploads all images given in list of path objects in img_paths to the project.
+    Sets status of all the uploaded images to set_status if it is not None.
+    Images are read, resized and put to storage by num_workers threads, the
+    platform requests are sent from the event loop.
+
+    :param project: metadata of project to upload images to
+    :type project: dict
+    :param img_paths: list of Pathlike (str or Path) objects to upload
+    :type img_paths: list
+    :param annotation_status: value to set the annotation statuses of the uploaded images NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+    :param from_s3_bucket: AWS S3 bucket to use. If None then folder_path is in local filesystem
+    :type from_s3_bucket: str
+    :param image_quality_in_editor: image quality (in percents) that will be seen in SuperAnnotate web annotation editor. If None default value will be used.
+    :type image_quality_in_editor: int
+    :param num_workers: number of image upload threads. If None default value will be used.
+    :type num_workers: int
+
+    :return: uploaded images' filepaths
+    :rtype: list of str
+    """
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    if num_workers is None:
+        num_workers = _NUM_WORKERS
+    logger.info(
+        "Uploading %s images to project ID %s.", len(img_paths), project["id"]
+    )
+    if len(img_paths) == 0:
+        return []
+    loop = asyncio.get_event_loop()
+    uploaded = [False] * len(img_paths)
+    with ThreadPoolExecutor(num_workers) as executor:
+        if image_quality_in_editor is None:
+            image_quality_in_editor = await loop.run_in_executor(
+                executor, _get_project_default_image_quality_in_editor, project
+            )
+        upload_token = await loop.run_in_executor(
+            executor, _UploadToken,
+            lambda: _get_sdk_image_upload_token(project)
+        )
+        to_create = {}
+        create_tasks = []
+
+        async def create_batch(batch, prefix):
+            try:
+                await _create_images(
+                    project, [img_paths[i] for i in batch], annotation_status,
+                    prefix
+                )
+            except Exception as e:
+                logger.warning("Couldn't create %s images %s", len(batch), e)
+            else:
+                for i in batch:
+                    uploaded[i] = True
+
+        async def upload(i):
+            try:
+                prefix = await loop.run_in_executor(
+                    executor, _upload_image_to_aws, img_paths[i], project,
+                    upload_token, image_quality_in_editor, from_s3_bucket
+                )
+            except Exception as e:
+                logger.warning("Couldn't upload image %s %s", img_paths[i], e)
+                return
+            finally:
+                pbar.update(1)
+            batch = to_create.setdefault(prefix, [])
+            batch.append(i)
+            if len(batch) >= 100:
+                to_create[prefix] = []
+                create_tasks.append(
+                    asyncio.ensure_future(create_batch(batch, prefix))
+                )
+
+        with tqdm(total=len(img_paths)) as pbar:
+            await asyncio.gather(*(upload(i) for i in range(len(img_paths))))
+        for prefix, batch in to_create.items():
+            if batch:
+                create_tasks.append(
+                    asyncio.ensure_future(create_batch(batch, prefix))
+                )
+        await asyncio.gather(*create_tasks)
+    logger.info("Number of images uploaded %s.", sum(uploaded))
+    return [str(path) for path, ok in zip(img_paths, uploaded) if ok]
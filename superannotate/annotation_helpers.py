@@ -1,15 +1,205 @@
+import collections
 import json
+import os
+from pathlib import Path
+
+import numpy as np
 
 from .exceptions import SABaseException
 
+_MAX_LOADED_JSONS = 64
+
+
+class _AnnotationJSONBuffer:
+    """Annotation JSON file loaded once and edited in memory. The file is
+    read on first access and written back with flush, through a temporary
+    .part file replacing the original, so that it is never left half
+    written. close flushes and releases the loaded JSON, it is loaded again
+    on next access.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._annotations = None
+        self._modified = False
+
+    @property
+    def annotations(self):
+        """Annotations in SuperAnnotate format JSON. An empty list if the file
+        doesn't exist yet. Changes made directly to the list should be
+        followed by mark_modified, otherwise flush doesn't write them.
+        """
+        if self._annotations is None:
+            if self.path.exists():
+                with open(self.path) as f:
+                    self._annotations = json.load(f)
+            else:
+                self._annotations = []
+        return self._annotations
+
+    def mark_modified(self):
+        self._modified = True
+
+    def append(self, annotation):
+        self.annotations.append(annotation)
+        self._modified = True
+
+    def extend(self, annotations):
+        self.annotations.extend(annotations)
+        self._modified = True
+
+    def flush(self):
+        if not self._modified:
+            return
+        part_path = self.path.with_name(self.path.name + ".part")
+        with open(part_path, "w") as f:
+            json.dump(self._annotations, f)
+        os.replace(part_path, self.path)
+        self._modified = False
+
+    def discard(self):
+        self._annotations = None
+        self._modified = False
+
+    def close(self):
+        self.flush()
+        self._annotations = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class _AnnotationJSONFolderWriter:
+    """Annotation JSON buffers of the files in a folder. At most
+    max_loaded_jsons buffers are kept loaded, the least recently used one is
+    flushed and released when another is loaded.
+    """
+    def __init__(self, folder_path, max_loaded_jsons=_MAX_LOADED_JSONS):
+        if max_loaded_jsons < 1:
+            raise SABaseException(0, "max_loaded_jsons should be positive")
+        self.folder_path = Path(folder_path)
+        self._max_loaded_jsons = max_loaded_jsons
+        self._buffers = {}
+        self._loaded = collections.OrderedDict()
+
+    def __getitem__(self, json_name):
+        """Returns annotation JSON buffer of the file json_name in the folder,
+        e.g., "<image_name>___objects.json". The buffer can be passed to
+        add_annotation_*_to_json functions.
+        """
+        buffer = self._buffers.get(json_name)
+        if buffer is None:
+            buffer = _AnnotationJSONBuffer(self.folder_path / json_name)
+            self._buffers[json_name] = buffer
+        # buffers are loaded on first access of annotations, so the buffer
+        # is counted as loaded from the moment it is handed out
+        self._loaded[json_name] = buffer
+        self._loaded.move_to_end(json_name)
+        self._release_least_recently_used()
+        return buffer
+
+    def _release_least_recently_used(self):
+        while len(self._loaded) > self._max_loaded_jsons:
+            _, buffer = self._loaded.popitem(last=False)
+            buffer.close()
+
+    def flush(self):
+        # buffers released earlier are reloaded if they are used again, so
+        # all of them are flushed, the released ones are not modified
+        for buffer in self._buffers.values():
+            buffer.flush()
+
+    def close(self):
+        for buffer in self._buffers.values():
+            buffer.close()
+        self._loaded.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            for buffer in self._buffers.values():
+                buffer.discard()
+            self._loaded.clear()
+
+
+def edit_annotation_json(path):
+    """Returns buffer of SuperAnnotate format annotation JSON file that can be
+    passed to add_annotation_*_to_json functions instead of the filepath. The
+    file is read once and written once when the with block exits, instead of
+    on each add. The file is created if it doesn't exist. If the with
+    block raises, the edits are discarded.
+
+    Example::
+
+        with sa.edit_annotation_json(path) as annotation_json:
+            for bbox in bboxes:
+                sa.add_annotation_bbox_to_json(annotation_json, bbox, "car")
+
+    :param path: filepath to JSON
+    :type path: Pathlike (str or Path)
+
+    :return: annotation JSON buffer, its annotations attribute is the JSON
+     list, flush() writes the edits to the file
+    """
+    return _AnnotationJSONBuffer(path)
+
+
+def edit_annotation_jsons_in_folder(
+    folder_path, max_loaded_jsons=_MAX_LOADED_JSONS
+):
+    """Returns writer of SuperAnnotate format annotation JSON files in the
+    folder. writer[json_name] is the buffer of the file (see
+    edit_annotation_json), e.g., writer[image_name + "___objects.json"]. At
+    most max_loaded_jsons files are kept in memory, the least recently used
+    one is written and released when another one is needed. All files are
+    written when the with block exits. If it raises, the edits not yet
+    written are discarded.
+
+    :param folder_path: folder of the JSONs
+    :type folder_path: Pathlike (str or Path)
+    :param max_loaded_jsons: maximum number of JSONs kept in memory
+    :type max_loaded_jsons: int
+
+    :return: annotation JSONs writer
+    """
+    return _AnnotationJSONFolderWriter(folder_path, max_loaded_jsons)
+
+
+def _add_annotations(annotation_json, annotations):
+    if isinstance(annotation_json, _AnnotationJSONBuffer):
+        annotation_json.extend(annotations)
+        return annotation_json.annotations
+    if annotation_json is None:
+        return list(annotations)
+    if isinstance(annotation_json, list):
+        annotation_json.extend(annotations)
+        return annotation_json
+    with _AnnotationJSONBuffer(annotation_json) as buffer:
+        buffer.extend(annotations)
+        return buffer.annotations
+
+
+def _add_annotation(annotation_json, annotation):
+    return _add_annotations(annotation_json, [annotation])
+
 
 def add_annotation_bbox_to_json(
     annotation_json, bbox, annotation_class_name, error=None
 ):
     """Add a bounding box annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param bbox: 4 element list of top-left x,y and bottom-right x, y coordinates
     :type bbox: list of floats
     :param annotation_class_name: annotation class name
@@ -21,11 +211,6 @@ def add_annotation_bbox_to_json(
     if len(bbox) != 4:
         raise SABaseException(0, "Bounding boxes should have 4 float elements")
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "bbox",
         "points": {
@@ -42,13 +227,7 @@ def add_annotation_bbox_to_json(
         "visible": True,
         "attributes": [],
     }
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
-
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+    return _add_annotation(annotation_json, annotation)
 
 
 def add_annotation_polygon_to_json(
@@ -56,8 +235,9 @@ def add_annotation_polygon_to_json(
 ):
     """Add a polygon annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param polygon: [x1,y1,x2,y2,...] list of coordinates
     :type polygon: list of floats
     :param annotation_class_name: annotation class name
@@ -70,11 +250,6 @@ def add_annotation_polygon_to_json(
             0, "Polygons should be even length lists of floats."
         )
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "polygon",
         "points": polygon,
@@ -86,13 +261,7 @@ def add_annotation_polygon_to_json(
         "visible": True,
         "attributes": [],
     }
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
-
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+    return _add_annotation(annotation_json, annotation)
 
 
 def add_annotation_polyline_to_json(
@@ -100,8 +269,9 @@ def add_annotation_polyline_to_json(
 ):
     """Add a polyline annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param polyline: [x1,y1,x2,y2,...] list of coordinates
     :type polyline: list of floats
     :param annotation_class_name: annotation class name
@@ -115,11 +285,6 @@ def add_annotation_polyline_to_json(
             0, "Polylines should be even length lists of floats."
         )
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "polyline",
         "points": polyline,
@@ -131,13 +296,7 @@ def add_annotation_polyline_to_json(
         "visible": True,
         "attributes": [],
     }
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
-
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+    return _add_annotation(annotation_json, annotation)
 
 
 def add_annotation_point_to_json(
@@ -145,8 +304,9 @@ def add_annotation_point_to_json(
 ):
     """Add a point annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param point: [x,y] list of coordinates
     :type point: list of floats
     :param annotation_class_name: annotation class name
@@ -157,11 +317,6 @@ def add_annotation_point_to_json(
     if len(point) != 2:
         raise SABaseException(0, "Point should be 2 element float list.")
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "point",
         "x": point[0],
@@ -174,13 +329,7 @@ def add_annotation_point_to_json(
         "visible": True,
         "attributes": [],
     }
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
-
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+    return _add_annotation(annotation_json, annotation)
 
 
 def add_annotation_ellipse_to_json(
@@ -188,8 +337,9 @@ def add_annotation_ellipse_to_json(
 ):
     """Add an ellipse annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param ellipse: [center_x, center_y, r_x, r_y, angle]
                     list of coordinates and rotation angle in degrees around y
                     axis
@@ -202,11 +352,6 @@ def add_annotation_ellipse_to_json(
     if len(ellipse) != 5:
         raise SABaseException(0, "Ellipse should be 5 element float list.")
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "ellipse",
         "cx": ellipse[0],
@@ -222,13 +367,7 @@ def add_annotation_ellipse_to_json(
         "visible": True,
         "attributes": [],
     }
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
-
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+    return _add_annotation(annotation_json, annotation)
 
 
 def add_annotation_template_to_json(
@@ -240,8 +379,9 @@ def add_annotation_template_to_json(
 ):
     """Add a template annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param template_points: [x1,y1,x2,y2,...] list of coordinates
     :type template_points: list of floats
     :param template_connections: [from_id_1,to_id_1,from_id_2,to_id_2,...]
@@ -264,11 +404,6 @@ def add_annotation_template_to_json(
             0, "template_connections should be even length lists of ints."
         )
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "template",
         "points": [],
@@ -297,13 +432,7 @@ def add_annotation_template_to_json(
                 "to": template_connections[i + 1]
             }
         )
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
-
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+    return _add_annotation(annotation_json, annotation)
 
 
 def add_annotation_cuboid_to_json(
@@ -311,8 +440,9 @@ def add_annotation_cuboid_to_json(
 ):
     """Add a cuboid annotation to SuperAnnotate format annotation JSON
 
-    :param annotation_json: annotations in SuperAnnotate format JSON or filepath to JSON
-    :type annotation_json: list or Pathlike (str or Path)
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
     :param cuboid: [x_front_tl,y_front_tl,x_front_br,y_front_br,
                     x_rear_tl,y_rear_tl,x_rear_br,y_rear_br] list of coordinates
                     of front rectangle and back rectangle, in top-left (tl) and
@@ -326,11 +456,6 @@ def add_annotation_cuboid_to_json(
     if len(cuboid) != 8:
         raise SABaseException(0, "cuboid should be lenght 8 list of floats.")
 
-    path = None
-    if not isinstance(annotation_json, list) and annotation_json is not None:
-        path = annotation_json
-        annotation_json = json.load(open(annotation_json))
-
     annotation = {
         "type": "cuboid",
         "points":
@@ -360,10 +485,310 @@ def add_annotation_cuboid_to_json(
         "visible": True,
         "attributes": [],
     }
-    if annotation_json is None:
-        annotation_json = []
-    annotation_json.append(annotation)
+    return _add_annotation(annotation_json, annotation)
+
+
+def _per_annotation_values(values, num_annotations, name):
+    if isinstance(values, str) or values is None:
+        return [values] * num_annotations
+    values = list(values)
+    if len(values) != num_annotations:
+        raise SABaseException(
+            0, f"{name} should have one value per annotation, "
+            f"got {len(values)} for {num_annotations} annotations"
+        )
+    return values
+
+
+def _coordinates_array(coordinates, num_coordinates, name):
+    coordinates = np.asarray(coordinates, dtype=float)
+    if coordinates.size == 0:
+        coordinates = coordinates.reshape(0, num_coordinates)
+    if coordinates.ndim != 2 or coordinates.shape[1] != num_coordinates:
+        raise SABaseException(
+            0, f"{name} should be Nx{num_coordinates} array of floats, got "
+            f"shape {coordinates.shape}"
+        )
+    return coordinates
+
+
+def _probabilities(scores, num_annotations):
+    if scores is None:
+        return [None] * num_annotations
+    scores = np.asarray(scores, dtype=float)
+    if scores.shape != (num_annotations, ):
+        raise SABaseException(
+            0, f"scores should have one value per annotation, got shape "
+            f"{scores.shape} for {num_annotations} annotations"
+        )
+    return np.rint(scores * 100).astype(int).tolist()
+
+
+def _annotation_common(annotation_class_name, probability, error):
+    common = {
+        "className": annotation_class_name,
+        "error": error,
+        "groupId": 0,
+        "pointLabels": {},
+        "locked": False,
+        "visible": True,
+        "attributes": [],
+    }
+    if probability is not None:
+        common["probability"] = probability
+    return common
+
+
+def add_annotation_bboxes_to_json(
+    annotation_json, bboxes, annotation_class_names, scores=None, error=None
+):
+    """Add bounding box annotations given as an array to SuperAnnotate format
+    annotation JSON, e.g., detector output. Same as calling
+    add_annotation_bbox_to_json for each row, but the JSON is loaded and
+    written once.
+
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
+    :param bboxes: Nx4 array of top-left x,y and bottom-right x, y coordinates
+    :type bboxes: numpy.ndarray or list of lists of floats
+    :param annotation_class_names: annotation class name of all bounding boxes or
+     list of N class names
+    :type annotation_class_names: str or list of strs
+    :param scores: if not None, N confidence scores in [0, 1], set as annotation
+     probability in percents
+    :type scores: numpy.ndarray or list of floats
+    :param error: if not None, marks annotations as error (True) or no-error (False)
+    :type error: bool
+
+    :return: annotations in SuperAnnotate format JSON
+    :rtype: list
+    """
+    bboxes = _coordinates_array(bboxes, 4, "bboxes")
+    num_bboxes = len(bboxes)
+    class_names = _per_annotation_values(
+        annotation_class_names, num_bboxes, "annotation_class_names"
+    )
+    probabilities = _probabilities(scores, num_bboxes)
+    annotations = [
+        {
+            "type": "bbox",
+            "points": {
+                "x1": x1,
+                "y1": y1,
+                "x2": x2,
+                "y2": y2
+            },
+            **_annotation_common(class_name, probability, error)
+        } for (x1, y1, x2, y2), class_name, probability in
+        zip(bboxes.tolist(), class_names, probabilities)
+    ]
+    return _add_annotations(annotation_json, annotations)
 
-    if path is not None:
-        json.dump(annotation_json, open(path, "w"))
-    return annotation_json
+
+def add_annotation_polygons_to_json(
+    annotation_json, polygons, annotation_class_names, scores=None, error=None
+):
+    """Add polygon annotations to SuperAnnotate format annotation JSON, e.g.,
+    segmentation model output. Same as calling add_annotation_polygon_to_json
+    for each polygon, but the JSON is loaded and written once.
+
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
+    :param polygons: NxM array of [x1,y1,x2,y2,...] coordinates if all polygons
+     have M/2 points, or list of N such 1D arrays or lists otherwise
+    :type polygons: numpy.ndarray or list
+    :param annotation_class_names: annotation class name of all polygons or
+     list of N class names
+    :type annotation_class_names: str or list of strs
+    :param scores: if not None, N confidence scores in [0, 1], set as annotation
+     probability in percents
+    :type scores: numpy.ndarray or list of floats
+    :param error: if not None, marks annotations as error (True) or no-error (False)
+    :type error: bool
+
+    :return: annotations in SuperAnnotate format JSON
+    :rtype: list
+    """
+    if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+        if polygons.shape[1] % 2 != 0:
+            raise SABaseException(
+                0, "Polygons should be even length lists of floats."
+            )
+        polygons = polygons.astype(float).tolist()
+    else:
+        polygons = [np.asarray(polygon, dtype=float) for polygon in polygons]
+        if any(
+            polygon.ndim != 1 or len(polygon) % 2 != 0 for polygon in polygons
+        ):
+            raise SABaseException(
+                0, "Polygons should be even length lists of floats."
+            )
+        polygons = [polygon.tolist() for polygon in polygons]
+    num_polygons = len(polygons)
+    class_names = _per_annotation_values(
+        annotation_class_names, num_polygons, "annotation_class_names"
+    )
+    probabilities = _probabilities(scores, num_polygons)
+    annotations = [
+        {
+            "type": "polygon",
+            "points": polygon,
+            **_annotation_common(class_name, probability, error)
+        } for polygon, class_name, probability in
+        zip(polygons, class_names, probabilities)
+    ]
+    return _add_annotations(annotation_json, annotations)
+
+
+def add_annotation_points_to_json(
+    annotation_json, points, annotation_class_names, scores=None, error=None
+):
+    """Add point annotations given as an array to SuperAnnotate format
+    annotation JSON, e.g., keypoint detector output. Same as calling
+    add_annotation_point_to_json for each row, but the JSON is loaded and
+    written once.
+
+    :param annotation_json: annotations in SuperAnnotate format JSON, filepath to JSON or
+     buffer returned by edit_annotation_json
+    :type annotation_json: list or Pathlike (str or Path) or buffer
+    :param points: Nx2 array of x,y coordinates
+    :type points: numpy.ndarray or list of lists of floats
+    :param annotation_class_names: annotation class name of all points or
+     list of N class names
+    :type annotation_class_names: str or list of strs
+    :param scores: if not None, N confidence scores in [0, 1], set as annotation
+     probability in percents
+    :type scores: numpy.ndarray or list of floats
+    :param error: if not None, marks annotations as error (True) or no-error (False)
+    :type error: bool
+
+    :return: annotations in SuperAnnotate format JSON
+    :rtype: list
+    """
+    points = _coordinates_array(points, 2, "points")
+    num_points = len(points)
+    class_names = _per_annotation_values(
+        annotation_class_names, num_points, "annotation_class_names"
+    )
+    probabilities = _probabilities(scores, num_points)
+    annotations = [
+        {
+            "type": "point",
+            "x": x,
+            "y": y,
+            **_annotation_common(class_name, probability, error)
+        } for (x, y), class_name, probability in
+        zip(points.tolist(), class_names, probabilities)
+    ]
+    return _add_annotations(annotation_json, annotations)
+
+
+def _pixel_instance_colors(num_instances):
+    # same colors as the platform assigns, instance i is color 15 * i
+    color_values = np.arange(num_instances + 1, dtype=np.uint32) * 15
+    colors = np.zeros((num_instances + 1, 4), dtype=np.uint8)
+    colors[:, 0] = (color_values >> 16) & 255
+    colors[:, 1] = (color_values >> 8) & 255
+    colors[:, 2] = color_values & 255
+    colors[1:, 3] = 255
+    return colors, ['#%06x' % value for value in color_values[1:].tolist()]
+
+
+def _label_map_to_colors(label_map):
+    max_label = int(label_map.max()) if label_map.size else 0
+    if max_label <= label_map.size:
+        # lookup table over label values isn't larger than the label map
+        present = np.bincount(label_map.ravel(), minlength=1) > 0
+        present[0] = False
+        labels = np.flatnonzero(present)
+        colors, hex_colors = _pixel_instance_colors(len(labels))
+        lut = np.zeros((max_label + 1, 4), dtype=np.uint8)
+        lut[labels] = colors[1:]
+        return labels, lut[label_map], hex_colors
+    labels, indexes = np.unique(label_map, return_inverse=True)
+    indexes = indexes.reshape(label_map.shape)
+    if labels[0] == 0:
+        labels = labels[1:]
+    else:
+        indexes += 1
+    colors, hex_colors = _pixel_instance_colors(len(labels))
+    return labels, colors[indexes], hex_colors
+
+
+def label_map_to_pixel_annotation(
+    label_map, annotation_class_names, scores=None
+):
+    """Converts integer label map, e.g., instance or semantic segmentation
+    model output, to SuperAnnotate Pixel project annotation JSON
+    ("___pixel.json") and mask ("___save.png"). Each non-zero label becomes
+    an annotation with its own mask color, 0 is background.
+
+    :param label_map: HxW array of non-negative integer labels
+    :type label_map: numpy.ndarray
+    :param annotation_class_names: annotation class name of all labels, or
+     class name of each label indexed by label, e.g., dict {label: class name}
+     or list of class names of a semantic label map
+    :type annotation_class_names: str or dict or list of strs
+    :param scores: if not None, confidence score in [0, 1] of each label indexed
+     by label, set as annotation probability in percents
+    :type scores: dict or numpy.ndarray or list of floats
+
+    :return: annotation JSON and HxWx4 RGBA uint8 mask, the mask can be saved
+     as PNG or passed to upload_preannotations_from_iterable
+    :rtype: tuple (list, numpy.ndarray)
+    """
+    label_map = np.asarray(label_map)
+    if label_map.ndim != 2 or not np.issubdtype(label_map.dtype, np.integer):
+        raise SABaseException(
+            0, "label_map should be HxW array of integers, got "
+            f"{label_map.dtype} array of shape {label_map.shape}"
+        )
+    if label_map.size and label_map.min() < 0:
+        raise SABaseException(0, "label_map labels should be non-negative")
+    labels, mask, hex_colors = _label_map_to_colors(label_map)
+    annotation_json = []
+    for label, hex_color in zip(labels.tolist(), hex_colors):
+        try:
+            if isinstance(annotation_class_names, str):
+                class_name = annotation_class_names
+            else:
+                class_name = annotation_class_names[label]
+            probability = 100 if scores is None else int(
+                round(float(scores[label]) * 100)
+            )
+        except (KeyError, IndexError):
+            raise SABaseException(
+                0, f"No annotation class name or score for label {label}"
+            )
+        annotation_json.append(
+            {
+                "className": class_name,
+                "probability": probability,
+                "visible": True,
+                "attributes": [],
+                "parts": [{
+                    "color": hex_color
+                }]
+            }
+        )
+    return annotation_json, mask
+
+
+def label_maps_to_pixel_preannotations(label_maps):
+    """Converts label maps to Pixel project pre-annotations one at a time,
+    e.g., predictions of a segmentation model over a dataset, see
+    label_map_to_pixel_annotation. The result can be passed to
+    upload_preannotations_from_iterable, then each label map is converted
+    only when there is room for it in the upload queue.
+
+    :param label_maps: (image_name, label_map, annotation_class_names) or
+     (image_name, label_map, annotation_class_names, scores) tuples
+    :type label_maps: iterable of tuples
+
+    :return: generator of (image_name, annotation_json, mask) tuples
+    """
+    for image_name, label_map, *args in label_maps:
+        annotation_json, mask = label_map_to_pixel_annotation(label_map, *args)
+        yield image_name, annotation_json, mask
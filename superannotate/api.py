@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 
 import requests
 import requests_toolbelt
@@ -19,6 +20,8 @@ class API:
         self._token = None
         self._verify = None
         self._session = None
+        self._download_session = None
+        self._download_session_lock = threading.Lock()
         self._default_headers = None
         self._main_endpoint = None
         self.team_id = None
@@ -91,7 +94,24 @@ class API:
         resp = self._session.send(request=prepared, verify=self._verify)
         return resp
 
-    def _create_session(self):
+    def download_request(self, url, headers=None, stream=False):
+        """GET request to a (presigned) storage URL. Sent through a pooled
+        session with the same retry policy as the API requests, but without
+        the API authorization headers.
+        """
+        if self._download_session is None:
+            # first downloads come concurrently from download thread pools
+            with self._download_session_lock:
+                if self._download_session is None:
+                    self._download_session = self._create_session(
+                        headers=requests.utils.default_headers(),
+                        pool_maxsize=32
+                    )
+        return self._download_session.get(
+            url, headers=headers, stream=stream, verify=self._verify
+        )
+
+    def _create_session(self, headers=None, pool_maxsize=16):
         session = requests.Session()
         retry = urllib3.Retry(
             total=5,
@@ -105,9 +125,13 @@ class API:
             raise_on_status=False
         )
         adapter = requests.adapters.HTTPAdapter(
-            max_retries=retry, pool_maxsize=16, pool_connections=16
+            max_retries=retry,
+            pool_maxsize=pool_maxsize,
+            pool_connections=pool_maxsize
         )
         session.mount('https://', adapter)
         session.mount('http://', adapter)
-        session.headers = self._default_headers
+        if headers is None:
+            headers = self._default_headers
+        session.headers = headers
         return session
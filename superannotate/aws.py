@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import boto3
+import botocore.config
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+# temporary credentials issued by the platform expire, so clients built on
+# them are dropped well before that
+_CLIENT_TTL = 30 * 60
+_MAX_CACHED_CLIENTS = 16
+_MAX_POOL_CONNECTIONS = 32
+
+_clients = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def _credentials_key(creds):
+    if creds is None:
+        return None
+    return (
+        creds['accessKeyId'], creds['secretAccessKey'], creds['sessionToken']
+    )
+
+
+def get_s3_client(creds=None):
+    """Returns S3 client for the temporary AWS credentials returned by the
+    platform, or for the default AWS credentials of the environment if creds
+    is None. Clients are cached by credentials, shared between threads and
+    reuse their HTTP connection pools.
+
+    :param creds: dict with accessKeyId, secretAccessKey and sessionToken keys
+    :type creds: dict
+
+    :return: boto3 S3 client
+    :rtype: botocore.client.S3
+    """
+    key = _credentials_key(creds)
+    now = time.monotonic()
+    with _clients_lock:
+        for cached_key, (created, _) in list(_clients.items()):
+            if cached_key is not None and now - created > _CLIENT_TTL:
+                del _clients[cached_key]
+        if key in _clients:
+            _clients.move_to_end(key)
+            return _clients[key][1]
+        if creds is None:
+            session = boto3.Session()
+        else:
+            session = boto3.Session(
+                aws_access_key_id=creds['accessKeyId'],
+                aws_secret_access_key=creds['secretAccessKey'],
+                aws_session_token=creds['sessionToken']
+            )
+        client = session.client(
+            's3',
+            config=botocore.config.Config(
+                max_pool_connections=_MAX_POOL_CONNECTIONS
+            )
+        )
+        _clients[key] = (now, client)
+        while len(_clients) > _MAX_CACHED_CLIENTS:
+            _clients.popitem(last=False)
+        return client
+
+
+def invalidate_s3_client(creds=None):
+    """Drops cached S3 client of the credentials, e.g., after the credentials
+    were rejected.
+
+    :param creds: dict with accessKeyId, secretAccessKey and sessionToken keys
+    :type creds: dict
+    """
+    with _clients_lock:
+        _clients.pop(_credentials_key(creds), None)
@@ -3,15 +3,20 @@ import json
 import logging
 from pathlib import Path
 
-import boto3
-
 from ..api import API
+from ..aws import get_s3_client
 from ..exceptions import SABaseException
+from .cache import TTLCache
+from .pagination import iter_items
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
 
+# classes are looked up for every annotation upload/download, they are
+# re-fetched at least once a minute to pick up changes made elsewhere
+_annotation_classes_cache = TTLCache(ttl=60)
+
 
 def create_annotation_class(project, name, color, attribute_groups=None):
     """Create annotation class in project
@@ -58,6 +63,7 @@ def create_annotation_class(project, name, color, attribute_groups=None):
         raise SABaseException(
             response.status_code, "Couldn't create class " + response.text
         )
+    _annotation_classes_cache.invalidate(project_id)
     res = response.json()
     new_class = res[0]
     return new_class
@@ -82,6 +88,7 @@ def delete_annotation_class(annotation_class):
     response = _api.send_request(
         req_type='DELETE', path=f'/class/{class_id}', params=params
     )
+    _annotation_classes_cache.invalidate(project_id)
     if not response.ok:
         raise SABaseException(
             response.status_code,
@@ -114,11 +121,8 @@ def create_annotation_classes_from_classes_json(
         if from_s3_bucket is None:
             classes = json.load(open(classes_json))
         else:
-            from_session = boto3.Session()
-            from_s3 = from_session.resource('s3')
             file = io.BytesIO()
-            from_s3_object = from_s3.Object(from_s3_bucket, classes_json)
-            from_s3_object.download_fileobj(file)
+            get_s3_client().download_fileobj(from_s3_bucket, classes_json, file)
             file.seek(0)
             classes = json.load(file)
     else:
@@ -132,6 +136,7 @@ def create_annotation_classes_from_classes_json(
     response = _api.send_request(
         req_type='POST', path='/classes', params=params, json_req=data
     )
+    _annotation_classes_cache.invalidate(project_id)
     if not response.ok:
         raise SABaseException(
             response.status_code, "Couldn't create classes " + response.text
@@ -153,28 +158,73 @@ def search_annotation_classes(project, name_prefix=None):
     :return: annotation classes of the project
     :rtype: list of dicts
     """
-    result_list = []
-    team_id, project_id = project["team_id"], project["id"]
-    params = {'team_id': team_id, 'project_id': project_id, 'offset': 0}
+    return list(iter_annotation_classes(project, name_prefix))
+
+
+def iter_annotation_classes(project, name_prefix=None):
+    """Lazy variant of search_annotation_classes. Yields annotation classes
+    as result pages arrive, the next pages are fetched in the background.
+
+    :param project: project metadata
+    :type project: dict
+    :param name_prefix: name prefix for search. If None all annotation classes
+     will be yielded
+    :type name_prefix: str
+
+    :return: generator of annotation classes of the project
+    :rtype: generator of dicts
+    """
+    params = {'team_id': project["team_id"], 'project_id': project["id"]}
     if name_prefix is not None:
         params['name'] = name_prefix
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/classes', params=params
-        )
-        if not response.ok:
-            raise SABaseException(
-                response.status_code, "Couldn't search classes " + response.text
+    yield from iter_items('/classes', params, "Couldn't search classes ")
+
+
+def _load_annotation_classes(project):
+    annotation_classes = search_annotation_classes(project)
+    name_to_id = {}
+    id_to_name = {}
+    for annotation_class in annotation_classes:
+        if annotation_class["name"] in name_to_id:
+            logger.warning(
+                "Duplicate annotation class name %s. Only one of the annotation classes will be used. This will result in errors in annotation upload.",
+                annotation_class["name"]
             )
-        res = response.json()
-        result_list += res["data"]
-        new_len = len(result_list)
-        # for r in result_list:
-        #     print(r)
-        if res["count"] <= new_len:
-            break
-        params["offset"] = new_len
-    return result_list
+        name_to_id[annotation_class["name"]] = annotation_class["id"]
+        id_to_name[annotation_class["id"]] = annotation_class["name"]
+    return annotation_classes, name_to_id, id_to_name
+
+
+def _get_annotation_classes(project, refresh=False):
+    """Returns cached (annotation classes, name to id dict, id to name dict)
+    of the project. The returned objects are shared and should not be
+    modified.
+    """
+    if refresh:
+        _annotation_classes_cache.invalidate(project["id"])
+    return _annotation_classes_cache.get(
+        project["id"], lambda: _load_annotation_classes(project)
+    )
+
+
+def _get_annotation_classes_name_to_id(project, names=()):
+    """Returns cached annotation class name to id dict of the project. The
+    cache is refreshed once if some of the names are missing from it.
+    """
+    name_to_id = _get_annotation_classes(project)[1]
+    if any(name not in name_to_id for name in names):
+        name_to_id = _get_annotation_classes(project, refresh=True)[1]
+    return name_to_id
+
+
+def _get_annotation_classes_id_to_name(project, ids=()):
+    """Returns cached annotation class id to name dict of the project. The
+    cache is refreshed once if some of the ids are missing from it.
+    """
+    id_to_name = _get_annotation_classes(project)[2]
+    if any(class_id not in id_to_name for class_id in ids):
+        id_to_name = _get_annotation_classes(project, refresh=True)[2]
+    return id_to_name
 
 
 def download_annotation_classes_json(project, folder):
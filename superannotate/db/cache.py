@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ttl seconds after they
+    were loaded. Values are shared between callers and should not be
+    modified.
+    """
+    def __init__(self, ttl, maxsize=128):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, load):
+        """Returns cached value of the key or loads, caches and returns it
+        with load().
+        """
+        value = self.lookup(key)
+        if value is None:
+            value = load()
+            self.set(key, value)
+        return value
+
+    def lookup(self, key):
+        """Returns cached value of the key, None if it isn't cached or has
+        expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self._ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+        return None
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,24 +1,34 @@
+import io
+import json
 import logging
-import math
+import os
+import re
 import tempfile
 import threading
-import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
-import boto3
 import requests
+from boto3.s3.transfer import TransferConfig
 from tqdm import tqdm
 
 from ..api import API
+from ..aws import get_s3_client
 from ..common import annotation_status_str_to_int
 from ..exceptions import SABaseException
+from ..waiter import wait_until
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
 _NUM_THREADS = 10
+_NUM_DOWNLOAD_ATTEMPTS = 5
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_RANGE_READAHEAD_SIZE = 4 * 1024 * 1024
+_S3_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+_S3_MULTIPART_CONCURRENCY = 4
 
 
 def get_exports(project):
@@ -54,6 +64,30 @@ def _get_export(export):
     return response.json()
 
 
+def _check_export_status(res):
+    if res["status"] == 1:
+        return None
+    if res["status"] == 4:
+        raise SABaseException(0, "Couldn't download export.")
+    return res
+
+
+def _log_export_wait(num_checks, delay):
+    if num_checks == 1:
+        logger.info("Waiting for export to finish on server.")
+    else:
+        logger.debug("Export is not ready, checking in %.1f seconds.", delay)
+
+
+def _wait_for_export(export, timeout=None):
+    return wait_until(
+        lambda: _check_export_status(_get_export(export)),
+        timeout=timeout,
+        description=f"export ID {export['id']}",
+        on_wait=_log_export_wait
+    )
+
+
 def prepare_export(
     project, annotation_statuses=None, include_fuse=False, only_pinned=False
 ):
@@ -102,55 +136,303 @@ def prepare_export(
     return res
 
 
-def __tqdm_thread(total_num, current_nums, finish_event):
-    with tqdm(total=total_num) as pbar:
-        while True:
-            finished = finish_event.wait(5)
-            if not finished:
-                pbar.update(sum(current_nums) - pbar.n)
-            else:
-                pbar.update(total_num - pbar.n)
-                break
+class _HTTPRangeFile(io.RawIOBase):
+    """Read-only seekable file over a URL of a server supporting HTTP Range
+    requests. Small reads are served from a readahead buffer of
+    readahead_size bytes, so that consecutive small zip members are fetched
+    with one request.
+    """
+    def __init__(self, url, size, readahead_size=_RANGE_READAHEAD_SIZE):
+        super().__init__()
+        self._url = url
+        self._size = size
+        self._readahead_size = readahead_size
+        self._pos = 0
+        self._buffer = b""
+        self._buffer_start = 0
 
+    def readable(self):
+        return True
 
-def __upload_files_to_aws_thread(
-    to_s3_bucket,
-    folder_path,
-    filepaths,
-    tmpdirname,
-    thread_id,
-    chunksize,
-    already_uploaded,
-    num_uploaded,
-):
-    len_files_to_upload = len(filepaths)
-    start_index = thread_id * chunksize
-    end_index = start_index + chunksize
-    if start_index >= len_files_to_upload:
-        return
-    to_s3 = boto3.Session().resource('s3').Bucket(to_s3_bucket)
-    for i in range(start_index, end_index):
-        if i >= len_files_to_upload:
-            break
-        if already_uploaded[i]:
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        else:
+            pos = self._size + offset
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def _get_range(self, start, end):
+        response = _api.download_request(
+            self._url, headers={"Range": f"bytes={start}-{end - 1}"}
+        )
+        if response.status_code != 206 or len(response.content) != end - start:
+            raise SABaseException(
+                response.status_code,
+                f"Couldn't read bytes {start}-{end - 1} of export"
+            )
+        return response.content
+
+    def read(self, size=-1):
+        start = self._pos
+        end = self._size if size is None or size < 0 else min(
+            start + size, self._size
+        )
+        if start >= end:
+            return b""
+        self._pos = end
+        buffer_end = self._buffer_start + len(self._buffer)
+        if self._buffer_start <= start and end <= buffer_end:
+            return self._buffer[start - self._buffer_start:end -
+                                self._buffer_start]
+        if end - start >= self._readahead_size:
+            return self._get_range(start, end)
+        self._buffer_start = start
+        self._buffer = self._get_range(
+            start, min(start + self._readahead_size, self._size)
+        )
+        return self._buffer[:end - start]
+
+
+def __get_range_export_size(url):
+    """Returns size of the export zip if the server supports HTTP Range
+    requests for it, otherwise None.
+    """
+    with _api.download_request(
+        url, headers={"Range": "bytes=0-0"}, stream=True
+    ) as response:
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code != 206 or "/" not in content_range:
+            return None
+        size = content_range.rsplit("/", 1)[1]
+        return int(size) if size.isdigit() else None
+
+
+def __get_member_batches(zip_file):
+    """Groups zip file members into batches of members stored next to each
+    other within _RANGE_READAHEAD_SIZE bytes.
+    """
+    infos = sorted(zip_file.infolist(), key=lambda info: info.header_offset)
+    ends = [info.header_offset for info in infos[1:]] + [zip_file.start_dir]
+    batches = []
+    batch_start = None
+    for info, end in zip(infos, ends):
+        if info.is_dir():
             continue
-        file = filepaths[i]
+        if batch_start is None or end - batch_start > _RANGE_READAHEAD_SIZE:
+            batches.append([])
+            batch_start = info.header_offset
+        batches[-1].append(info.filename)
+    return batches
+
+
+def __upload_zip_members_to_s3(open_zip, to_s3_bucket, folder_path):
+    """Uploads members of the zip file to to_s3_bucket/folder_path without
+    extracting them. Each of _NUM_THREADS threads reads the members through
+    its own ZipFile returned by open_zip and streams them to S3 with
+    multipart uploads. Member CRCs are checked while reading.
+    """
+    thread_zip_files = threading.local()
+    opened_zip_files = []
+    opened_zip_files_lock = threading.Lock()
+    s3_client = get_s3_client()
+    transfer_config = TransferConfig(
+        multipart_chunksize=_S3_MULTIPART_CHUNK_SIZE,
+        max_concurrency=_S3_MULTIPART_CONCURRENCY
+    )
+
+    def get_thread_zip_file():
+        if not hasattr(thread_zip_files, "zip_file"):
+            thread_zip_files.zip_file = open_zip()
+            with opened_zip_files_lock:
+                opened_zip_files.append(thread_zip_files.zip_file)
+        return thread_zip_files.zip_file
+
+    def upload_batch(batch):
+        zip_file = get_thread_zip_file()
+        failed = []
+        for filename in batch:
+            try:
+                with zip_file.open(filename) as member:
+                    s3_client.upload_fileobj(
+                        member,
+                        to_s3_bucket,
+                        f'{folder_path}/{filename}',
+                        Config=transfer_config
+                    )
+            except Exception as e:
+                logger.warning("Unable to upload %s to S3 %s", filename, e)
+                failed.append(filename)
+        return failed
+
+    try:
+        batches = __get_member_batches(get_thread_zip_file())
+        failed = []
+        with tqdm(total=sum(len(batch) for batch in batches)) as pbar:
+            with ThreadPoolExecutor(_NUM_THREADS) as executor:
+                futures = {
+                    executor.submit(upload_batch, batch): len(batch)
+                    for batch in batches
+                }
+                for future in as_completed(futures):
+                    failed.extend(future.result())
+                    pbar.update(futures[future])
+    finally:
+        for zip_file in opened_zip_files:
+            zip_file.close()
+    if failed:
+        raise SABaseException(
+            0, f"Couldn't upload {len(failed)} export files to S3"
+        )
+
+
+def __load_part_validator(part_filepath, validator_filepath):
+    if not part_filepath.is_file():
+        return None
+    try:
+        with open(validator_filepath) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def __continues_part_file(response, downloaded, validator):
+    """Checks that the response is the requested range of the same file the
+    .part file was started from.
+    """
+    if response.status_code != 206:
+        return False
+    match = re.fullmatch(
+        r"bytes (\d+)-\d+/(\d+)", response.headers.get("Content-Range", "")
+    )
+    if match is None or int(match.group(1)) != downloaded:
+        return False
+    if int(match.group(2)) != validator["size"]:
+        return False
+    etag = response.headers.get("ETag")
+    return etag is None or validator["etag"] is None or etag == validator["etag"]
+
+
+def __download_export_file(url, filepath):
+    """Streams the export zip to filepath through a .part file. Interrupted
+    downloads are resumed with HTTP Range requests from the end of the .part
+    file, also the ones left by a previous call. The ETag and size of the
+    file are kept next to the .part file, and it is resumed only if the
+    server returns the expected range of the same file, otherwise the
+    download starts over.
+    """
+    part_filepath = filepath.with_name(filepath.name + ".part")
+    validator_filepath = filepath.with_name(filepath.name + ".part.json")
+    attempt = 0
+    while True:
+        validator = __load_part_validator(part_filepath, validator_filepath)
+        downloaded = 0 if validator is None else part_filepath.stat().st_size
+        headers = None
+        if downloaded:
+            headers = {"Range": f"bytes={downloaded}-"}
+            if validator["etag"] is not None:
+                headers["If-Range"] = validator["etag"]
+        total = None
         try:
-            relative_filename = file.relative_to(tmpdirname)
-            s3_key = f'{folder_path}/{relative_filename}'
-            to_s3.upload_file(str(file), s3_key)
-        except Exception as e:
-            logger.warning("Unable to upload to data server %s", e)
-            return
+            with _api.download_request(
+                url, headers=headers, stream=True
+            ) as response:
+                if response.status_code == 416 and downloaded:
+                    if downloaded == validator["size"]:
+                        # nothing left to download after the .part file
+                        break
+                if downloaded and not __continues_part_file(
+                    response, downloaded, validator
+                ):
+                    if response.status_code in (206, 416):
+                        # .part file is of another file, start over
+                        part_filepath.unlink()
+                        continue
+                    # server sent the whole file instead of the range
+                    downloaded = 0
+                if not response.ok:
+                    raise SABaseException(
+                        response.status_code,
+                        "Couldn't download export " + response.text
+                    )
+                if downloaded:
+                    total = validator["size"]
+                elif "Content-Length" in response.headers:
+                    total = int(response.headers["Content-Length"])
+                if not downloaded:
+                    with open(validator_filepath, "w") as f:
+                        json.dump(
+                            {
+                                "etag": response.headers.get("ETag"),
+                                "size": total
+                            }, f
+                        )
+                with open(part_filepath,
+                          "ab" if downloaded else "wb") as f, tqdm(
+                              total=total,
+                              initial=downloaded,
+                              unit="B",
+                              unit_scale=True,
+                              unit_divisor=1024
+                          ) as pbar:
+                    for chunk in response.iter_content(
+                        chunk_size=_DOWNLOAD_CHUNK_SIZE
+                    ):
+                        f.write(chunk)
+                        pbar.update(len(chunk))
+        except requests.exceptions.RequestException as e:
+            error = e
         else:
-            num_uploaded[thread_id] += 1
-            already_uploaded[i] = True
+            if total is None or part_filepath.stat().st_size == total:
+                break
+            error = "incomplete download"
+        attempt += 1
+        if attempt == _NUM_DOWNLOAD_ATTEMPTS:
+            raise SABaseException(
+                0, f"Couldn't download export {filepath.name}: {error}"
+            )
+        logger.warning(
+            "Export download interrupted (attempt %s of %s), resuming: %s",
+            attempt, _NUM_DOWNLOAD_ATTEMPTS, error
+        )
+    os.replace(part_filepath, filepath)
+    validator_filepath.unlink()
+
+
+def __check_export_zip(filepath):
+    try:
+        with zipfile.ZipFile(filepath, 'r') as f:
+            bad_filename = f.testzip()
+    except zipfile.BadZipFile as e:
+        raise SABaseException(0, f"Export zip {filepath} is corrupted: {e}")
+    if bad_filename is not None:
+        raise SABaseException(
+            0, f"Export zip {filepath} is corrupted, bad CRC of {bad_filename}"
+        )
 
 
 def download_export(
-    export, folder_path, extract_zip_contents=True, to_s3_bucket=None
+    export,
+    folder_path,
+    extract_zip_contents=True,
+    to_s3_bucket=None,
+    check_integrity=False,
+    wait_timeout=None
 ):
-    """Download prepared export.
+    """Download prepared export. The export zip is streamed to disk and an
+    interrupted download is resumed from where it stopped. With to_s3_bucket
+    the zip members are streamed to S3 without extraction, reading them with
+    HTTP Range requests if the server supports them.
 
     :param export: metadata of the prepared export, returned from prepare_export
     :type export: dict
@@ -161,22 +443,20 @@ def download_export(
     :type extract_zip_contents: bool
     :param to_s3_bucket: AWS S3 bucket to use for download. If None then folder_path is in local filesystem.
     :type tofrom_s3_bucket: str
+    :param check_integrity: check CRCs of the downloaded zip file's members.
+     Extracted members are always checked when uploading to S3.
+    :type check_integrity: bool
+    :param wait_timeout: seconds to wait for the export to finish on server. If None waits indefinitely.
+    :type wait_timeout: float
     """
-    while True:
-        res = _get_export(export)
-        if res["status"] == 1:
-            logger.info("Waiting 5 seconds for export to finish on server.")
-            time.sleep(5)
-            continue
-        if res["status"] == 4:
-            raise SABaseException(0, "Couldn't download export.")
-        break
+    res = _wait_for_export(export, wait_timeout)
 
     filename = Path(res['path']).name
-    r = requests.get(res['download'], allow_redirects=True)
     if to_s3_bucket is None:
         filepath = Path(folder_path) / filename
-        open(filepath, 'wb').write(r.content)
+        __download_export_file(res['download'], filepath)
+        if check_integrity:
+            __check_export_zip(filepath)
         if extract_zip_contents:
             with zipfile.ZipFile(filepath, 'r') as f:
                 f.extractall(folder_path)
@@ -184,46 +464,46 @@ def download_export(
             logger.info("Extracted %s to folder %s", filepath, folder_path)
         else:
             logger.info("Downloaded export ID %s to %s", res['id'], filepath)
+    elif not extract_zip_contents and not check_integrity:
+        with _api.download_request(res['download'], stream=True) as response:
+            if not response.ok:
+                raise SABaseException(
+                    response.status_code,
+                    "Couldn't download export " + response.text
+                )
+            response.raw.decode_content = True
+            get_s3_client().upload_fileobj(
+                response.raw,
+                to_s3_bucket,
+                f'{folder_path}/{filename}',
+                Config=TransferConfig(
+                    multipart_chunksize=_S3_MULTIPART_CHUNK_SIZE,
+                    max_concurrency=_S3_MULTIPART_CONCURRENCY
+                )
+            )
     else:
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            filepath = Path(tmpdirname) / filename
-            open(filepath, 'wb').write(r.content)
-            if extract_zip_contents:
-                with zipfile.ZipFile(filepath, 'r') as f:
-                    f.extractall(tmpdirname)
-                Path.unlink(filepath)
-            files_to_upload = []
-            for file in Path(tmpdirname).rglob("*"):
-                if not file.is_file():
-                    continue
-                files_to_upload.append(file)
-            len_files_to_upload = len(files_to_upload)
-            num_uploaded = [0] * _NUM_THREADS
-            already_uploaded = [False] * len_files_to_upload
-            finish_event = threading.Event()
-            chunksize = int(math.ceil(len_files_to_upload / _NUM_THREADS))
-            tqdm_thread = threading.Thread(
-                target=__tqdm_thread,
-                args=(len_files_to_upload, num_uploaded, finish_event)
+        size = None
+        if extract_zip_contents:
+            size = __get_range_export_size(res['download'])
+        if size is not None:
+            __upload_zip_members_to_s3(
+                lambda: zipfile.
+                ZipFile(_HTTPRangeFile(res['download'], size), 'r'),
+                to_s3_bucket, folder_path
             )
-            tqdm_thread.start()
-            while True:
-                if sum(num_uploaded) == len_files_to_upload:
-                    break
-                threads = []
-                for thread_id in range(_NUM_THREADS):
-                    t = threading.Thread(
-                        target=__upload_files_to_aws_thread,
-                        args=(
-                            to_s3_bucket, folder_path, files_to_upload,
-                            tmpdirname, thread_id, chunksize, already_uploaded,
-                            num_uploaded
-                        )
+        else:
+            with tempfile.TemporaryDirectory() as tmpdirname:
+                filepath = Path(tmpdirname) / filename
+                __download_export_file(res['download'], filepath)
+                if check_integrity:
+                    __check_export_zip(filepath)
+                if extract_zip_contents:
+                    __upload_zip_members_to_s3(
+                        lambda: zipfile.ZipFile(filepath, 'r'), to_s3_bucket,
+                        folder_path
+                    )
+                else:
+                    get_s3_client().upload_file(
+                        str(filepath), to_s3_bucket, f'{folder_path}/{filename}'
                     )
-                    threads.append(t)
-                    t.start()
-                for t in threads:
-                    t.join()
-            finish_event.set()
-            tqdm_thread.join()
         logger.info("Exported to AWS %s/%s", to_s3_bucket, folder_path)
@@ -1,11 +1,13 @@
 import io
 import json
 import logging
+import os
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+)
 from pathlib import Path
 
-import boto3
-import requests
-
 from ..annotation_helpers import (
     add_annotation_bbox_to_json, add_annotation_cuboid_to_json,
     add_annotation_ellipse_to_json, add_annotation_point_to_json,
@@ -13,14 +15,31 @@ from ..annotation_helpers import (
     add_annotation_template_to_json
 )
 from ..api import API
+from ..aws import get_s3_client
 from ..common import annotation_status_str_to_int
 from ..exceptions import SABaseException
-from .annotation_classes import search_annotation_classes
+from .annotation_classes import (
+    _get_annotation_classes_id_to_name, _get_annotation_classes_name_to_id
+)
+from .cache import TTLCache
+from .pagination import iter_items
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
 
+_root_folder_ids_cache = TTLCache(ttl=10 * 60)
+
+_NUM_STATUS_UPDATE_THREADS = 10
+_NUM_ANNOTATION_DOWNLOAD_THREADS = 10
+_MAX_IMAGE_NAME_SEARCHES = 10
+_ANNOTATION_UPLOAD_BATCH_SIZE = 500
+
+# optional per-project image name to metadata indexes, see
+# build_image_metadata_index
+_image_indexes = {}
+_image_indexes_lock = threading.Lock()
+
 
 def _get_project_root_folder_id(project):
     """Get root folder ID
@@ -29,13 +48,28 @@ def _get_project_root_folder_id(project):
     int
         Root folder ID
     """
-    params = {'team_id': project['team_id']}
-    response = _api.send_request(
-        req_type='GET', path=f'/project/{project["id"]}', params=params
-    )
-    if not response.ok:
-        raise SABaseException(response.status_code, response.text)
-    return response.json()['folder_id']
+    def load():
+        params = {'team_id': project['team_id']}
+        response = _api.send_request(
+            req_type='GET', path=f'/project/{project["id"]}', params=params
+        )
+        if not response.ok:
+            raise SABaseException(response.status_code, response.text)
+        return response.json()['folder_id']
+
+    return _root_folder_ids_cache.get(project["id"], load)
+
+
+def _fill_annotation_class_names(project, annotation_json):
+    # unclassified instances have negative class IDs
+    class_ids = [
+        r["classId"] for r in annotation_json
+        if isinstance(r.get("classId"), int) and r["classId"] > 0
+    ]
+    id_to_name = _get_annotation_classes_id_to_name(project, class_ids)
+    for r in annotation_json:
+        if "classId" in r and r["classId"] in id_to_name:
+            r["className"] = id_to_name[r["classId"]]
 
 
 def search_images(
@@ -60,47 +94,103 @@ def search_images(
     :return: metadata of found images or image names
     :rtype: list of dicts or strs
     """
+    return list(
+        iter_images(
+            project, image_name_prefix, annotation_status, return_metadata
+        )
+    )
+
+
+def build_image_metadata_index(project):
+    """Lists all images of the project once and keeps their metadata in memory,
+    so that subsequent get_image_metadata calls (and functions relying on it,
+    e.g., set_image_annotation_status, get_image_bytes, copy_image) don't need
+    a server side image name search. Images added after the index was built
+    are looked up on the server and added to the index on first access.
+    Rebuild the index if the project's images were changed from elsewhere.
+
+    :param project: project metadata
+    :type project: dict
+
+    :return: number of images in the index
+    :rtype: int
+    """
+    images = search_images(project, return_metadata=True)
+    index = {image["name"]: image for image in images}
+    with _image_indexes_lock:
+        _image_indexes[project["id"]] = index
+    logger.info(
+        "Built image metadata index of %s images for project %s.", len(index),
+        project["name"]
+    )
+    return len(index)
+
+
+def clear_image_metadata_index(project=None):
+    """Drops the image metadata index of the project built with
+    build_image_metadata_index.
+
+    :param project: project metadata. If None indexes of all projects are
+     dropped
+    :type project: dict
+    """
+    with _image_indexes_lock:
+        if project is None:
+            _image_indexes.clear()
+        else:
+            _image_indexes.pop(project["id"], None)
+
+
+def _update_image_metadata_index(project_id, image_name, image=None):
+    """Replaces image metadata in the project's index if the index exists.
+    If image is None the image is removed from the index.
+    """
+    with _image_indexes_lock:
+        index = _image_indexes.get(project_id)
+        if index is None:
+            return
+        if image is None:
+            index.pop(image_name, None)
+        else:
+            index[image_name] = image
+
+
+def iter_images(
+    project,
+    image_name_prefix=None,
+    annotation_status=None,
+    return_metadata=False
+):
+    """Lazy variant of search_images. Yields images as result pages arrive,
+    the next pages are fetched in the background.
+
+    :param project: project metadata in which the images are searched
+    :type project: dict
+    :param image_name_prefix: image name prefix for search
+    :type image_name_prefix: str
+    :param annotation_status: if not None, annotation statuses of images to filter,
+                              should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+    :param return_metadata: yield metadata of images instead of names
+    :type return_metadata: bool
+
+    :return: generator of metadata of found images or image names
+    :rtype: generator of dicts or strs
+    """
     team_id, project_id = project["team_id"], project["id"]
-    folder_id = _get_project_root_folder_id(project)  # maybe changed in future
+    folder_id = _get_project_root_folder_id(project)
     if annotation_status is not None:
         annotation_status = annotation_status_str_to_int(annotation_status)
-
-    result_list = []
     params = {
         'team_id': team_id,
         'project_id': project_id,
         'folder_id': folder_id,
-        'annotation_status': annotation_status,
-        'offset': 0
+        'annotation_status': annotation_status
     }
     if image_name_prefix is not None:
         params['name'] = image_name_prefix
-    total_got = 0
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/images', params=params
-        )
-        if response.ok:
-            # print(response.json())
-            results = response.json()["data"]
-            total_got += len(results)
-            for r in results:
-                if return_metadata:
-                    result_list.append(r)
-                else:
-                    result_list.append(r["name"])
-            if response.json()["count"] <= total_got:
-                break
-            params["offset"] = total_got
-            # print(
-            #     "Got to ", len(result_list),
-            #     response.json()["count"], len(new_results), params['offset']
-            # )
-        else:
-            raise SABaseException(
-                response.status_code, "Couldn't search images " + response.text
-            )
-    return result_list
+    for image in iter_items('/images', params, "Couldn't search images "):
+        yield image if return_metadata else image["name"]
 
 
 def get_image_metadata(project, image_name):
@@ -114,16 +204,64 @@ def get_image_metadata(project, image_name):
     :return: metadata of image
     :rtype: dict
     """
+    with _image_indexes_lock:
+        index = _image_indexes.get(project["id"])
+        if index is not None and image_name in index:
+            return dict(index[image_name])
     images = search_images(project, image_name, return_metadata=True)
     for image in images:
         if image["name"] == image_name:
-            return image
+            _update_image_metadata_index(project["id"], image_name, image)
+            return dict(image)
     raise SABaseException(
         0, "Image " + image_name + " doesn't exist in the project " +
         project["name"]
     )
 
 
+def _get_images_metadata(project, image_names):
+    """Returns metadata of the images in image_names order. Uses the image
+    metadata index if it is built, otherwise lists the project's images once
+    instead of searching every image name (unless there are only a few).
+    """
+    with _image_indexes_lock:
+        index = _image_indexes.get(project["id"])
+        if index is not None:
+            index = dict(index)
+    if index is None or any(name not in index for name in image_names):
+        if len(image_names) <= _MAX_IMAGE_NAME_SEARCHES:
+            return [
+                get_image_metadata(project, image_name)
+                for image_name in image_names
+            ]
+        index = {
+            image["name"]: image
+            for image in iter_images(project, return_metadata=True)
+        }
+    images = []
+    for image_name in image_names:
+        if image_name not in index:
+            raise SABaseException(
+                0, "Image " + image_name + " doesn't exist in the project " +
+                project["name"]
+            )
+        images.append(dict(index[image_name]))
+    return images
+
+
+def _put_image_annotation_status(image, annotation_status):
+    params = {'team_id': image["team_id"], 'project_id': image["project_id"]}
+    response = _api.send_request(
+        req_type='PUT',
+        path=f'/image/{image["id"]}',
+        json_req={"annotation_status": annotation_status},
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    return response.json()
+
+
 def set_image_annotation_status(project, image_name, annotation_status):
     """Sets the image annotation status
 
@@ -139,22 +277,94 @@ def set_image_annotation_status(project, image_name, annotation_status):
     :rtype: dict
     """
     image = get_image_metadata(project, image_name)
-    team_id, project_id, image_id = image["team_id"], image["project_id"
-                                                           ], image["id"]
     annotation_status = annotation_status_str_to_int(annotation_status)
-    json_req = {
-        "annotation_status": annotation_status,
-    }
-    params = {'team_id': team_id, 'project_id': project_id}
-    response = _api.send_request(
-        req_type='PUT',
-        path=f'/image/{image_id}',
-        json_req=json_req,
-        params=params
+    res = _put_image_annotation_status(image, annotation_status)
+    _update_image_metadata_index(
+        project["id"], image_name,
+        dict(image, annotation_status=annotation_status)
     )
-    if not response.ok:
-        raise SABaseException(response.status_code, response.text)
-    return response.json()
+    return res
+
+
+def set_images_annotation_statuses(project, images, annotation_status):
+    """Sets annotation statuses of many images. Image metadata is resolved
+    once for all the image names, then the statuses are set concurrently,
+    one request per image.
+
+    :param project: project metadata
+    :type project: dict
+    :param images: image names or image metadatas (e.g., output of
+     search_images with return_metadata=True)
+    :type images: list of strs or dicts
+    :param annotation_status: annotation status to set,
+           should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+
+    :return: names of the images which statuses couldn't be set
+    :rtype: list of strs
+    """
+    images = list(images)
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    names = [image for image in images if not isinstance(image, dict)]
+    if names:
+        with _image_indexes_lock:
+            index = _image_indexes.get(project["id"])
+            index = {} if index is None else dict(index)
+        missing = [name for name in set(names) if name not in index]
+        if len(missing) <= _MAX_IMAGE_NAME_SEARCHES:
+            for name in missing:
+                try:
+                    index[name] = get_image_metadata(project, name)
+                except SABaseException:
+                    pass
+        else:
+            missing = set(missing)
+            for image in iter_images(project, return_metadata=True):
+                if image["name"] in missing:
+                    index[image["name"]] = image
+        images = [
+            index.get(image, image) if not isinstance(image, dict) else image
+            for image in images
+        ]
+    failed = [False] * len(images)
+    with ThreadPoolExecutor(_NUM_STATUS_UPDATE_THREADS) as executor:
+        futures = {}
+        for i, image in enumerate(images):
+            if not isinstance(image, dict):
+                logger.warning(
+                    "Image %s doesn't exist in the project %s", image,
+                    project["name"]
+                )
+                failed[i] = True
+                continue
+            future = executor.submit(
+                _put_image_annotation_status, image, annotation_status
+            )
+            futures[future] = i
+        for future in as_completed(futures):
+            image = images[futures[future]]
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(
+                    "Couldn't set annotation status of image %s: %s",
+                    image["name"], e
+                )
+                failed[futures[future]] = True
+                continue
+            _update_image_metadata_index(
+                project["id"], image["name"],
+                dict(image, annotation_status=annotation_status)
+            )
+    failed_images = [
+        image["name"] if isinstance(image, dict) else image
+        for image, image_failed in zip(images, failed) if image_failed
+    ]
+    logger.info(
+        "Set annotation status of %s images in project %s.",
+        len(images) - len(failed_images), project["name"]
+    )
+    return failed_images
 
 
 def add_annotation_bbox_to_image(
@@ -348,6 +558,252 @@ def add_annotation_cuboid_to_image(
     )
 
 
+class _AnnotationEditSession:
+    """Buffered annotation edits of images of a vector project, see
+    edit_images_annotations.
+    """
+    def __init__(self, project, image_names, num_workers=None):
+        if project["type"] != 1:
+            raise SABaseException(
+                0, "Annotation edit sessions support only vector projects"
+            )
+        self._project = project
+        self._image_names = list(image_names)
+        self._num_workers = num_workers
+        self._annotations = None
+        self._edited = set()
+
+    def __enter__(self):
+        annotations = {}
+        for image_name, annotation_json, _ in get_images_annotations(
+            self._project, self._image_names, self._num_workers
+        ):
+            annotations[image_name] = annotation_json or []
+        missing = [
+            name for name in self._image_names if name not in annotations
+        ]
+        if missing:
+            # uploading edits of those would overwrite their annotations
+            raise SABaseException(
+                0, "Couldn't get annotations of images " + ", ".join(missing)
+            )
+        self._annotations = annotations
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.upload()
+
+    def _get_annotations(self, image_name):
+        if self._annotations is None:
+            raise SABaseException(
+                0, "Annotation edit session should be used in a with statement"
+            )
+        if image_name not in self._annotations:
+            raise SABaseException(
+                0, f"Image {image_name} isn't in the annotation edit session"
+            )
+        return self._annotations[image_name]
+
+    def get_annotations(self, image_name):
+        """Returns current (edited) annotation JSON of the image.
+
+        :param image_name: image name
+        :type image_name: str
+
+        :return: annotations in SuperAnnotate format JSON
+        :rtype: list
+        """
+        return self._get_annotations(image_name)
+
+    def _add(self, image_name, add_to_json, *args):
+        add_to_json(self._get_annotations(image_name), *args)
+        self._edited.add(image_name)
+
+    def add_annotation_bbox(
+        self, image_name, bbox, annotation_class_name, error=None
+    ):
+        """Same as add_annotation_bbox_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_bbox_to_json, bbox,
+            annotation_class_name, error
+        )
+
+    def add_annotation_polygon(
+        self, image_name, polygon, annotation_class_name, error=None
+    ):
+        """Same as add_annotation_polygon_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_polygon_to_json, polygon,
+            annotation_class_name, error
+        )
+
+    def add_annotation_polyline(
+        self, image_name, polyline, annotation_class_name, error=None
+    ):
+        """Same as add_annotation_polyline_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_polyline_to_json, polyline,
+            annotation_class_name, error
+        )
+
+    def add_annotation_point(
+        self, image_name, point, annotation_class_name, error=None
+    ):
+        """Same as add_annotation_point_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_point_to_json, point,
+            annotation_class_name, error
+        )
+
+    def add_annotation_ellipse(
+        self, image_name, ellipse, annotation_class_name, error=None
+    ):
+        """Same as add_annotation_ellipse_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_ellipse_to_json, ellipse,
+            annotation_class_name, error
+        )
+
+    def add_annotation_template(
+        self,
+        image_name,
+        template_points,
+        template_connections,
+        annotation_class_name,
+        error=None
+    ):
+        """Same as add_annotation_template_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_template_to_json, template_points,
+            template_connections, annotation_class_name, error
+        )
+
+    def add_annotation_cuboid(
+        self, image_name, cuboid, annotation_class_name, error=None
+    ):
+        """Same as add_annotation_cuboid_to_image, buffered in the session."""
+        self._add(
+            image_name, add_annotation_cuboid_to_json, cuboid,
+            annotation_class_name, error
+        )
+
+    def upload(self):
+        """Uploads annotations of the edited images. Called on with statement
+        exit if there was no exception.
+        """
+        edited = [name for name in self._image_names if name in self._edited]
+        if not edited:
+            return
+        _upload_vector_annotations_jsons(
+            self._project, {name: self._annotations[name]
+                            for name in edited}, self._num_workers
+        )
+        self._edited.clear()
+
+
+def edit_images_annotations(project, image_names, num_workers=None):
+    """Returns a context manager to edit annotations of the images of a
+    vector project. The annotations are downloaded once on entering the with
+    statement, any number of add_annotation_* calls are buffered in the
+    session and the edited annotations are uploaded in batch on exit.
+    Nothing is uploaded if the with block raises.
+
+    Example:
+    ::
+
+        with sa.edit_images_annotations(project, ["a.jpg", "b.jpg"]) as session:
+            for bbox in detections:
+                session.add_annotation_bbox("a.jpg", bbox, "Car")
+
+    Session methods add_annotation_bbox, add_annotation_polygon,
+    add_annotation_polyline, add_annotation_point, add_annotation_ellipse,
+    add_annotation_template and add_annotation_cuboid take image name
+    followed by the arguments of the corresponding add_annotation_*_to_image
+    functions. get_annotations(image_name) returns the current annotations.
+
+    :param project: project metadata
+    :type project: dict
+    :param image_names: names of the images to edit
+    :type image_names: list of strs
+    :param num_workers: number of concurrent downloads and uploads. If None default value will be used.
+    :type num_workers: int
+
+    :return: annotation edit session
+    """
+    return _AnnotationEditSession(project, image_names, num_workers)
+
+
+def _upload_vector_annotations_jsons(project, annotation_jsons, num_workers):
+    """Uploads annotation JSONs of vector project's images given as dict of
+    image name to JSON, getting upload paths and credentials in batches of
+    _ANNOTATION_UPLOAD_BATCH_SIZE images.
+    """
+    if num_workers is None:
+        num_workers = _NUM_ANNOTATION_DOWNLOAD_THREADS
+    annotation_classes_dict = _get_annotation_classes_name_to_id(
+        project, [
+            ann["className"] for annotation_json in annotation_jsons.values()
+            for ann in annotation_json if "className" in ann
+        ]
+    )
+    bodies = {}
+    for image_name, annotation_json in annotation_jsons.items():
+        for ann in annotation_json:
+            if (
+                "userId" in ann and ann["type"] == "meta"
+            ) or "className" not in ann:
+                continue
+            annotation_class_name = ann["className"]
+            if not annotation_class_name in annotation_classes_dict:
+                raise SABaseException(
+                    0, "Couldn't find annotation class " + annotation_class_name
+                )
+            ann["classId"] = annotation_classes_dict[annotation_class_name]
+        bodies[image_name] = json.dumps(annotation_json)
+
+    image_names = list(bodies)
+    for i in range(0, len(image_names), _ANNOTATION_UPLOAD_BATCH_SIZE):
+        data = {
+            "project_id": project["id"],
+            "team_id": project["team_id"],
+            "names": image_names[i:i + _ANNOTATION_UPLOAD_BATCH_SIZE]
+        }
+        response = _api.send_request(
+            req_type='POST',
+            path='/images/getAnnotationsPathsAndTokens',
+            json_req=data
+        )
+        if not response.ok:
+            raise SABaseException(
+                response.status_code,
+                "Couldn't get annotation upload tokens " + response.text
+            )
+        res = response.json()
+        missing = set(data["names"]) - set(res["images"])
+        if missing:
+            raise SABaseException(
+                0, "Couldn't find images " + ", ".join(sorted(missing))
+            )
+        creds = res["creds"]
+        s3_client = get_s3_client(creds)
+
+        def put(item):
+            image_name, image_path = item
+            s3_client.put_object(
+                Bucket=creds["bucket"],
+                Key=image_path + "___objects.json",
+                Body=bodies[image_name]
+            )
+
+        with ThreadPoolExecutor(num_workers) as executor:
+            list(executor.map(put, res["images"].items()))
+    logger.info(
+        "Uploaded annotations of %s images in project %s.", len(bodies),
+        project["name"]
+    )
+
+
 def download_image(
     project,
     image_name,
@@ -411,25 +867,11 @@ def delete_image(project, image_name):
         raise SABaseException(
             response.status_code, "Couldn't delete image " + response.text
         )
+    _update_image_metadata_index(project["id"], image_name)
     logger.info("Successfully deleted image  %s.", image_name)
 
 
-def get_image_bytes(project, image_name, variant='original'):
-    """Returns an io.BytesIO() object of the image. Suitable for creating
-    PIL.Image out of it.
-
-    :param project: project metadata
-    :type project: dict
-    :param image_name: image name
-    :type image: str
-    :param variant: which resolution to get, can be 'original' or 'lores'
-     (low resolution)
-    :type variant: str
-
-    :return: io.BytesIO() of the image
-    :rtype: io.BytesIO()
-    """
-    image = get_image_metadata(project, image_name)
+def _get_image_download_url(image, variant):
     team_id, project_id, image_id, folder_id = image["team_id"], image[
         "project_id"], image["id"], image['folder_id']
     params = {
@@ -448,9 +890,74 @@ def get_image_bytes(project, image_name, variant='original'):
             response.status_code, "Couldn't get image " + response.text
         )
     res = response.json()
-    url = res[variant]["url"]
-    headers = res[variant]["headers"]
-    response = requests.get(url=url, headers=headers)
+    return res[variant]["url"], res[variant]["headers"]
+
+
+def _get_stored_file_size(url, headers):
+    """Returns size of the stored file from a one byte range request, or None
+    if the storage doesn't answer with a range. Presigned URLs are signed for
+    GET, so HEAD can't be used.
+    """
+    headers = dict(headers or {}, Range="bytes=0-0")
+    with _api.download_request(url, headers=headers, stream=True) as response:
+        if response.status_code != 206:
+            return None
+        response.content  # reads the byte so that the connection is reused
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def _download_image_to_file(image, variant, filepath, chunk_size=1024 * 1024):
+    """Streams the image to filepath through a temporary .part file. Existing
+    file is kept if its size matches the stored image's size, which is
+    checked with a one byte range request before downloading.
+
+    :return: True if the image was downloaded, False if kept
+    :rtype: bool
+    """
+    url, headers = _get_image_download_url(image, variant)
+    filepath = Path(filepath)
+    if filepath.is_file():
+        stored_size = _get_stored_file_size(url, headers)
+        if stored_size == filepath.stat().st_size:
+            return False
+    with _api.download_request(url, headers=headers, stream=True) as response:
+        if not response.ok:
+            raise SABaseException(
+                response.status_code, "Couldn't download image " + image["name"]
+            )
+        part_filepath = filepath.with_name(filepath.name + ".part")
+        try:
+            with open(part_filepath, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+        except BaseException:
+            # nothing resumes image downloads, don't leave the .part behind
+            if part_filepath.exists():
+                part_filepath.unlink()
+            raise
+    os.replace(part_filepath, filepath)
+    return True
+
+
+def get_image_bytes(project, image_name, variant='original'):
+    """Returns an io.BytesIO() object of the image. Suitable for creating
+    PIL.Image out of it.
+
+    :param project: project metadata
+    :type project: dict
+    :param image_name: image name
+    :type image: str
+    :param variant: which resolution to get, can be 'original' or 'lores'
+     (low resolution)
+    :type variant: str
+
+    :return: io.BytesIO() of the image
+    :rtype: io.BytesIO()
+    """
+    image = get_image_metadata(project, image_name)
+    url, headers = _get_image_download_url(image, variant)
+    response = _api.download_request(url, headers=headers)
     img = io.BytesIO(response.content)
     return img
 
@@ -487,16 +994,12 @@ def get_image_preannotations(project, image_name):
         raise SABaseException(response.status_code, response.text)
     res = response.json()
 
-    annotation_classes = search_annotation_classes(project)
-    annotation_classes_dict = {}
-    for annotation_class in annotation_classes:
-        annotation_classes_dict[annotation_class["id"]] = annotation_class
     if project_type == 1:  # vector
         res = res['preannotation']
         url = res["url"]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.download_request(url, headers=headers)
         if not response.ok:
             logger.warning("No preannotation available for image %s.", image_id)
             return {
@@ -504,9 +1007,7 @@ def get_image_preannotations(project, image_name):
                 "preannotation_json": None
             }
         res_json = response.json()
-        for r in res_json:
-            if "classId" in r and r["classId"] in annotation_classes_dict:
-                r["className"] = annotation_classes_dict[r["classId"]]["name"]
+        _fill_annotation_class_names(project, res_json)
 
         return {
             "preannotation_json_filename": annotation_json_filename,
@@ -517,7 +1018,7 @@ def get_image_preannotations(project, image_name):
         url = res_json["url"]
         preannotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res_json["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.download_request(url, headers=headers)
         if not response.ok:
             logger.warning("No preannotation available.")
             return {
@@ -527,16 +1028,14 @@ def get_image_preannotations(project, image_name):
                 "preannotation_mask": None,
             }
         preannotation_json = response.json()
-        for r in preannotation_json:
-            if "classId" in r and r["classId"] in annotation_classes_dict:
-                r["className"] = annotation_classes_dict[r["classId"]]["name"]
+        _fill_annotation_class_names(project, preannotation_json)
 
         res_mask = res['preAnnotationSavePng']
         url = res_mask["url"]
         preannotation_mask_filename = url.rsplit('/', 1)[-1]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res_mask["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.download_request(url, headers=headers)
         mask = io.BytesIO(response.content)
         return {
             "preannotation_json_filename": preannotation_json_filename,
@@ -562,10 +1061,14 @@ def get_image_annotations(project, image_name, project_type=None):
     :rtype: dict
     """
     image = get_image_metadata(project, image_name)
-    team_id, project_id, image_id, folder_id = image["team_id"], image[
-        "project_id"], image["id"], image['folder_id']
     if project_type is None:
         project_type = project["type"]
+    return _get_image_annotations(project, image, project_type)
+
+
+def _get_image_annotations(project, image, project_type):
+    team_id, project_id, image_id, folder_id = image["team_id"], image[
+        "project_id"], image["id"], image['folder_id']
     params = {
         'team_id': team_id,
         'project_id': project_id,
@@ -580,21 +1083,14 @@ def get_image_annotations(project, image_name, project_type=None):
         raise SABaseException(response.status_code, response.text)
     res = response.json()
 
-    annotation_classes = search_annotation_classes(project)
-    annotation_classes_dict = {}
-    for annotation_class in annotation_classes:
-        annotation_classes_dict[annotation_class["id"]] = annotation_class
     if project_type == 1:  # vector
         url = res["objects"]["url"]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res["objects"]["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.download_request(url, headers=headers)
         if response.ok:
             res_json = response.json()
-            for r in res_json:
-                if "classId" in r and r["classId"] in annotation_classes_dict:
-                    r["className"] = annotation_classes_dict[r["classId"]
-                                                            ]["name"]
+            _fill_annotation_class_names(project, res_json)
             return {
                 "annotation_json_filename": annotation_json_filename,
                 "annotation_json": res_json
@@ -606,7 +1102,7 @@ def get_image_annotations(project, image_name, project_type=None):
         url = res["pixelObjects"]["url"]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res["pixelObjects"]["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.download_request(url, headers=headers)
         if not response.ok and response.status_code == 403:
             return {
                 "annotation_json": None,
@@ -617,13 +1113,11 @@ def get_image_annotations(project, image_name, project_type=None):
         elif not response.ok:
             raise SABaseException(response.status_code, response.text)
         res_json = response.json()
-        for r in res_json:
-            if "classId" in r and r["classId"] in annotation_classes_dict:
-                r["className"] = annotation_classes_dict[r["classId"]]["name"]
+        _fill_annotation_class_names(project, res_json)
         url = res["pixelSave"]["url"]
         annotation_mask_filename = url.rsplit('/', 1)[-1]
         headers = res["pixelSave"]["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.download_request(url, headers=headers)
         if not response.ok:
             raise SABaseException(response.status_code, response.text)
         mask = io.BytesIO(response.content)
@@ -635,6 +1129,78 @@ def get_image_annotations(project, image_name, project_type=None):
         }
 
 
+def get_images_annotations(project, images=None, num_workers=None):
+    """Get annotations of many images. Image metadata and annotation classes
+    are resolved once, then the annotations are downloaded concurrently and
+    yielded in completion order. Images which annotations couldn't be
+    downloaded are logged and skipped.
+
+    :param project: project metadata
+    :type project: dict
+    :param images: image names or image metadatas (e.g., output of
+     search_images with return_metadata=True). If None all images of the
+     project are used
+    :type images: iterable of strs or dicts
+    :param num_workers: number of concurrent downloads. If None default value will be used.
+    :type num_workers: int
+
+    :return: generator of (image name, annotation JSON, annotation mask)
+     tuples. Annotation JSON is None if the image has no annotations, mask is
+     io.BytesIO for pixel projects and None for vector projects
+    :rtype: generator of tuples
+    """
+    if num_workers is None:
+        num_workers = _NUM_ANNOTATION_DOWNLOAD_THREADS
+    if images is None:
+        images = search_images(project, return_metadata=True)
+    else:
+        # generators are consumed by the type check
+        images = list(images)
+    if not all(isinstance(image, dict) for image in images):
+        images = _get_images_metadata(
+            project, [
+                image["name"] if isinstance(image, dict) else image
+                for image in images
+            ]
+        )
+    # warms up annotation classes cache shared by the download threads
+    _get_annotation_classes_id_to_name(project)
+    project_type = project["type"]
+    images = iter(images)
+    with ThreadPoolExecutor(num_workers) as executor:
+        futures = {}
+        try:
+            while True:
+                # keeps a bounded number of downloaded annotations in memory
+                for image in images:
+                    future = executor.submit(
+                        _get_image_annotations, project, image, project_type
+                    )
+                    futures[future] = image["name"]
+                    if len(futures) >= 2 * num_workers:
+                        break
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    image_name = futures.pop(future)
+                    try:
+                        annotation = future.result()
+                    except Exception as e:
+                        logger.warning(
+                            "Couldn't get annotations of image %s: %s",
+                            image_name, e
+                        )
+                        continue
+                    yield (
+                        image_name, annotation["annotation_json"],
+                        annotation.get("annotation_mask")
+                    )
+        finally:
+            for future in futures:
+                future.cancel()
+
+
 def download_image_annotations(project, image_name, local_dir_path):
     """Downloads annotations of the image (JSON and mask if pixel type project)
     to local_dir_path.
@@ -744,15 +1310,12 @@ def upload_annotations_from_json_to_image(
             "Uploading annotations for image %s in project %s.", image_name,
             project_id
         )
-    annotation_classes = search_annotation_classes(project)
-    annotation_classes_dict = {}
-    for annotation_class in annotation_classes:
-        if annotation_class["name"] in annotation_classes_dict:
-            logger.warning(
-                "Duplicate annotation class name %s. Only one of the annotation classes will be used. This will result in errors in annotation upload.",
-                annotation_class["name"]
-            )
-        annotation_classes_dict[annotation_class["name"]] = annotation_class
+    annotation_classes_dict = _get_annotation_classes_name_to_id(
+        project, [
+            ann["className"] for ann in annotation_json
+            if not ("userId" in ann and ann["type"] == "meta")
+        ]
+    )
     for ann in annotation_json:
         if "userId" in ann and ann["type"] == "meta":
             continue
@@ -761,8 +1324,7 @@ def upload_annotations_from_json_to_image(
             raise SABaseException(
                 0, "Couldn't find annotation class " + annotation_class_name
             )
-        class_id = annotation_classes_dict[annotation_class_name]["id"]
-        ann["classId"] = class_id
+        ann["classId"] = annotation_classes_dict[annotation_class_name]
     params = {
         'team_id': team_id,
         'project_id': project_id,
@@ -777,39 +1339,28 @@ def upload_annotations_from_json_to_image(
         res = response.json()
         if project_type == 1:  # vector
             res = res['objects']
-            s3_session = boto3.Session(
-                aws_access_key_id=res['accessKeyId'],
-                aws_secret_access_key=res['secretAccessKey'],
-                aws_session_token=res['sessionToken']
-            )
-            s3_resource = s3_session.resource('s3')
-            bucket = s3_resource.Bucket(res["bucket"])
-            bucket.put_object(
-                Key=res['filePath'], Body=json.dumps(annotation_json)
+            s3_client = get_s3_client(res)
+            s3_client.put_object(
+                Bucket=res["bucket"],
+                Key=res['filePath'],
+                Body=json.dumps(annotation_json)
             )
         else:  # pixel
             if mask_path is None:
                 raise SABaseException(0, "Pixel annotation should have mask.")
             res_j = res['pixel']
-            s3_session = boto3.Session(
-                aws_access_key_id=res_j['accessKeyId'],
-                aws_secret_access_key=res_j['secretAccessKey'],
-                aws_session_token=res_j['sessionToken']
-            )
-            s3_resource = s3_session.resource('s3')
-            bucket = s3_resource.Bucket(res_j["bucket"])
-            bucket.put_object(
-                Key=res_j['filePath'], Body=json.dumps(annotation_json)
+            s3_client = get_s3_client(res_j)
+            s3_client.put_object(
+                Bucket=res_j["bucket"],
+                Key=res_j['filePath'],
+                Body=json.dumps(annotation_json)
             )
             res_m = res['save']
-            s3_session = boto3.Session(
-                aws_access_key_id=res_m['accessKeyId'],
-                aws_secret_access_key=res_m['secretAccessKey'],
-                aws_session_token=res_m['sessionToken']
-            )
-            s3_resource = s3_session.resource('s3')
-            bucket = s3_resource.Bucket(res_m["bucket"])
-            bucket.put_object(Key=res_m['filePath'], Body=open(mask_path, 'rb'))
+            s3_client = get_s3_client(res_m)
+            with open(mask_path, 'rb') as fin:
+                s3_client.put_object(
+                    Bucket=res_m["bucket"], Key=res_m['filePath'], Body=fin
+                )
     else:
         raise SABaseException(
             response.status_code, "Couldn't upload annotation. " + response.text
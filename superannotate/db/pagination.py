@@ -0,0 +1,85 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from ..api import API
+from ..exceptions import SABaseException
+
+_api = API.get_instance()
+
+_NUM_PAGE_THREADS = 4
+
+
+def _get_page(path, params, offset, error_message):
+    response = _api.send_request(
+        req_type='GET', path=path, params=dict(params, offset=offset)
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, error_message + response.text
+        )
+    return response.json()
+
+
+def iter_pages(path, params, error_message, num_threads=_NUM_PAGE_THREADS):
+    """Yields pages (lists of items) of an offset paginated GET endpoint in
+    order. After the first page, the remaining offsets are known from its
+    count and up to num_threads next pages are fetched concurrently while the
+    current one is consumed. If a page comes back shorter than the first one
+    (e.g., the server page size differs or items were removed meanwhile), the
+    rest is fetched sequentially, offset by offset.
+
+    :param path: endpoint path, e.g., '/images'
+    :type path: str
+    :param params: request params without offset
+    :type params: dict
+    :param error_message: SABaseException message prefix on request error
+    :type error_message: str
+    :param num_threads: maximum number of concurrently fetched pages
+    :type num_threads: int
+    """
+    res = _get_page(path, params, 0, error_message)
+    data, count = res["data"], res["count"]
+    if data:
+        yield data
+    total_got = page_size = len(data)
+    if page_size > 0 and count > total_got:
+        with ThreadPoolExecutor(num_threads) as executor:
+            futures = collections.deque()
+            next_offset = total_got
+            try:
+                while True:
+                    while len(futures) < num_threads and next_offset < count:
+                        futures.append(
+                            executor.submit(
+                                _get_page, path, params, next_offset,
+                                error_message
+                            )
+                        )
+                        next_offset += page_size
+                    if not futures:
+                        break
+                    res = futures.popleft().result()
+                    data, count = res["data"], res["count"]
+                    if data:
+                        yield data
+                    total_got += len(data)
+                    if len(data) != page_size:
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+    while count > total_got:
+        res = _get_page(path, params, total_got, error_message)
+        data, count = res["data"], res["count"]
+        if not data:
+            break
+        yield data
+        total_got += len(data)
+
+
+def iter_items(path, params, error_message, num_threads=_NUM_PAGE_THREADS):
+    """Yields items of an offset paginated GET endpoint in order, see
+    iter_pages.
+    """
+    for page in iter_pages(path, params, error_message, num_threads):
+        yield from page
@@ -2,29 +2,43 @@ import io
 import json
 import logging
 import math
+import queue
 import sys
 import threading
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+)
 from pathlib import Path
 import re
 
-import boto3
 from PIL import Image
 from tqdm import tqdm
 
 from ..api import API
+from ..aws import get_s3_client, invalidate_s3_client
 from ..common import (
     annotation_status_str_to_int, project_type_int_to_str,
     project_type_str_to_int, user_role_str_to_int
 )
 from ..exceptions import SABaseException
-from .annotation_classes import search_annotation_classes
-from .images import get_image_metadata, delete_image, get_image_bytes
+from ..manifest import UploadManifest
+from ..waiter import wait_until
+from .annotation_classes import (
+    _annotation_classes_cache, _get_annotation_classes_name_to_id
+)
+from .images import (
+    _download_image_to_file, _root_folder_ids_cache, clear_image_metadata_index,
+    delete_image, get_image_bytes, get_image_metadata, search_images
+)
+from .pagination import iter_items
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
 _NUM_THREADS = 10
+_NUM_UPLOAD_RETRIES = 3
+_S3_UPLOAD_FIRST_CHECK_DELAY = 5
 
 _RESIZE_CONFIG = {2: 4_000_000, 1: 100_000_000}  # 1: vector 2: pixel
 
@@ -40,26 +54,23 @@ def search_projects(name=None):
     :return: dict objects representing found projects
     :rtype: list
     """
-    result_list = []
-    params = {'team_id': str(_api.team_id), 'offset': 0}
+    return list(iter_projects(name))
+
+
+def iter_projects(name=None):
+    """Lazy variant of search_projects. Yields projects as result pages
+    arrive, the next pages are fetched in the background.
+
+    :param name: search string
+    :type name: str
+
+    :return: generator of dict objects representing found projects
+    :rtype: generator of dicts
+    """
+    params = {'team_id': str(_api.team_id)}
     if name is not None:
         params['name'] = name
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/projects', params=params
-        )
-        if response.ok:
-            new_results = response.json()
-            result_list += new_results["data"]
-            if response.json()["count"] <= len(result_list):
-                break
-            params["offset"] = len(result_list)
-        else:
-            raise SABaseException(
-                response.status_code,
-                "Couldn't search projects." + response.text
-            )
-    return result_list
+    yield from iter_items('/projects', params, "Couldn't search projects.")
 
 
 def create_project(project_name, project_description, project_type):
@@ -113,6 +124,9 @@ def delete_project(project):
         raise SABaseException(
             response.status_code, "Couldn't delete project " + response.text
         )
+    _annotation_classes_cache.invalidate(project_id)
+    _root_folder_ids_cache.invalidate(project_id)
+    clear_image_metadata_index(project)
     logger.info("Successfully deleted project with ID %s.", project_id)
 
 
@@ -170,7 +184,10 @@ def upload_images_from_folder_to_project(
     from_s3_bucket=None,
     exclude_file_patterns=None,
     recursive_subfolders=False,
-    image_quality_in_editor=None
+    image_quality_in_editor=None,
+    num_workers=None,
+    num_processes=None,
+    manifest_path=None
 ):
     """Uploads all images with given extensions from folder_path to the project.
     Sets status of all the uploaded images to set_status if it is not None.
@@ -195,6 +212,12 @@ def upload_images_from_folder_to_project(
     :type recursive_subfolders: bool
     :param image_quality_in_editor: image quality (in percents) that will be seen in SuperAnnotate web annotation editor. If None default value will be used.
     :type image_quality_in_editor: int
+    :param num_workers: number of concurrent upload workers, each idle worker takes the next image. If None default value will be used.
+    :type num_workers: int
+    :param num_processes: if not None, images are decoded, resized and encoded in a pool of num_processes processes while num_workers threads upload them
+    :type num_processes: int
+    :param manifest_path: if not None, uploaded images are recorded in this file and images already recorded there are skipped, so that an interrupted upload can be resumed by rerunning it with the same manifest_path
+    :type manifest_path: Pathlike (str or Path)
 
     :return: uploaded images' filepaths
     :rtype: list
@@ -226,7 +249,7 @@ def upload_images_from_folder_to_project(
             else:
                 paths += list(Path(folder_path).rglob(f'*.{extension}'))
     else:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         paginator = s3_client.get_paginator('list_objects_v2')
         response_iterator = paginator.paginate(
             Bucket=from_s3_bucket, Prefix=folder_path
@@ -253,117 +276,280 @@ def upload_images_from_folder_to_project(
 
     return upload_images_to_project(
         project, filtered_paths, annotation_status, from_s3_bucket,
-        image_quality_in_editor
+        image_quality_in_editor, num_workers, num_processes, manifest_path
     )
 
 
-def get_image_array_to_upload(
-    byte_io_orig, project_type, image_quality_in_editor
-):
+def _decode_image_to_upload(byte_io_orig, project_type):
+    """Decodes the image once into the RGB intermediate shared by all the
+    upload variants. Images larger than _RESIZE_CONFIG are downscaled, for
+    JPEG sources the decoder itself is first scaled down with draft.
+
+    :return: RGB image, original image format, whether image was resized
+    :rtype: tuple
+    """
     im = Image.open(byte_io_orig)
+    im_format = im.format
     width, height = im.size
     max_size = _RESIZE_CONFIG[project_type]
-    if (width * height) > max_size:
+    resized = (width * height) > max_size
+    if resized:
         max_size_root = math.sqrt(max_size)
         nwidth = math.floor(max_size_root * math.sqrt(width / height))
         nheight = math.floor(max_size_root * math.sqrt(height / width))
-        print(nwidth, nheight)
-        im = im.resize((nwidth, nheight))
-        byte_io_orig = io.BytesIO()
-        im.convert('RGB').save(
-            byte_io_orig, im.format, subsampling=0, quality=100
-        )
+        if im_format == "JPEG":
+            im.draft('RGB', (nwidth, nheight))
+    if im.mode != 'RGB':
+        im = im.convert('RGB')
+    if resized:
+        im = im.resize((nwidth, nheight), reducing_gap=3.0)
+    return im, im_format, resized
+
+
+def _encode_image_orig(im, im_format):
+    byte_io_orig = io.BytesIO()
+    im.save(byte_io_orig, im_format, subsampling=0, quality=100)
+    byte_io_orig.seek(0)
+    return byte_io_orig
 
+
+def _encode_image_lores(im, image_quality_in_editor):
     byte_io_lores = io.BytesIO()
-    im.convert('RGB').save(
+    im.save(
         byte_io_lores,
         'JPEG',
         subsampling=0 if image_quality_in_editor > 60 else 2,
         quality=image_quality_in_editor
     )
+    byte_io_lores.seek(0)
+    return byte_io_lores
 
-    byte_io_thumbs = io.BytesIO()
-    im.convert('RGB').resize((128, 96)).save(byte_io_thumbs, 'JPEG')
 
+def _encode_image_thumbnail(im):
+    byte_io_thumbs = io.BytesIO()
+    im.resize((128, 96), reducing_gap=3.0).save(byte_io_thumbs, 'JPEG')
     byte_io_thumbs.seek(0)
-    byte_io_lores.seek(0)
-    byte_io_orig.seek(0)
+    return byte_io_thumbs
+
+
+def get_image_array_to_upload(
+    byte_io_orig, project_type, image_quality_in_editor
+):
+    im, im_format, resized = _decode_image_to_upload(byte_io_orig, project_type)
+    if resized:
+        byte_io_orig = _encode_image_orig(im, im_format)
+    else:
+        byte_io_orig.seek(0)
+    byte_io_lores = _encode_image_lores(im, image_quality_in_editor)
+    # lores and thumbnail are encoded from the same decoded RGB image, the
+    # original file isn't decoded again
+    byte_io_thumbs = _encode_image_thumbnail(im)
 
     return byte_io_orig, byte_io_lores, byte_io_thumbs
 
 
-def __upload_images_to_aws_thread(
-    res,
-    img_paths,
-    project,
-    annotation_status,
-    prefix,
-    thread_id,
-    chunksize,
-    already_uploaded,
-    num_uploaded,
-    image_quality_in_editor,
-    from_s3_bucket=None,
-):
-    project_type = project["type"]
-    len_img_paths = len(img_paths)
-    start_index = thread_id * chunksize
-    end_index = start_index + chunksize
-    if from_s3_bucket is not None:
-        from_session = boto3.Session()
-        from_s3 = from_session.resource('s3')
-    if start_index >= len_img_paths:
-        return
-    s3_session = boto3.Session(
-        aws_access_key_id=res['accessKeyId'],
-        aws_secret_access_key=res['secretAccessKey'],
-        aws_session_token=res['sessionToken']
+class _UploadToken:
+    """Upload credentials shared between upload workers. The first worker
+    that fails with the current credentials fetches new ones, the others
+    pick up the refreshed credentials instead of fetching their own.
+    """
+    def __init__(self, get_token):
+        self._get_token = get_token
+        self._lock = threading.Lock()
+        self._token = get_token()
+
+    def get(self):
+        return self._token
+
+    def refresh(self, stale_token):
+        with self._lock:
+            if self._token is stale_token:
+                self._token = self._get_token()
+            return self._token
+
+
+def _get_sdk_image_upload_token(project):
+    team_id, project_id = project["team_id"], project["id"]
+    params = {
+        'team_id': team_id,
+    }
+    response = _api.send_request(
+        req_type='GET',
+        path=f'/project/{project_id}/sdkImageUploadToken',
+        params=params
     )
-    s3_resource = s3_session.resource('s3')
-    bucket = s3_resource.Bucket(res["bucket"])
-    prefix = res['filePath']
-    uploaded_imgs = []
-    for i in range(start_index, end_index):
-        if i >= len_img_paths:
-            break
-        if already_uploaded[i]:
-            continue
-        path = img_paths[i]
-        key = prefix + f'{Path(path).name}'
-        if from_s3_bucket is not None:
-            file = io.BytesIO()
-            from_s3_object = from_s3.Object(from_s3_bucket, path)
-            from_s3_object.download_fileobj(file)
-        else:
-            with open(path, "rb") as f:
-                file = io.BytesIO(f.read())
-        orig_image, lores_image, thumbnail_image = get_image_array_to_upload(
-            file, project_type, image_quality_in_editor
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't get upload token " + response.text
         )
+    return response.json()
+
+
+def __read_image_to_upload(path, from_s3_bucket=None):
+    if from_s3_bucket is not None:
+        file = io.BytesIO()
+        get_s3_client().download_fileobj(from_s3_bucket, path, file)
+    else:
+        with open(path, "rb") as f:
+            file = io.BytesIO(f.read())
+    return file
+
+
+def _prepare_image_for_upload(
+    path, project_type, image_quality_in_editor, from_s3_bucket=None
+):
+    """Reads the image and creates original, lores and thumbnail variants
+    bytes. Used as image processing pool process task.
+    """
+    file = __read_image_to_upload(path, from_s3_bucket)
+    images = get_image_array_to_upload(
+        file, project_type, image_quality_in_editor
+    )
+    return tuple(image.getvalue() for image in images)
+
+
+def _upload_image_to_aws(
+    path, project, upload_token, image_quality_in_editor, from_s3_bucket=None
+):
+    file = __read_image_to_upload(path, from_s3_bucket)
+    images = get_image_array_to_upload(
+        file, project["type"], image_quality_in_editor
+    )
+    return __upload_image_variants_to_aws(path, images, upload_token)
+
+
+def __upload_image_variants_to_aws(path, images, upload_token):
+    images = [
+        io.BytesIO(image) if isinstance(image, bytes) else image
+        for image in images
+    ]
+    postfixes = ('', '___lores.jpg', '___thumb.jpg')
+    res = upload_token.get()
+    for attempt in range(1, _NUM_UPLOAD_RETRIES + 1):
+        key = res['filePath'] + f'{Path(path).name}'
         try:
-            bucket.put_object(Body=orig_image, Key=key)
+            s3_client = get_s3_client(res)
+            for image, postfix in zip(images, postfixes):
+                image.seek(0)
+                s3_client.put_object(
+                    Bucket=res["bucket"], Key=key + postfix, Body=image
+                )
         except Exception as e:
-            logger.warning("Unable to upload orig_image to data server %s", e)
-            break
+            if attempt == _NUM_UPLOAD_RETRIES:
+                raise
+            logger.warning(
+                "Unable to upload image %s to data server (attempt %s of %s) %s",
+                path, attempt, _NUM_UPLOAD_RETRIES, e
+            )
+            invalidate_s3_client(res)
+            res = upload_token.refresh(res)
+        else:
+            return res['filePath']
+
+
+def __upload_images_threaded(
+    img_paths, project, upload_token, image_quality_in_editor, from_s3_bucket,
+    num_workers
+):
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = {}
+        for i, path in enumerate(img_paths):
+            future = executor.submit(
+                _upload_image_to_aws, path, project, upload_token,
+                image_quality_in_editor, from_s3_bucket
+            )
+            futures[future] = i
         try:
-            bucket.put_object(Body=lores_image, Key=key + '___lores.jpg')
-        except Exception as e:
-            logger.warning("Unable to upload lores_image to data server %s.", e)
-            break
+            for future in as_completed(futures):
+                try:
+                    prefix, error = future.result(), None
+                except Exception as e:
+                    prefix, error = None, e
+                yield futures[future], prefix, error
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def __upload_images_pipelined(
+    img_paths, project, upload_token, image_quality_in_editor, from_s3_bucket,
+    num_workers, num_processes
+):
+    prepared = queue.Queue(maxsize=2 * num_workers)
+    results = queue.Queue()
+    stop_event = threading.Event()
+
+    def put_prepared(item):
+        while not stop_event.is_set():
+            try:
+                prepared.put(item, timeout=1)
+            except queue.Full:
+                continue
+            else:
+                return
+
+    def prepare():
+        indexes = {}
+        next_index = 0
         try:
-            bucket.put_object(Body=thumbnail_image, Key=key + '___thumb.jpg')
+            with ProcessPoolExecutor(max_workers=num_processes) as pool:
+                pending = set()
+                for i, path in enumerate(img_paths):
+                    if stop_event.is_set():
+                        break
+                    if len(pending) >= 2 * num_processes:
+                        done, pending = wait(
+                            pending, return_when=FIRST_COMPLETED
+                        )
+                        for future in done:
+                            put_prepared((indexes.pop(future), future))
+                    future = pool.submit(
+                        _prepare_image_for_upload, path, project["type"],
+                        image_quality_in_editor, from_s3_bucket
+                    )
+                    indexes[future] = i
+                    pending.add(future)
+                    next_index = i + 1
+                for future in as_completed(pending):
+                    put_prepared((indexes.pop(future), future))
         except Exception as e:
-            logger.warning(
-                "Unable to upload thumbnail_image to data server %s.", e
-            )
-            break
-        num_uploaded[thread_id] += 1
-        already_uploaded[i] = True
-        uploaded_imgs.append(path)
-        if len(uploaded_imgs) >= 100:
-            __create_image(uploaded_imgs, project, annotation_status, prefix)
-            uploaded_imgs = []
-    __create_image(uploaded_imgs, project, annotation_status, prefix)
+            not_prepared = list(indexes.values())
+            not_prepared += range(next_index, len(img_paths))
+            for i in not_prepared:
+                results.put((i, None, e))
+        finally:
+            for _ in range(num_workers):
+                prepared.put(None)
+
+    def upload():
+        while True:
+            item = prepared.get()
+            if item is None:
+                return
+            i, future = item
+            if stop_event.is_set():
+                continue
+            try:
+                prefix = __upload_image_variants_to_aws(
+                    img_paths[i], future.result(), upload_token
+                )
+            except Exception as e:
+                results.put((i, None, e))
+            else:
+                results.put((i, prefix, None))
+
+    threads = [threading.Thread(target=prepare)]
+    for _ in range(num_workers):
+        threads.append(threading.Thread(target=upload))
+    for t in threads:
+        t.start()
+    try:
+        for _ in range(len(img_paths)):
+            yield results.get()
+    finally:
+        stop_event.set()
+        for t in threads:
+            t.join()
 
 
 def __create_image(img_paths, project, annotation_status, remote_dir):
@@ -423,11 +609,9 @@ def upload_image_to_project(
     if not isinstance(img, io.BytesIO):
         img_name = Path(img).name
         if from_s3_bucket is not None:
-            from_session = boto3.Session()
-            from_s3 = from_session.resource('s3')
-            from_s3_object = from_s3.Object(from_s3_bucket, img)
+            img_path = img
             img = io.BytesIO()
-            from_s3_object.download_fileobj(img)
+            get_s3_client().download_fileobj(from_s3_bucket, img_path, img)
         else:
             with open(img, "rb") as f:
                 img = io.BytesIO(f.read())
@@ -439,37 +623,23 @@ def upload_image_to_project(
             0, "Image name img_name should be set if img is not Pathlike"
         )
 
-    team_id, project_id = project["team_id"], project["id"]
-    params = {
-        'team_id': team_id,
-    }
-    response = _api.send_request(
-        req_type='GET',
-        path=f'/project/{project_id}/sdkImageUploadToken',
-        params=params
-    )
-    if response.ok:
-        res = response.json()
-        prefix = res['filePath']
-    else:
-        raise SABaseException(
-            response.status_code, "Couldn't get upload token " + response.text
-        )
-    s3_session = boto3.Session(
-        aws_access_key_id=res['accessKeyId'],
-        aws_secret_access_key=res['secretAccessKey'],
-        aws_session_token=res['sessionToken']
-    )
-    s3_resource = s3_session.resource('s3')
-    bucket = s3_resource.Bucket(res["bucket"])
+    res = _get_sdk_image_upload_token(project)
+    prefix = res['filePath']
+    s3_client = get_s3_client(res)
     orig_image, lores_image, thumbnail_image = get_image_array_to_upload(
         img, project["type"], image_quality_in_editor
     )
     key = prefix + f'{img_name}'
     try:
-        bucket.put_object(Body=orig_image, Key=key)
-        bucket.put_object(Body=lores_image, Key=key + '___lores.jpg')
-        bucket.put_object(Body=thumbnail_image, Key=key + '___thumb.jpg')
+        s3_client.put_object(Bucket=res["bucket"], Key=key, Body=orig_image)
+        s3_client.put_object(
+            Bucket=res["bucket"], Key=key + '___lores.jpg', Body=lores_image
+        )
+        s3_client.put_object(
+            Bucket=res["bucket"],
+            Key=key + '___thumb.jpg',
+            Body=thumbnail_image
+        )
     except Exception as e:
         raise SABaseException(0, "Couldn't upload to data server. " + e)
 
@@ -489,7 +659,10 @@ def upload_images_to_project(
     img_paths,
     annotation_status="NotStarted",
     from_s3_bucket=None,
-    image_quality_in_editor=None
+    image_quality_in_editor=None,
+    num_workers=None,
+    num_processes=None,
+    manifest_path=None
 ):
     """Uploads all images given in list of path objects in img_paths to the project.
     Sets status of all the uploaded images to set_status if it is not None.
@@ -504,75 +677,137 @@ def upload_images_to_project(
     :type from_s3_bucket: str
     :param image_quality_in_editor: image quality (in percents) that will be seen in SuperAnnotate web annotation editor. If None default value will be used.
     :type image_quality_in_editor: int
+    :param num_workers: number of concurrent upload workers, each idle worker takes the next image. If None default value will be used.
+    :type num_workers: int
+    :param num_processes: if not None, images are decoded, resized and encoded in a pool of num_processes processes while num_workers threads upload them
+    :type num_processes: int
+    :param manifest_path: if not None, uploaded images are recorded in this file and images already recorded there are skipped, so that an interrupted upload can be resumed by rerunning it with the same manifest_path
+    :type manifest_path: Pathlike (str or Path)
 
     :return: uploaded images' filepaths
     :rtype: list of str
     """
+    if manifest_path is not None:
+        with UploadManifest(manifest_path) as manifest:
+            return _upload_images_to_project(
+                project, img_paths, annotation_status, from_s3_bucket,
+                image_quality_in_editor, num_workers, num_processes, manifest
+            )
+    return _upload_images_to_project(
+        project, img_paths, annotation_status, from_s3_bucket,
+        image_quality_in_editor, num_workers, num_processes
+    )
+
+
+def _upload_images_to_project(
+    project,
+    img_paths,
+    annotation_status="NotStarted",
+    from_s3_bucket=None,
+    image_quality_in_editor=None,
+    num_workers=None,
+    num_processes=None,
+    manifest=None
+):
+    if manifest is not None:
+        img_paths = manifest.filter_pending(
+            "image", project, img_paths, from_s3_bucket
+        )
     annotation_status = annotation_status_str_to_int(annotation_status)
     if image_quality_in_editor is None:
         image_quality_in_editor = _get_project_default_image_quality_in_editor(
             project
         )
-    team_id, project_id = project["team_id"], project["id"]
+    if num_workers is None:
+        num_workers = _NUM_THREADS
+    project_id = project["id"]
     len_img_paths = len(img_paths)
     logger.info(
         "Uploading %s images to project ID %s.", len_img_paths, project_id
     )
     if len_img_paths == 0:
         return
-    params = {
-        'team_id': team_id,
-    }
-    num_uploaded = [0] * _NUM_THREADS
-    already_uploaded = [False] * len_img_paths
-    finish_event = threading.Event()
-    chunksize = int(math.ceil(len(img_paths) / _NUM_THREADS))
-    tqdm_thread = threading.Thread(
-        target=__tqdm_thread, args=(len_img_paths, num_uploaded, finish_event)
-    )
-    tqdm_thread.start()
-    while True:
-        if sum(num_uploaded) == len_img_paths:
-            break
-        response = _api.send_request(
-            req_type='GET',
-            path=f'/project/{project_id}/sdkImageUploadToken',
-            params=params
+    upload_token = _UploadToken(lambda: _get_sdk_image_upload_token(project))
+    if num_processes is None:
+        results = __upload_images_threaded(
+            img_paths, project, upload_token, image_quality_in_editor,
+            from_s3_bucket, num_workers
         )
-        if response.ok:
-            res = response.json()
-            prefix = res['filePath']
-        else:
-            raise SABaseException(
-                response.status_code,
-                "Couldn't get upload token " + response.text
-            )
-
-        threads = []
-        for thread_id in range(_NUM_THREADS):
-            t = threading.Thread(
-                target=__upload_images_to_aws_thread,
-                args=(
-                    res, img_paths, project, annotation_status, prefix,
-                    thread_id, chunksize, already_uploaded, num_uploaded,
-                    image_quality_in_editor, from_s3_bucket
+    else:
+        results = __upload_images_pipelined(
+            img_paths, project, upload_token, image_quality_in_editor,
+            from_s3_bucket, num_workers, num_processes
+        )
+    uploaded = [False] * len_img_paths
+    to_create = {}
+    try:
+        for i, prefix, error in tqdm(results, total=len_img_paths):
+            if error is not None:
+                logger.warning(
+                    "Couldn't upload image %s %s", img_paths[i], error
                 )
-            )
-            threads.append(t)
-            t.start()
-        for t in threads:
-            t.join()
-    finish_event.set()
-    tqdm_thread.join()
+                continue
+            batch = to_create.setdefault(prefix, [])
+            batch.append(i)
+            if len(batch) >= 100:
+                __create_images_batch(
+                    batch, img_paths, uploaded, project, annotation_status,
+                    prefix, from_s3_bucket, manifest
+                )
+                to_create[prefix] = []
+    finally:
+        results.close()
+    for prefix, batch in to_create.items():
+        __create_images_batch(
+            batch, img_paths, uploaded, project, annotation_status, prefix,
+            from_s3_bucket, manifest
+        )
+    logger.info("Number of images uploaded %s.", sum(uploaded))
 
-    return_paths = [str(path) for path in img_paths]
+    return_paths = [str(path) for path, ok in zip(img_paths, uploaded) if ok]
     return return_paths
 
 
+def __create_images_batch(
+    batch, img_paths, uploaded, project, annotation_status, prefix,
+    from_s3_bucket, manifest
+):
+    __create_image(
+        [img_paths[i] for i in batch], project, annotation_status, prefix
+    )
+    for i in batch:
+        uploaded[i] = True
+        if manifest is not None:
+            manifest.mark("image", project, img_paths[i], from_s3_bucket)
+
+
+def _annotation_json_with_class_ids(annotation_json, annotation_classes_dict):
+    """Returns copy of the annotation JSON with classId of each annotation set
+    from its className, the given annotation JSON isn't changed.
+    """
+    annotation_json_with_ids = []
+    for ann in annotation_json:
+        if (
+            "userId" in ann and "type" in ann and ann["type"] == "meta"
+        ) or "className" not in ann:
+            annotation_json_with_ids.append(ann)
+            continue
+        annotation_class_name = ann["className"]
+        if annotation_class_name not in annotation_classes_dict:
+            raise SABaseException(
+                0, "Couldn't find annotation class " + annotation_class_name +
+                " in project's annotation classes."
+            )
+        annotation_json_with_ids.append(
+            dict(ann, classId=annotation_classes_dict[annotation_class_name])
+        )
+    return annotation_json_with_ids
+
+
 def __upload_annotations_thread(
     team_id, project_id, project_type, anns_filenames, folder_path,
-    annotation_classes, thread_id, chunksize, num_uploaded, from_s3_bucket,
-    actually_uploaded
+    annotation_classes_dict, thread_id, chunksize, num_uploaded, from_s3_bucket,
+    actually_uploaded, on_uploaded
 ):
     NUM_TO_SEND = 500
     len_anns = len(anns_filenames)
@@ -580,22 +815,9 @@ def __upload_annotations_thread(
     if start_index >= len_anns:
         return
     end_index = min(start_index + chunksize, len_anns)
-    annotation_classes_dict = {}
-    for annotation_class in annotation_classes:
-        if annotation_class["name"] in annotation_classes_dict:
-            logger.warning(
-                "Duplicate annotation class name %s. Only one of the annotation classes will be used. This will result in errors in annotation upload.",
-                annotation_class["name"]
-            )
-        annotation_classes_dict[annotation_class["name"]] = annotation_class
-
     postfix_json = '___objects.json' if project_type == 1 else '___pixel.json'
     len_postfix_json = len(postfix_json)
     postfix_mask = '___save.png'
-    if from_s3_bucket is not None:
-        from_session = boto3.Session()
-        from_s3 = from_session.resource('s3')
-
     for i in range(start_index, end_index, NUM_TO_SEND):
         data = {"project_id": project_id, "team_id": team_id, "names": []}
         for j in range(i, i + NUM_TO_SEND):
@@ -612,13 +834,7 @@ def __upload_annotations_thread(
         if len(res["images"]) != len(data["names"]):
             logger.warning("Couldn't find all the images for annotation JSONs.")
         aws_creds = res["creds"]
-        s3_session = boto3.Session(
-            aws_access_key_id=aws_creds['accessKeyId'],
-            aws_secret_access_key=aws_creds['secretAccessKey'],
-            aws_session_token=aws_creds['sessionToken']
-        )
-        s3_resource = s3_session.resource('s3')
-        bucket = s3_resource.Bucket(aws_creds["bucket"])
+        s3_client = get_s3_client(aws_creds)
 
         for image_name, image_path in res['images'].items():
             json_filename = image_name + postfix_json
@@ -628,29 +844,23 @@ def __upload_annotations_thread(
                 )
             else:
                 file = io.BytesIO()
-                from_s3_object = from_s3.Object(
-                    from_s3_bucket, folder_path + json_filename
+                get_s3_client().download_fileobj(
+                    from_s3_bucket, folder_path + json_filename, file
                 )
-                from_s3_object.download_fileobj(file)
                 file.seek(0)
                 annotation_json = json.load(file)
 
-            for ann in annotation_json:
-                if (
-                    "userId" in ann and "type" in ann and ann["type"] == "meta"
-                ) or "className" not in ann:
-                    continue
-                annotation_class_name = ann["className"]
-                if not annotation_class_name in annotation_classes_dict:
-                    logger.error(
-                        "Couldn't find annotation class %s in project's annotation classes.",
-                        annotation_class_name
-                    )
-                    sys.exit(1)
-                class_id = annotation_classes_dict[annotation_class_name]["id"]
-                ann["classId"] = class_id
-            bucket.put_object(
-                Key=image_path + postfix_json, Body=json.dumps(annotation_json)
+            try:
+                annotation_json = _annotation_json_with_class_ids(
+                    annotation_json, annotation_classes_dict
+                )
+            except SABaseException as e:
+                logger.error(e.message)
+                sys.exit(1)
+            s3_client.put_object(
+                Bucket=aws_creds["bucket"],
+                Key=image_path + postfix_json,
+                Body=json.dumps(annotation_json)
             )
             if project_type != 1:
                 mask_filename = image_name + postfix_mask
@@ -659,20 +869,29 @@ def __upload_annotations_thread(
                         file = io.BytesIO(fin.read())
                 else:
                     file = io.BytesIO()
-                    from_s3_object = from_s3.Object(
-                        from_s3_bucket, folder_path + mask_filename
+                    get_s3_client().download_fileobj(
+                        from_s3_bucket, folder_path + mask_filename, file
                     )
-                    from_s3_object.download_fileobj(file)
                     file.seek(0)
-                bucket.put_object(Key=image_path + postfix_mask, Body=file)
+                s3_client.put_object(
+                    Bucket=aws_creds["bucket"],
+                    Key=image_path + postfix_mask,
+                    Body=file
+                )
             num_uploaded[thread_id] += 1
             actually_uploaded[thread_id].append(
                 Path(folder_path) / json_filename
             )
+            if on_uploaded is not None:
+                on_uploaded(json_filename)
 
 
 def upload_annotations_from_folder_to_project(
-    project, folder_path, from_s3_bucket=None, recursive_subfolders=False
+    project,
+    folder_path,
+    from_s3_bucket=None,
+    recursive_subfolders=False,
+    manifest_path=None
 ):
     """Finds and uploads all JSON files in the folder_path as annotations to the project.
 
@@ -693,6 +912,8 @@ def upload_annotations_from_folder_to_project(
     :type from_s3_bucket: str
     :param recursive_subfolders: enable recursive subfolder parsing
     :type recursive_subfolders: bool
+    :param manifest_path: if not None, uploaded annotations are recorded in this file and annotations already recorded there are skipped, so that an interrupted upload can be resumed by rerunning it with the same manifest_path
+    :type manifest_path: Pathlike (str or Path)
 
     :return: paths to annotations uploaded
     :rtype: list of strs
@@ -708,13 +929,23 @@ def upload_annotations_from_folder_to_project(
 
     logger.warning("Existing annotations will be overwritten.")
 
+    if manifest_path is not None:
+        with UploadManifest(manifest_path) as manifest:
+            return _upload_annotations_from_folder_to_project(
+                project, folder_path, from_s3_bucket, recursive_subfolders,
+                manifest
+            )
     return _upload_annotations_from_folder_to_project(
         project, folder_path, from_s3_bucket, recursive_subfolders
     )
 
 
 def _upload_annotations_from_folder_to_project(
-    project, folder_path, from_s3_bucket=None, recursive_subfolders=False
+    project,
+    folder_path,
+    from_s3_bucket=None,
+    recursive_subfolders=False,
+    manifest=None
 ):
     return_result = []
     if from_s3_bucket is not None:
@@ -725,10 +956,11 @@ def _upload_annotations_from_folder_to_project(
             for path in Path(folder_path).glob('*'):
                 if path.is_dir():
                     return_result += _upload_annotations_from_folder_to_project(
-                        project, path, from_s3_bucket, recursive_subfolders
+                        project, path, from_s3_bucket, recursive_subfolders,
+                        manifest
                     )
         else:
-            s3_client = boto3.client('s3')
+            s3_client = get_s3_client()
             result = s3_client.list_objects(
                 Bucket=from_s3_bucket, Prefix=folder_path, Delimiter='/'
             )
@@ -737,7 +969,7 @@ def _upload_annotations_from_folder_to_project(
                 for o in results:
                     return_result += _upload_annotations_from_folder_to_project(
                         project, o.get('Prefix'), from_s3_bucket,
-                        recursive_subfolders
+                        recursive_subfolders, manifest
                     )
 
     team_id, project_id, project_type = project["team_id"], project[
@@ -756,7 +988,7 @@ def _upload_annotations_from_folder_to_project(
                 annotations_paths.append(path)
                 annotations_filenames.append(path.name)
     else:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         paginator = s3_client.get_paginator('list_objects_v2')
         response_iterator = paginator.paginate(
             Bucket=from_s3_bucket, Prefix=folder_path
@@ -772,6 +1004,20 @@ def _upload_annotations_from_folder_to_project(
                     annotations_paths.append(key)
                     annotations_filenames.append(Path(key).name)
 
+    if manifest is not None:
+        annotations_paths = manifest.filter_pending(
+            "annotation", project, annotations_paths, from_s3_bucket
+        )
+        annotations_filenames = [Path(p).name for p in annotations_paths]
+
+        def on_uploaded(json_filename):
+            if from_s3_bucket is None:
+                path = Path(folder_path) / json_filename
+            else:
+                path = folder_path + json_filename
+            manifest.mark("annotation", project, path, from_s3_bucket)
+    else:
+        on_uploaded = None
     len_annotations_paths = len(annotations_paths)
     logger.info(
         "Uploading %s annotations to project ID %s.", len_annotations_paths,
@@ -790,7 +1036,7 @@ def _upload_annotations_from_folder_to_project(
     )
     tqdm_thread.start()
 
-    annotation_classes = search_annotation_classes(project)
+    annotation_classes_dict = _get_annotation_classes_name_to_id(project)
     chunksize = int(math.ceil(len_annotations_paths / _NUM_THREADS))
     threads = []
     for thread_id in range(_NUM_THREADS):
@@ -798,8 +1044,8 @@ def _upload_annotations_from_folder_to_project(
             target=__upload_annotations_thread,
             args=(
                 team_id, project_id, project_type, annotations_filenames,
-                folder_path, annotation_classes, thread_id, chunksize,
-                num_uploaded, from_s3_bucket, actually_uploaded
+                folder_path, annotation_classes_dict, thread_id, chunksize,
+                num_uploaded, from_s3_bucket, actually_uploaded, on_uploaded
             )
         )
         threads.append(t)
@@ -817,37 +1063,20 @@ def _upload_annotations_from_folder_to_project(
 
 def __upload_preannotations_thread(
     aws_creds, project_type, preannotations_filenames, folder_path,
-    annotation_classes, thread_id, chunksize, num_uploaded, already_uploaded,
-    from_s3_bucket
+    annotation_classes_dict, thread_id, chunksize, num_uploaded,
+    already_uploaded, from_s3_bucket, on_uploaded
 ):
     len_preanns = len(preannotations_filenames)
     start_index = thread_id * chunksize
     if start_index >= len_preanns:
         return
     end_index = min(start_index + chunksize, len_preanns)
-    s3_session = boto3.Session(
-        aws_access_key_id=aws_creds['accessKeyId'],
-        aws_secret_access_key=aws_creds['secretAccessKey'],
-        aws_session_token=aws_creds['sessionToken']
-    )
-    s3_resource = s3_session.resource('s3')
-    bucket = s3_resource.Bucket(aws_creds["bucket"])
+    s3_client = get_s3_client(aws_creds)
 
     postfix_json = '___objects.json' if project_type == 1 else '___pixel.json'
     len_postfix_json = len(postfix_json)
     postfix_mask = '___save.png'
-    if from_s3_bucket is not None:
-        from_session = boto3.Session()
-        from_s3 = from_session.resource('s3')
 
-    annotation_classes_dict = {}
-    for annotation_class in annotation_classes:
-        if annotation_class["name"] in annotation_classes_dict:
-            logger.warning(
-                "Duplicate annotation class name %s. Only one of the annotation classes will be used. This will result in errors in annotation upload.",
-                annotation_class["name"]
-            )
-        annotation_classes_dict[annotation_class["name"]] = annotation_class
     for i in range(start_index, end_index):
         if already_uploaded[i]:
             continue
@@ -856,28 +1085,21 @@ def __upload_preannotations_thread(
             annotation_json = json.load(open(Path(folder_path) / json_filename))
         else:
             file = io.BytesIO()
-            from_s3_object = from_s3.Object(
-                from_s3_bucket, folder_path + json_filename
+            get_s3_client().download_fileobj(
+                from_s3_bucket, folder_path + json_filename, file
             )
-            from_s3_object.download_fileobj(file)
             file.seek(0)
             annotation_json = json.load(file)
 
-        for ann in annotation_json:
-            if (
-                "userId" in ann and "type" in ann and ann["type"] == "meta"
-            ) or "className" not in ann:
-                continue
-            annotation_class_name = ann["className"]
-            if not annotation_class_name in annotation_classes_dict:
-                logger.error(
-                    "Couldn't find annotation class %s in project's annotation classes.",
-                    annotation_class_name
-                )
-                sys.exit(1)
-            class_id = annotation_classes_dict[annotation_class_name]["id"]
-            ann["classId"] = class_id
-        bucket.put_object(
+        try:
+            annotation_json = _annotation_json_with_class_ids(
+                annotation_json, annotation_classes_dict
+            )
+        except SABaseException as e:
+            logger.error(e.message)
+            sys.exit(1)
+        s3_client.put_object(
+            Bucket=aws_creds["bucket"],
             Key=aws_creds["filePath"] + f"/{json_filename}",
             Body=json.dumps(annotation_json)
         )
@@ -888,16 +1110,19 @@ def __upload_preannotations_thread(
                     file = io.BytesIO(fin.read())
             else:
                 file = io.BytesIO()
-                from_s3_object = from_s3.Object(
-                    from_s3_bucket, folder_path + mask_filename
+                get_s3_client().download_fileobj(
+                    from_s3_bucket, folder_path + mask_filename, file
                 )
-                from_s3_object.download_fileobj(file)
                 file.seek(0)
-            bucket.put_object(
-                Key=aws_creds['filePath'] + f'/{mask_filename}', Body=file
+            s3_client.put_object(
+                Bucket=aws_creds["bucket"],
+                Key=aws_creds['filePath'] + f'/{mask_filename}',
+                Body=file
             )
         num_uploaded[thread_id] += 1
         already_uploaded[i] = True
+        if on_uploaded is not None:
+            on_uploaded(json_filename)
 
 
 def __tqdm_thread(total_num, current_nums, finish_event):
@@ -912,7 +1137,11 @@ def __tqdm_thread(total_num, current_nums, finish_event):
 
 
 def upload_preannotations_from_folder_to_project(
-    project, folder_path, from_s3_bucket=None, recursive_subfolders=False
+    project,
+    folder_path,
+    from_s3_bucket=None,
+    recursive_subfolders=False,
+    manifest_path=None
 ):
     """Finds and uploads all JSON files in the folder_path as pre-annotations to the project.
 
@@ -933,6 +1162,8 @@ def upload_preannotations_from_folder_to_project(
     :type from_s3_bucket: str
     :param recursive_subfolders: enable recursive subfolder parsing
     :type recursive_subfolders: bool
+    :param manifest_path: if not None, uploaded pre-annotations are recorded in this file and pre-annotations already recorded there are skipped, so that an interrupted upload can be resumed by rerunning it with the same manifest_path
+    :type manifest_path: Pathlike (str or Path)
 
     :return: paths to pre-annotations uploaded
     :rtype: list of strs
@@ -948,13 +1179,23 @@ def upload_preannotations_from_folder_to_project(
     logger.warning(
         "Identically named existing pre-annotations will be overwritten."
     )
+    if manifest_path is not None:
+        with UploadManifest(manifest_path) as manifest:
+            return _upload_preannotations_from_folder_to_project(
+                project, folder_path, from_s3_bucket, recursive_subfolders,
+                manifest
+            )
     return _upload_preannotations_from_folder_to_project(
         project, folder_path, from_s3_bucket, recursive_subfolders
     )
 
 
 def _upload_preannotations_from_folder_to_project(
-    project, folder_path, from_s3_bucket=None, recursive_subfolders=False
+    project,
+    folder_path,
+    from_s3_bucket=None,
+    recursive_subfolders=False,
+    manifest=None
 ):
     return_result = []
     if from_s3_bucket is not None:
@@ -965,10 +1206,11 @@ def _upload_preannotations_from_folder_to_project(
             for path in Path(folder_path).glob('*'):
                 if path.is_dir():
                     return_result += _upload_preannotations_from_folder_to_project(
-                        project, path, from_s3_bucket, recursive_subfolders
+                        project, path, from_s3_bucket, recursive_subfolders,
+                        manifest
                     )
         else:
-            s3_client = boto3.client('s3')
+            s3_client = get_s3_client()
             result = s3_client.list_objects(
                 Bucket=from_s3_bucket, Prefix=folder_path, Delimiter='/'
             )
@@ -977,7 +1219,7 @@ def _upload_preannotations_from_folder_to_project(
                 for o in results:
                     return_result += _upload_preannotations_from_folder_to_project(
                         project, o.get('Prefix'), from_s3_bucket,
-                        recursive_subfolders
+                        recursive_subfolders, manifest
                     )
 
     team_id, project_id, project_type = project["team_id"], project[
@@ -996,7 +1238,7 @@ def _upload_preannotations_from_folder_to_project(
                 preannotations_paths.append(path)
                 preannotations_filenames.append(path.name)
     else:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         paginator = s3_client.get_paginator('list_objects_v2')
         response_iterator = paginator.paginate(
             Bucket=from_s3_bucket, Prefix=folder_path
@@ -1012,6 +1254,20 @@ def _upload_preannotations_from_folder_to_project(
                     preannotations_paths.append(key)
                     preannotations_filenames.append(Path(key).name)
 
+    if manifest is not None:
+        preannotations_paths = manifest.filter_pending(
+            "preannotation", project, preannotations_paths, from_s3_bucket
+        )
+        preannotations_filenames = [Path(p).name for p in preannotations_paths]
+
+        def on_uploaded(json_filename):
+            if from_s3_bucket is None:
+                path = Path(folder_path) / json_filename
+            else:
+                path = folder_path + json_filename
+            manifest.mark("preannotation", project, path, from_s3_bucket)
+    else:
+        on_uploaded = None
     len_preannotations_paths = len(preannotations_paths)
     logger.info(
         "Uploading %s preannotations to project ID %s.",
@@ -1029,7 +1285,7 @@ def _upload_preannotations_from_folder_to_project(
         args=(len_preannotations_paths, num_uploaded, finish_event)
     )
     tqdm_thread.start()
-    annotation_classes = search_annotation_classes(project)
+    annotation_classes_dict = _get_annotation_classes_name_to_id(project)
     while True:
         if sum(num_uploaded) == len_preannotations_paths:
             break
@@ -1048,8 +1304,8 @@ def _upload_preannotations_from_folder_to_project(
                 target=__upload_preannotations_thread,
                 args=(
                     aws_creds, project_type, preannotations_filenames,
-                    folder_path, annotation_classes, thread_id, chunksize,
-                    num_uploaded, already_uploaded, from_s3_bucket
+                    folder_path, annotation_classes_dict, thread_id, chunksize,
+                    num_uploaded, already_uploaded, from_s3_bucket, on_uploaded
                 )
             )
             threads.append(t)
@@ -1062,6 +1318,256 @@ def _upload_preannotations_from_folder_to_project(
     return return_result + [str(p) for p in preannotations_paths]
 
 
+def _get_preannotation_upload_creds(project):
+    params = {
+        'team_id': project["team_id"],
+        'creds_only': True,
+        'type': project["type"]
+    }
+    response = _api.send_request(
+        req_type='GET',
+        path=f'/project/{project["id"]}/preannotation',
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    return response.json()
+
+
+def _encode_mask(mask):
+    if isinstance(mask, bytes):
+        return mask
+    file = io.BytesIO()
+    Image.fromarray(mask).save(file, "PNG")
+    return file.getvalue()
+
+
+def __upload_preannotation_to_aws(
+    project_type, image_name, annotation_json, mask, annotation_classes_dict,
+    upload_token
+):
+    postfix_json = '___objects.json' if project_type == 1 else '___pixel.json'
+    postfix_mask = '___save.png'
+    if project_type != 1 and mask is None:
+        raise SABaseException(0, "Pixel project pre-annotations need a mask")
+    body_json = json.dumps(
+        _annotation_json_with_class_ids(
+            annotation_json, annotation_classes_dict
+        )
+    )
+    if project_type != 1:
+        body_mask = _encode_mask(mask)
+    res = upload_token.get()
+    for attempt in range(1, _NUM_UPLOAD_RETRIES + 1):
+        key = res['filePath'] + f'/{image_name}'
+        try:
+            s3_client = get_s3_client(res)
+            s3_client.put_object(
+                Bucket=res["bucket"], Key=key + postfix_json, Body=body_json
+            )
+            if project_type != 1:
+                s3_client.put_object(
+                    Bucket=res["bucket"],
+                    Key=key + postfix_mask,
+                    Body=body_mask
+                )
+        except Exception as e:
+            if attempt == _NUM_UPLOAD_RETRIES:
+                raise
+            logger.warning(
+                "Unable to upload pre-annotation of %s (attempt %s of %s) %s",
+                image_name, attempt, _NUM_UPLOAD_RETRIES, e
+            )
+            invalidate_s3_client(res)
+            res = upload_token.refresh(res)
+        else:
+            return
+
+
+def upload_preannotations_from_iterable(
+    project, preannotations, num_workers=None, max_pending=None
+):
+    """Uploads pre-annotations from an iterable, e.g., a generator of model
+    outputs, without writing them to files. Items are taken from the iterable
+    only as fast as num_workers threads upload them, at most max_pending
+    items wait for upload at a time, so the iterable isn't consumed ahead
+    and memory stays bounded.
+
+    WARNING: Images with the image names should be already present on the platform.
+
+    WARNING: Identically named existing pre-annotations will be overwritten.
+
+    :param project: metadata of the project to upload pre-annotations to
+    :type project: dict
+    :param preannotations: (image_name, annotation_json) tuples for Vector
+     projects, (image_name, annotation_json, mask) tuples for Pixel projects,
+     where annotation_json is SuperAnnotate format JSON and mask is
+     "___save.png" PNG bytes or RGB(A) uint8 array
+    :type preannotations: iterable of tuples
+    :param num_workers: number of upload threads. If None default value will be used.
+    :type num_workers: int
+    :param max_pending: maximum number of items taken from preannotations and not yet uploaded.
+     If None twice num_workers is used.
+    :type max_pending: int
+
+    :return: image names of uploaded pre-annotations
+    :rtype: list of strs
+    """
+    if num_workers is None:
+        num_workers = _NUM_THREADS
+    if max_pending is None:
+        max_pending = 2 * num_workers
+    project_type = project["type"]
+    logger.info("Uploading preannotations to project ID %s.", project["id"])
+    annotation_classes_dict = _get_annotation_classes_name_to_id(project)
+    upload_token = _UploadToken(
+        lambda: _get_preannotation_upload_creds(project)
+    )
+    pending = queue.Queue(maxsize=max_pending)
+    uploaded = []
+    num_failed = [0]
+    lock = threading.Lock()
+
+    def upload():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            image_name = item
+            try:
+                image_name, annotation_json = item[0], item[1]
+                mask = item[2] if len(item) > 2 else None
+                __upload_preannotation_to_aws(
+                    project_type, image_name, annotation_json, mask,
+                    annotation_classes_dict, upload_token
+                )
+            except Exception as e:
+                logger.warning(
+                    "Couldn't upload pre-annotation of %s %s", image_name, e
+                )
+                with lock:
+                    num_failed[0] += 1
+            else:
+                with lock:
+                    uploaded.append(image_name)
+            finally:
+                pbar.update(1)
+
+    threads = [threading.Thread(target=upload) for _ in range(num_workers)]
+    with tqdm() as pbar:
+        for t in threads:
+            t.start()
+        try:
+            for item in preannotations:
+                pending.put(item)
+        finally:
+            for _ in threads:
+                # don't block on a full queue if no worker is left to take
+                # the sentinel
+                while any(t.is_alive() for t in threads):
+                    try:
+                        pending.put(None, timeout=1)
+                    except queue.Full:
+                        continue
+                    break
+            for t in threads:
+                t.join()
+    logger.info(
+        "Number of preannotations uploaded %s, %s failed.", len(uploaded),
+        num_failed[0]
+    )
+    return uploaded
+
+
+def download_images_from_project(
+    project,
+    local_dir_path=".",
+    image_name_prefix=None,
+    annotation_status=None,
+    variant='original',
+    num_workers=None
+):
+    """Downloads images of the project to local_dir_path. Images are streamed
+    to disk by num_workers concurrent workers. Images already present in
+    local_dir_path with the same size are not downloaded again.
+
+    :param project: project metadata
+    :type project: dict
+    :param local_dir_path: where to download the images
+    :type local_dir_path: Pathlike (str or Path)
+    :param image_name_prefix: if not None, only images with the name prefix are downloaded
+    :type image_name_prefix: str
+    :param annotation_status: if not None, only images with the annotation status are downloaded,
+                              should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+    :param variant: which resolution to download, can be 'original' or 'lores'
+     (low resolution used in web editor)
+    :type variant: str
+    :param num_workers: number of concurrent download workers. If None default value will be used.
+    :type num_workers: int
+
+    :return: filepaths of downloaded (or already present) images and names of images that couldn't be downloaded
+    :rtype: tuple (list of strs, list of strs)
+    """
+    if not Path(local_dir_path).is_dir():
+        raise SABaseException(
+            0, f"local_dir_path {local_dir_path} is not an existing directory"
+        )
+    if num_workers is None:
+        num_workers = _NUM_THREADS
+    images = search_images(
+        project,
+        image_name_prefix,
+        annotation_status=annotation_status,
+        return_metadata=True
+    )
+    logger.info(
+        "Downloading %s images from project %s to %s.", len(images),
+        project["name"], local_dir_path
+    )
+    filepaths = []
+    for image in images:
+        image_name = image["name"]
+        if variant == "lores":
+            image_name += "___lores.jpg"
+        filepaths.append(Path(local_dir_path) / image_name)
+    downloaded = [False] * len(images)
+    num_skipped = 0
+    with ThreadPoolExecutor(num_workers) as executor, tqdm(
+        total=len(images)
+    ) as pbar:
+        futures = {}
+        for i, image in enumerate(images):
+            future = executor.submit(
+                _download_image_to_file, image, variant, filepaths[i]
+            )
+            futures[future] = i
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                if not future.result():
+                    num_skipped += 1
+            except Exception as e:
+                logger.warning(
+                    "Couldn't download image %s: %s", images[i]["name"], e
+                )
+            else:
+                downloaded[i] = True
+            pbar.update(1)
+    failed_images = [
+        image["name"] for i, image in enumerate(images) if not downloaded[i]
+    ]
+    logger.info(
+        "Downloaded %s images, %s were already present, %s failed.",
+        len(images) - len(failed_images) - num_skipped, num_skipped,
+        len(failed_images)
+    )
+    return (
+        [str(filepaths[i])
+         for i in range(len(images)) if downloaded[i]], failed_images
+    )
+
+
 def share_project(project, user, user_role):
     """Share project with user.
 
@@ -1120,7 +1626,8 @@ def upload_images_from_s3_bucket_to_project(
     secretAccessKey,
     bucket_name,
     folder_path,
-    image_quality_in_editor=None
+    image_quality_in_editor=None,
+    wait_timeout=None
 ):
     """Uploads all images from AWS S3 bucket to the project.
 
@@ -1136,6 +1643,8 @@ def upload_images_from_s3_bucket_to_project(
     :type folder_path: str
     :param image_quality_in_editor: image quality (in percents) that will be seen in SuperAnnotate web annotation editor, if None default value will be used
     :type image_quality_in_editor: int
+    :param wait_timeout: seconds to wait for the upload to finish on server. If None waits indefinitely.
+    :type wait_timeout: float
     """
     if image_quality_in_editor is not None:
         old_quality = _get_project_default_image_quality_in_editor(project)
@@ -1164,16 +1673,26 @@ def upload_images_from_s3_bucket_to_project(
             "Couldn't upload to project from S3 " + response.text
         )
     logger.info("Waiting for S3 upload to finish.")
-    while True:
-        time.sleep(5)
+    # right after the request the status may not be "in progress" yet, and
+    # any other status is an error, so the first check waits as before
+    time.sleep(_S3_UPLOAD_FIRST_CHECK_DELAY)
+
+    def check_status():
         res = _get_upload_from_s3_bucket_to_project_status(project)
         if res["progress"] == '2':
-            break
+            return res
         if res["progress"] != "1":
             raise SABaseException(
                 response.status_code,
                 "Couldn't upload to project from S3 " + response.text
             )
+        return None
+
+    wait_until(
+        check_status,
+        timeout=wait_timeout,
+        description="S3 upload to project " + project["name"]
+    )
     if image_quality_in_editor is not None:
         _set_project_default_image_quality_in_editor(project, old_quality)
 
@@ -119,6 +119,7 @@ def export_annotation_format(
     project_type="Vector",
     task="object_detection",
     platform="Web",
+    num_workers=None
 ):
     """Converts SuperAnnotate annotation formate to the other annotation formats. Currently available (project_type, task) combinations for converter
     presented below:
@@ -156,6 +157,10 @@ def export_annotation_format(
     :type task: str
     :param platform: SuperAnnotate has both 'Web' and 'Desktop' platforms. Choose from which one you are converting. (Default: "Web")
     :type platform: str
+    :param num_workers: Number of processes converting the images in parallel for 'panoptic_segmentation', 'instance_segmentation' and
+                        'object_detection' tasks. If None the images are converted in the calling process. (Default: None)
+                        The calling script should guard its main code with if __name__ == "__main__" when num_workers is used.
+    :type num_workers: int
 
     """
 
@@ -167,6 +172,7 @@ def export_annotation_format(
         project_type=project_type,
         task=task,
         platform=platform,
+        num_workers=num_workers
     )
 
     if not _passes_sanity_checks(args):
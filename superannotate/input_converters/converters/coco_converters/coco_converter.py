@@ -2,6 +2,7 @@
 """
 from datetime import datetime
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import json
 import glob
 import os
@@ -12,6 +13,8 @@ from PIL import Image
 import tqdm
 import time
 
+_IMAGES_PER_WORKER_TASK = 8
+
 
 class CoCoConverter(object):
     def __init__(
@@ -28,6 +31,7 @@ class CoCoConverter(object):
         self.output_dir = output_dir_
         self.task = task_
         self.failed_conversion_cnt = 0
+        self.num_workers = None
 
     def _create_single_category(self, item):
         category = {
@@ -48,6 +52,9 @@ class CoCoConverter(object):
     def set_dataset_name(self, dname):
         self.dataset_name = dname
 
+    def set_num_workers(self, num_workers_):
+        self.num_workers = num_workers_
+
     def increase_converted_count(self):
         self.failed_conversion_cnt = self.failed_conversion_cnt + 1
 
@@ -67,6 +74,19 @@ class CoCoConverter(object):
         ]
         return categories
 
+    def _map_images(self, function, *iterables):
+        """Yields function results over iterables in order. If num_workers
+        is more than 1 they are computed by a pool of num_workers processes,
+        so function and its arguments should be picklable.
+        """
+        if self.num_workers is None or self.num_workers <= 1:
+            yield from map(function, *iterables)
+            return
+        with ProcessPoolExecutor(self.num_workers) as executor:
+            yield from executor.map(
+                function, *iterables, chunksize=_IMAGES_PER_WORKER_TASK
+            )
+
     def _make_id_generator(self):
         cur_id = 0
         while True:
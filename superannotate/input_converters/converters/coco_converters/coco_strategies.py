@@ -1,4 +1,5 @@
 from datetime import datetime
+import itertools
 import os
 import glob
 import json
@@ -8,7 +9,7 @@ from PIL import Image
 from panopticapi.utils import IdGenerator, id2rgb
 
 from .coco_converter import CoCoConverter
-from .sa_pixel_to_coco import sa_pixel_to_coco_instance_segmentation, sa_pixel_to_coco_panoptic_segmentation, sa_pixel_to_coco_object_detection
+from .sa_pixel_to_coco import sa_pixel_to_coco_instance_segmentation, sa_pixel_to_coco_panoptic_segmentation, sa_pixel_to_coco_object_detection, count_panoptic_segments
 from .sa_vector_to_coco import sa_vector_to_coco_instance_segmentation, sa_vector_to_coco_keypoint_detection, sa_vector_to_coco_object_detection
 from .coco_to_sa_pixel import coco_panoptic_segmentation_to_sa_pixel
 from .coco_to_sa_vector import coco_keypoint_detection_to_sa_vector, coco_instance_segmentation_to_sa_vector
@@ -43,6 +44,26 @@ class PanopticConverterStrategy(CoCoConverter):
 
         return res
 
+    def _count_segments(self, json_path):
+        with open(json_path) as fp:
+            return count_panoptic_segments(json.load(fp))
+
+    def _sa_to_coco_single_with_mask(self, id_, json_path, first_segment_id):
+        res = self._sa_to_coco_single(
+            id_, json_path, itertools.count(first_segment_id)
+        )
+
+        panoptic_mask = json_path[:-len('___pixel.json')] + '.png'
+
+        Image.fromarray(id2rgb(res[2])).save(panoptic_mask)
+
+        annotation = {
+            'image_id': res[0]['id'],
+            'file_name': panoptic_mask,
+            'segments_info': res[1]
+        }
+        return res[0], annotation
+
     def sa_to_output_format(self):
         out_json = self._create_skeleton()
         out_json['categories'] = self._create_categories(
@@ -55,26 +76,24 @@ class PanopticConverterStrategy(CoCoConverter):
 
         images = []
         annotations = []
-        id_generator = self._make_id_generator()
         jsons = glob.glob(
             os.path.join(self.export_root, '*pixel.json'), recursive=True
         )
 
-        for id_, json_ in tqdm(enumerate(jsons, 1)):
-            res = self._sa_to_coco_single(id_, json_, id_generator)
-
-            panoptic_mask = json_[:-len('___pixel.json')] + '.png'
-
-            Image.fromarray(id2rgb(res[2])).save(panoptic_mask)
+        # segment IDs are written to the panoptic masks by the workers, so
+        # the first segment ID of each image is computed beforehand
+        first_segment_ids = [1]
+        for num_segments in self._map_images(self._count_segments, jsons):
+            first_segment_ids.append(first_segment_ids[-1] + num_segments)
 
-            annotation = {
-                'image_id': res[0]['id'],
-                'file_name': panoptic_mask,
-                'segments_info': res[1]
-            }
+        image_ids = range(1, len(jsons) + 1)
+        results = self._map_images(
+            self._sa_to_coco_single_with_mask, image_ids, jsons,
+            first_segment_ids
+        )
+        for image_info, annotation in tqdm(results, total=len(jsons)):
             annotations.append(annotation)
-
-            images.append(res[0])
+            images.append(image_info)
 
         out_json['annotations'] = annotations
         out_json['images'] = images
@@ -166,6 +185,15 @@ class ObjectDetectionStrategy(CoCoConverter):
         )
         return res
 
+    def _sa_to_coco_single_with_id_count(self, id_, json_path):
+        # annotation IDs start from 1 in each image and are offset when
+        # merged, the number of IDs used is returned for that
+        id_generator = self._make_id_generator()
+        image_info, annotations_per_image = self._sa_to_coco_single(
+            id_, json_path, id_generator
+        )
+        return image_info, annotations_per_image, next(id_generator) - 1
+
     def sa_to_output_format(self):
 
         out_json = self._create_skeleton()
@@ -175,17 +203,20 @@ class ObjectDetectionStrategy(CoCoConverter):
         jsons = self._load_sa_jsons()
         images = []
         annotations = []
-        id_generator = self._make_id_generator()
-        for id_, json_ in tqdm(enumerate(jsons)):
-            try:
-                res = self._sa_to_coco_single(id_, json_, id_generator)
-            except Exception as e:
-                raise
-            images.append(res[0])
-            if len(res[1]) < 1:
+        id_offset = 0
+        results = self._map_images(
+            self._sa_to_coco_single_with_id_count, range(len(jsons)), jsons
+        )
+        for image_info, annotations_per_image, num_ids in tqdm(
+            results, total=len(jsons)
+        ):
+            images.append(image_info)
+            if len(annotations_per_image) < 1:
                 self.increase_converted_count()
-            for ann in res[1]:
+            for ann in annotations_per_image:
+                ann['id'] += id_offset
                 annotations.append(ann)
+            id_offset += num_ids
         out_json['annotations'] = annotations
         out_json['images'] = images
 
@@ -4,7 +4,6 @@ import json
 import cv2
 import numpy as np
 
-from panopticapi.utils import id2rgb
 from tqdm import tqdm
 
 
@@ -41,6 +40,21 @@ def _blue_color_generator(n, hex_values=True):
     return hex_colors
 
 
+# Replaces colors of the panoptic segment IDs in the BGR image with
+# bgr_colors[i] of segment_ids[i], in one lookup for all the segments
+def _remap_segment_colors(img_bgr, segment_ids, bgr_colors):
+    blue, green, red = np.moveaxis(img_bgr.astype(np.uint32), -1, 0)
+    img_ids = red | (green << 8) | (blue << 16)
+    order = np.argsort(segment_ids, kind='stable')
+    sorted_ids = segment_ids[order]
+    indices = np.minimum(
+        np.searchsorted(sorted_ids, img_ids),
+        len(sorted_ids) - 1
+    )
+    matched = sorted_ids[indices] == img_ids
+    img_bgr[matched] = bgr_colors[order][indices[matched]]
+
+
 def coco_panoptic_segmentation_to_sa_pixel(coco_path, images_path):
     coco_json = json.load(open(coco_path))
     hex_colors = _blue_color_generator(len(coco_json["categories"]))
@@ -57,16 +71,18 @@ def coco_panoptic_segmentation_to_sa_pixel(coco_path, images_path):
             )
             continue
 
-        img = cv2.cvtColor(img_cv, cv2.COLOR_BGR2RGB)
-        H, W, C = img.shape
-        img = img.reshape((H * W, C))
         segments = annotate["segments_info"]
         hex_colors = _blue_color_generator(len(segments) + 1)
+        if segments:
+            segment_ids = np.array([seg["id"] for seg in segments])
+            bgr_colors = np.array(
+                [_hex_to_rgb(hex_color)[::-1] for hex_color in hex_colors[1:]],
+                dtype=np.uint8
+            )
+            _remap_segment_colors(img_cv, segment_ids, bgr_colors)
 
         out_json = []
         for i, seg in enumerate(segments):
-            img[np.all(img == id2rgb(seg["id"]),
-                       axis=1)] = _hex_to_rgb(hex_colors[i + 1])
             dd = {
                 "classId": seg["category_id"],
                 "probability": 100,
@@ -85,9 +101,8 @@ def coco_panoptic_segmentation_to_sa_pixel(coco_path, images_path):
         ) as writer:
             json.dump(out_json, writer, indent=2)
 
-        img = cv2.cvtColor(img.reshape((H, W, C)), cv2.COLOR_RGB2BGR)
         cv2.imwrite(
-            os.path.join(images_path, annot_name + ".jpg___save.png"), img
+            os.path.join(images_path, annot_name + ".jpg___save.png"), img_cv
         )
 
         os.remove(os.path.join(images_path, annot_name + ".png"))
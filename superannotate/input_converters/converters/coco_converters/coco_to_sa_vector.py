@@ -20,8 +20,14 @@ def dict_setter(list_of_dicts):
     ]
 
 
-def _rle_to_polygon(coco_json, annotation):
-    coco = COCO(coco_json)
+def _create_coco(coco_json):
+    coco = COCO()
+    coco.dataset = coco_json
+    coco.createIndex()
+    return coco
+
+
+def _rle_to_polygon(coco, annotation):
     binary_mask = coco.annToMask(annotation)
     contours, hierarchy = cv2.findContours(
         binary_mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
@@ -37,30 +43,47 @@ def _rle_to_polygon(coco_json, annotation):
     return segmentation
 
 
-def coco_instance_segmentation_to_sa_vector(coco_path, images_path):
-    coco_json = json.load(open(coco_path))
-    image_id_to_annotations = {}
-    cat_id_to_cat = {}
-    for cat in coco_json['categories']:
-        cat_id_to_cat[cat['id']] = cat
-
-    for annot in tqdm(coco_json['annotations'], "Converting annotations"):
-        if 'iscrowd' in annot and annot['iscrowd'] == 1:
-            try:
-                annot['segmentation'] = _rle_to_polygon(coco_path, annot)
-            except IndexError:
-                print("List index out of range")
-
-        cat = cat_id_to_cat[annot['category_id']]
-        sa_dict_bbox = {
-            'type': 'bbox',
-            'points':
-                {
-                    'x1': annot['bbox'][0],
-                    'y1': annot['bbox'][1],
-                    'x2': annot['bbox'][0] + annot['bbox'][2],
-                    'y2': annot['bbox'][1] + annot['bbox'][3]
-                },
+# Converts RLE segmentations of crowd annotations to polygons in place. The
+# COCO API object is created once and only if there are crowd annotations
+def _crowd_segmentations_to_polygons(coco_json, annotations):
+    coco = None
+    for annot in annotations:
+        if annot.get('iscrowd') != 1:
+            continue
+        if coco is None:
+            coco = _create_coco(coco_json)
+        try:
+            annot['segmentation'] = _rle_to_polygon(coco, annot)
+        except IndexError:
+            print("List index out of range")
+
+
+def _sa_bbox(annot, cat):
+    return {
+        'type': 'bbox',
+        'points':
+            {
+                'x1': annot['bbox'][0],
+                'y1': annot['bbox'][1],
+                'x2': annot['bbox'][0] + annot['bbox'][2],
+                'y2': annot['bbox'][1] + annot['bbox'][3]
+            },
+        'className': cat['name'],
+        'classId': cat['id'],
+        'attributes': [],
+        'probability': 100,
+        'locked': False,
+        'visible': True,
+        'groupId': annot['id'],
+        'imageId': annot['image_id']
+    }
+
+
+def _sa_polygons(annot, cat):
+    return [
+        {
+            'type': 'polygon',
+            'points': polygon,
             'className': cat['name'],
             'classId': cat['id'],
             'attributes': [],
@@ -69,35 +92,32 @@ def coco_instance_segmentation_to_sa_vector(coco_path, images_path):
             'visible': True,
             'groupId': annot['id'],
             'imageId': annot['image_id']
-        }
+        } for polygon in annot['segmentation']
+    ]
+
+
+def coco_instances_to_sa_objects(coco_json):
+    """Returns dict of image ID to SA vector objects of the COCO instance
+    annotations of the image: polygons of each annotation followed by its
+    bbox.
+    """
+    cat_id_to_cat = {cat['id']: cat for cat in coco_json['categories']}
+    _crowd_segmentations_to_polygons(coco_json, coco_json['annotations'])
+
+    image_id_to_annotations = defaultdict(list)
+    for annot in tqdm(coco_json['annotations'], "Converting annotations"):
+        cat = cat_id_to_cat.get(annot['category_id'])
+        if cat is None or not annot['segmentation']:
+            continue
+        sa_objects = image_id_to_annotations[annot['image_id']]
+        sa_objects.extend(_sa_polygons(annot, cat))
+        sa_objects.append(_sa_bbox(annot, cat))
+    return image_id_to_annotations
 
-        sa_polygon_loader = [
-            {
-                'type': 'polygon',
-                'points': polygon,
-                'className': cat['name'],
-                'classId': cat['id'],
-                'attributes': [],
-                'probability': 100,
-                'locked': False,
-                'visible': True,
-                'groupId': annot['id'],
-                'imageId': annot['image_id']
-            } for polygon in annot['segmentation']
-        ]
 
-        for polygon in sa_polygon_loader:
-            if polygon['imageId'] not in image_id_to_annotations:
-                image_id_to_annotations[polygon['imageId']] = [polygon]
-            else:
-                image_id_to_annotations[polygon['imageId']].append(polygon)
-            if sa_dict_bbox['imageId'] not in image_id_to_annotations:
-                image_id_to_annotations[sa_dict_bbox['imageId']] = [
-                    sa_dict_bbox
-                ]
-            else:
-                image_id_to_annotations[sa_dict_bbox['imageId']
-                                       ].append(sa_dict_bbox)
+def coco_instance_segmentation_to_sa_vector(coco_path, images_path):
+    coco_json = json.load(open(coco_path))
+    image_id_to_annotations = coco_instances_to_sa_objects(coco_json)
 
     for img in tqdm(coco_json['images'], "Writing annotations to disk"):
         if img['id'] not in image_id_to_annotations:
@@ -113,149 +133,86 @@ def coco_instance_segmentation_to_sa_vector(coco_path, images_path):
             json.dump(f_loader, new_json, indent=2)
 
 
+def _sa_template(annot, cat, sa_points):
+    sa_template = {
+        'type': 'template',
+        'classId': annot['category_id'],
+        'probability': 100,
+        'points': [],
+        'connections': [],
+        'attributes': [],
+        'attributeNames': [],
+        'groupId': annot['id'],
+        'pointLabels': {},
+        'locked': False,
+        'visible': True,
+        'templateId': -1,
+        'className': cat['name'],
+        'templateName': 'skeleton',
+        'imageId': annot['image_id']
+    }
+
+    for pl_key, kp_name in enumerate(cat['keypoints']):
+        sa_template['pointLabels'][pl_key] = kp_name
+
+    for index, connection in enumerate(cat['skeleton']):
+        sa_template['connections'].append(
+            {
+                'id': index + 1,
+                'from': connection[0],
+                'to': connection[1]
+            }
+        )
+
+    for point_index, point in enumerate(sa_points):
+        sa_template['points'].append(
+            {
+                'id': point_index + 1,
+                'x': point[0],
+                'y': point[1]
+            }
+        )
+    return sa_template
+
+
 def coco_keypoint_detection_to_sa_vector(coco_path, images_path):
     coco_json = json.load(open(coco_path))
-    loader = []
-
-    cat_id_to_cat = {}
-    for cat in coco_json["categories"]:
-        cat_id_to_cat[cat["id"]] = {
-            "name": cat["name"],
-            "keypoints": cat["keypoints"],
-            "skeleton": cat["skeleton"]
-        }
-
-    for annot in coco_json['annotations']:
-        if annot['num_keypoints'] > 0:
-            sa_points = [
-                item for index, item in enumerate(annot['keypoints'])
-                if (index + 1) % 3 != 0
-            ]
-
-            for n, i in enumerate(sa_points):
-                if i == 0:
-                    sa_points[n] = -17
-            sa_points = [
-                (sa_points[i], sa_points[i + 1])
-                for i in range(0, len(sa_points), 2)
-            ]
-
-            if annot["iscrowd"] == 1:
-                annot["segmentation"] = _rle_to_polygon(annot)
-
-            if annot["category_id"] in cat_id_to_cat.keys():
-                keypoint_names = cat_id_to_cat[annot["category_id"]
-                                              ]['keypoints']
-
-                sa_dict_bbox = {
-                    'type': 'bbox',
-                    'points':
-                        {
-                            'x1': annot['bbox'][0],
-                            'y1': annot['bbox'][1],
-                            'x2': annot['bbox'][0] + annot['bbox'][2],
-                            'y2': annot['bbox'][1] + annot['bbox'][3]
-                        },
-                    'className': cat_id_to_cat[annot["category_id"]]["name"],
-                    'classId': annot["category_id"],
-                    'pointLabels': {},
-                    'attributes': [],
-                    'probability': 100,
-                    'locked': False,
-                    'visible': True,
-                    'groupId': annot['id'],
-                    'imageId': annot['image_id']
-                }
-
-                sa_polygon_loader = [
-                    {
-                        'type':
-                            'polygon',
-                        'points':
-                            polygon,
-                        'className':
-                            cat_id_to_cat[annot["category_id"]]["name"],
-                        'classId':
-                            annot["category_id"],
-                        'pointLabels': {},
-                        'attributes': [],
-                        'probability':
-                            100,
-                        'locked':
-                            False,
-                        'visible':
-                            True,
-                        'groupId':
-                            annot['id'],
-                        'imageId':
-                            annot['image_id']
-                    } for polygon in annot['segmentation']
-                ]
-
-                sa_template = {
-                    'type': 'template',
-                    'classId': annot['category_id'],
-                    'probability': 100,
-                    'points': [],
-                    'connections': [],
-                    'attributes': [],
-                    'attributeNames': [],
-                    'groupId': annot['id'],
-                    'pointLabels': {},
-                    'locked': False,
-                    'visible': True,
-                    'templateId': -1,
-                    'className': cat_id_to_cat[annot["category_id"]]["name"],
-                    'templateName': 'skeleton',
-                    'imageId': annot['image_id']
-                }
-
-                for kp_name in keypoint_names:
-                    pl_key = keypoint_names.index(kp_name)
-                    sa_template['pointLabels'][pl_key] = kp_name
-
-                for connection in cat_id_to_cat[annot["category_id"]
-                                               ]['skeleton']:
-                    index = cat['skeleton'].index(connection)
-                    sa_template['connections'].append(
-                        {
-                            'id':
-                                index + 1,
-                            'from':
-                                cat_id_to_cat[annot["category_id"]]['skeleton']
-                                [index][0],
-                            'to':
-                                cat_id_to_cat[annot["category_id"]]['skeleton']
-                                [index][1]
-                        }
-                    )
-
-                for point in sa_points:
-                    point_index = sa_points.index(point)
-                    sa_template['points'].append(
-                        {
-                            'id': point_index + 1,
-                            'x': sa_points[point_index][0],
-                            'y': sa_points[point_index][1]
-                        }
-                    )
-
-                for img in coco_json['images']:
-                    for polygon in sa_polygon_loader:
-                        if polygon['imageId'] == img['id']:
-                            loader.append((img['id'], polygon))
-                        if sa_dict_bbox['imageId'] == img['id']:
-                            loader.append((img['id'], sa_dict_bbox))
-                        if sa_template['imageId'] == img['id']:
-                            loader.append((img['id'], sa_template))
-
-        for img in coco_json['images']:
-            f_loader = []
-            for img_id, img_data in loader:
-                if img['id'] == img_id:
-                    f_loader.append(img_data)
-            with open(
-                os.path.join(images_path, img['file_name'] + "___objects.json"),
-                "w"
-            ) as new_json:
-                json.dump(f_loader, new_json, indent=2)
+    cat_id_to_cat = {cat['id']: cat for cat in coco_json["categories"]}
+    annotations = [
+        annot
+        for annot in coco_json['annotations'] if annot['num_keypoints'] > 0
+    ]
+    _crowd_segmentations_to_polygons(coco_json, annotations)
+
+    image_id_to_annotations = defaultdict(list)
+    for annot in annotations:
+        sa_points = [
+            item for index, item in enumerate(annot['keypoints'])
+            if (index + 1) % 3 != 0
+        ]
+
+        for n, i in enumerate(sa_points):
+            if i == 0:
+                sa_points[n] = -17
+        sa_points = [
+            (sa_points[i], sa_points[i + 1])
+            for i in range(0, len(sa_points), 2)
+        ]
+
+        cat = cat_id_to_cat.get(annot["category_id"])
+        if cat is None or not annot['segmentation']:
+            continue
+
+        sa_objects = image_id_to_annotations[annot['image_id']]
+        for sa_object in _sa_polygons(annot, cat) + [_sa_bbox(annot, cat)]:
+            sa_object['pointLabels'] = {}
+            sa_objects.append(sa_object)
+        sa_objects.append(_sa_template(annot, cat, sa_points))
+
+    for img in coco_json['images']:
+        with open(
+            os.path.join(images_path, img['file_name'] + "___objects.json"), "w"
+        ) as new_json:
+            json.dump(
+                image_id_to_annotations.get(img['id'], []), new_json, indent=2
+            )
@@ -1,37 +1,89 @@
 import cv2 as cv
-from pycocotools import mask as cocomask
 import numpy as np
 
 
-def __instance_object_commons_per_instance(
-    instance, id_generator, image_commons
-):
-    if "parts" not in instance:
-        return None
-    anno_id = next(id_generator)
-    parts = [int(part["color"][1:], 16) for part in instance["parts"]]
+def _instance_label_map(flat_mask, instances):
+    """Returns label image of the instances in one pass over the mask: pixel
+    value is i + 1 if the pixel color is one of instances[i] parts' colors, 0
+    otherwise. If instances share a color the last one gets the pixels.
+    """
+    colors = []
+    labels = []
+    for label, instance in enumerate(instances, 1):
+        for part in instance['parts']:
+            colors.append(int(part['color'][1:], 16))
+            labels.append(label)
+    if not colors:
+        return np.zeros(flat_mask.shape, dtype=np.int32)
+    colors = np.array(colors, dtype=flat_mask.dtype)
+    order = np.argsort(colors, kind='stable')
+    colors = colors[order]
+    labels = np.array(labels, dtype=np.int32)[order]
+    # index of the last color not greater than the pixel color
+    indices = np.maximum(
+        np.searchsorted(colors, flat_mask, side='right') - 1, 0
+    )
+    return np.where(colors[indices] == flat_mask, labels[indices], 0)
+
+
+def _label_map_bboxes_and_areas(label_map, num_labels):
+    """Returns COCO bboxes and areas of labels 1 to num_labels of the label
+    image.
+    """
+    height, width = label_map.shape
+    areas = np.bincount(label_map.ravel(), minlength=num_labels + 1)
+    label_in_row = np.zeros((num_labels + 1, height), dtype=bool)
+    label_in_row[label_map, np.arange(height)[:, None]] = True
+    label_in_column = np.zeros((num_labels + 1, width), dtype=bool)
+    label_in_column[label_map, np.arange(width)[None, :]] = True
+    bboxes = []
+    for label in range(1, num_labels + 1):
+        if areas[label] == 0:
+            bboxes.append([0.0, 0.0, 0.0, 0.0])
+            continue
+        rows = np.flatnonzero(label_in_row[label])
+        columns = np.flatnonzero(label_in_column[label])
+        bboxes.append(
+            [
+                float(columns[0]),
+                float(rows[0]),
+                float(columns[-1] - columns[0] + 1),
+                float(rows[-1] - rows[0] + 1)
+            ]
+        )
+    return bboxes, [int(area) for area in areas[1:]]
 
-    category_id = instance['classId']
-    instance_bitmask = np.isin(image_commons.flat_mask, parts)
-    size = instance_bitmask.shape[::-1]
 
-    databytes = instance_bitmask * np.uint8(255)
+def _label_contours(label_map, label, bbox):
+    # the crop keeps a pixel of margin where possible, so the contours are
+    # the same as the ones of the whole image bitmask
+    height, width = label_map.shape
+    x0, y0 = max(int(bbox[0]) - 1, 0), max(int(bbox[1]) - 1, 0)
+    x1 = min(int(bbox[0] + bbox[2]) + 1, width)
+    y1 = min(int(bbox[1] + bbox[3]) + 1, height)
+    databytes = (label_map[y0:y1, x0:x1] == label).astype(np.uint8) * 255
     contours, hierarchy = cv.findContours(
-        databytes, cv.RETR_EXTERNAL, cv.CHAIN_APPROX_NONE
+        databytes, cv.RETR_EXTERNAL, cv.CHAIN_APPROX_NONE, offset=(x0, y0)
     )
-    coco_instance_mask = cocomask.encode(np.asfortranarray(instance_bitmask))
-
-    bbox = cocomask.toBbox(coco_instance_mask).tolist()
-    area = int(cocomask.area(coco_instance_mask))
-    return (bbox, area, contours, category_id, anno_id)
+    return contours
 
 
 def instance_object_commons(image_commons, id_generator):
     sa_ann_json = image_commons.sa_ann_json
-    commons_lst = [
-        __instance_object_commons_per_instance(x, id_generator, image_commons)
-        for x in sa_ann_json
-    ]
+    instances = [instance for instance in sa_ann_json if "parts" in instance]
+    label_map = _instance_label_map(image_commons.flat_mask, instances)
+    bboxes, areas = _label_map_bboxes_and_areas(label_map, len(instances))
+    commons_lst = []
+    label = 0
+    for instance in sa_ann_json:
+        if "parts" not in instance:
+            commons_lst.append(None)
+            continue
+        anno_id = next(id_generator)
+        bbox, area = bboxes[label], areas[label]
+        label += 1
+        contours = _label_contours(label_map, label, bbox)
+        commons_lst.append((bbox, area, contours, instance['classId'], anno_id))
     return commons_lst
 
 
@@ -86,40 +138,41 @@ def sa_pixel_to_coco_instance_segmentation(
     return (image_info, annotations_per_image)
 
 
+def count_panoptic_segments(sa_ann_json):
+    return sum(
+        1 for instance in sa_ann_json
+        if 'parts' in instance and instance['classId'] >= 0
+    )
+
+
 def sa_pixel_to_coco_panoptic_segmentation(image_commons, id_generator):
 
     sa_ann_json = image_commons.sa_ann_json
     flat_mask = image_commons.flat_mask
     ann_mask = image_commons.ann_mask
 
-    segments_info = []
-
-    for instance in sa_ann_json:
-
-        if 'parts' not in instance:
-            continue
+    instances = [
+        instance for instance in sa_ann_json
+        if 'parts' in instance and instance['classId'] >= 0
+    ]
+    label_map = _instance_label_map(flat_mask, instances)
+    bboxes, areas = _label_map_bboxes_and_areas(label_map, len(instances))
 
-        parts = [int(part['color'][1:], 16) for part in instance['parts']]
-        if instance['classId'] <0:
-            continue
-        category_id = instance['classId']
-        instance_bitmask = np.isin(flat_mask, parts)
+    segments_info = []
+    segment_ids = np.zeros(len(instances) + 1, dtype=ann_mask.dtype)
+    for label, instance in enumerate(instances, 1):
         segment_id = next(id_generator)
-        ann_mask[instance_bitmask] = segment_id
-        coco_instance_mask = cocomask.encode(
-            np.asfortranarray(instance_bitmask)
-        )
-        bbox = cocomask.toBbox(coco_instance_mask).tolist()
-        area = int(cocomask.area(coco_instance_mask))
+        segment_ids[label] = segment_id
 
         segment_info = {
             'id': segment_id,
-            'category_id': category_id,
-            'area': area,
-            'bbox': bbox,
+            'category_id': instance['classId'],
+            'area': areas[label - 1],
+            'bbox': bboxes[label - 1],
             'iscrowd': 0
         }
 
         segments_info.append(segment_info)
+    ann_mask[:] = segment_ids[label_map]
 
     return (image_commons.image_info, segments_info, image_commons.ann_mask)
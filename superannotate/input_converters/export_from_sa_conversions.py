@@ -144,6 +144,7 @@ def export_from_sa(args):
 
     if data_set is not None:
         converter.strategy.set_dataset_name(args.dataset_name + '_train')
+        converter.strategy.set_num_workers(args.num_workers)
         try:
             converter.convert_from_sa()
         except Exception as e:
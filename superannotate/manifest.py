@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+
+def _file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class UploadManifest:
+    """Append-only JSON lines file recording uploaded files, so that an
+    interrupted upload can be rerun and only the remaining files get
+    uploaded. Each line has the upload kind ("image", "annotation" or
+    "preannotation"), project ID, source path, size, mtime, SHA-1 of the
+    file and upload state. A local file counts as done if it was uploaded
+    with the same size and either the same mtime or the same SHA-1. Files
+    in S3 buckets are tracked by bucket and key only.
+    """
+    def __init__(self, path):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._records = {}
+        line = "\n"
+        if self._path.is_file():
+            with open(self._path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # last line of an interrupted run
+                        continue
+                    key = (record["kind"], record["project_id"], record["path"])
+                    self._records[key] = record
+        self._file = open(self._path, "a")
+        if not line.endswith("\n"):
+            self._file.write("\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    @staticmethod
+    def _source(path, from_s3_bucket):
+        if from_s3_bucket is not None:
+            return f"s3://{from_s3_bucket}/{path}", None
+        path = Path(path).resolve()
+        return str(path), path
+
+    def is_uploaded(self, kind, project, path, from_s3_bucket=None):
+        """Returns True if the file was already uploaded to the project and
+        didn't change since.
+        """
+        source, local_path = self._source(path, from_s3_bucket)
+        with self._lock:
+            record = self._records.get((kind, project["id"], source))
+        if record is None or record["state"] != "uploaded":
+            return False
+        if local_path is None:
+            return True
+        try:
+            stat = local_path.stat()
+        except OSError:
+            return False
+        if stat.st_size != record["size"]:
+            return False
+        if stat.st_mtime == record["mtime"]:
+            return True
+        return _file_sha1(local_path) == record["sha1"]
+
+    def filter_pending(self, kind, project, paths, from_s3_bucket=None):
+        """Returns paths that weren't uploaded yet.
+        """
+        pending = [
+            path for path in paths
+            if not self.is_uploaded(kind, project, path, from_s3_bucket)
+        ]
+        if len(pending) != len(paths):
+            logger.info(
+                "Skipping %s files already uploaded according to manifest %s.",
+                len(paths) - len(pending), self._path
+            )
+        return pending
+
+    def mark(self, kind, project, path, from_s3_bucket=None, state="uploaded"):
+        source, local_path = self._source(path, from_s3_bucket)
+        record = {
+            "kind": kind,
+            "project_id": project["id"],
+            "path": source,
+            "size": None,
+            "mtime": None,
+            "sha1": None,
+            "state": state
+        }
+        if local_path is not None and state == "uploaded":
+            stat = local_path.stat()
+            record["size"] = stat.st_size
+            record["mtime"] = stat.st_mtime
+            record["sha1"] = _file_sha1(local_path)
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._records[(kind, project["id"], source)] = record
+            self._file.write(line)
+            self._file.flush()
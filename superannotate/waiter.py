@@ -0,0 +1,104 @@
+import asyncio
+import random
+import time
+
+from .exceptions import SABaseException
+
+_INITIAL_DELAY = 0.25
+_MAX_DELAY = 5
+_BACKOFF_FACTOR = 2
+_JITTER = 0.2
+
+
+def _delays(initial_delay, max_delay, backoff_factor, jitter):
+    delay = initial_delay
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * backoff_factor, max_delay)
+
+
+def _next_delay(delays, deadline, timeout, description):
+    delay = next(delays)
+    if deadline is None:
+        return delay
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise SABaseException(
+            0, f"Timed out after {timeout} seconds waiting for {description}"
+        )
+    return min(delay, remaining)
+
+
+def wait_until(
+    check,
+    timeout=None,
+    description="operation",
+    on_wait=None,
+    initial_delay=_INITIAL_DELAY,
+    max_delay=_MAX_DELAY,
+    backoff_factor=_BACKOFF_FACTOR,
+    jitter=_JITTER
+):
+    """Polls check until it returns a value other than None and returns that
+    value. The first check is done immediately, after that the delays grow
+    exponentially from initial_delay up to max_delay, each randomized by
+    +-jitter fraction so that many waiters don't poll in lockstep.
+
+    :param check: function without arguments, returns None while not ready,
+     raises to stop waiting with an error
+    :type check: callable
+    :param timeout: seconds after which SABaseException is raised. If None waits indefinitely.
+    :type timeout: float
+    :param description: what is waited for, used in the timeout error message
+    :type description: str
+    :param on_wait: called with the number of checks done so far and the next delay in seconds before each sleep
+    :type on_wait: callable
+    :param initial_delay: delay in seconds after the first check
+    :type initial_delay: float
+    :param max_delay: maximum delay in seconds between checks
+    :type max_delay: float
+    :param backoff_factor: delay multiplier after each check
+    :type backoff_factor: float
+    :param jitter: fraction by which each delay is randomized
+    :type jitter: float
+
+    :return: first value of check other than None
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delays = _delays(initial_delay, max_delay, backoff_factor, jitter)
+    num_checks = 0
+    while True:
+        result = check()
+        num_checks += 1
+        if result is not None:
+            return result
+        delay = _next_delay(delays, deadline, timeout, description)
+        if on_wait is not None:
+            on_wait(num_checks, delay)
+        time.sleep(delay)
+
+
+async def async_wait_until(
+    check,
+    timeout=None,
+    description="operation",
+    on_wait=None,
+    initial_delay=_INITIAL_DELAY,
+    max_delay=_MAX_DELAY,
+    backoff_factor=_BACKOFF_FACTOR,
+    jitter=_JITTER
+):
+    """asyncio version of wait_until, check is a coroutine function.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delays = _delays(initial_delay, max_delay, backoff_factor, jitter)
+    num_checks = 0
+    while True:
+        result = await check()
+        num_checks += 1
+        if result is not None:
+            return result
+        delay = _next_delay(delays, deadline, timeout, description)
+        if on_wait is not None:
+            on_wait(num_checks, delay)
+        await asyncio.sleep(delay)
@@ -1,3 +1,4 @@
+import json
 import shutil
 
 import superannotate as sa
@@ -111,3 +112,47 @@ def test_sa2coco(tmpdir):
     assert keypoint_detection_sa2coco(tmpdir) == 0
     assert instance_segmentation_sa2coco_pixel(tmpdir) == 0
     assert instance_segmentation_sa2coco_vector(tmpdir) == 0
+
+
+def test_sa2coco_num_workers(tmpdir):
+    input_dir = "tests/converter_test/COCO/input/fromSuperAnnotate/cats_dogs_pixel_instance_segm"
+    outputs = []
+    for num_workers in (None, 2):
+        out_path = tmpdir / f"fromSuperAnnotate/num_workers_{num_workers}"
+        sa.export_annotation_format(
+            input_dir,
+            str(out_path),
+            "COCO",
+            "instance_test_pixel",
+            "Pixel",
+            "instance_segmentation",
+            num_workers=num_workers
+        )
+        with open(out_path / "instance_test_pixel_train.json") as fp:
+            outputs.append(json.load(fp)["annotations"])
+
+    assert outputs[0] == outputs[1]
+    ids = [annotation["id"] for annotation in outputs[1]]
+    assert len(set(ids)) == len(ids)
+
+
+def test_coco2sa_keypoint_objects(tmpdir):
+    out_path = tmpdir / "toSuperAnnotate/keypoint_objects_test"
+    sa.import_annotation_format(
+        "tests/converter_test/COCO/input/toSuperAnnotate/keypoint_detection",
+        str(out_path), "COCO", "person_keypoints_test", "Vector",
+        "keypoint_detection"
+    )
+
+    json_paths = out_path.listdir("*___objects.json")
+    assert len(json_paths) == 2
+    for json_path in json_paths:
+        with open(json_path) as fp:
+            sa_objects = json.load(fp)
+        templates = [o for o in sa_objects if o["type"] == "template"]
+        bboxes = [o for o in sa_objects if o["type"] == "bbox"]
+        assert len(templates) == len(bboxes) > 0
+        assert len({o["groupId"] for o in templates}) == len(templates)
+        for template in templates:
+            point_ids = [point["id"] for point in template["points"]]
+            assert point_ids == list(range(1, len(point_ids) + 1))
@@ -0,0 +1,56 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import superannotate as sa
+
+aio = pytest.importorskip("superannotate.aio")
+
+sa.init(Path.home() / ".superannotate" / "config.json")
+
+PROJECT_NAME = "test aio"
+
+
+def test_aio_upload_search_download(tmpdir):
+    tmpdir = Path(tmpdir)
+
+    projects_found = sa.search_projects(PROJECT_NAME)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.create_annotation_classes_from_classes_json(
+        project, "./tests/sample_project_vector/classes/classes.json"
+    )
+
+    async def run():
+        try:
+            uploaded = await aio.upload_images_to_project(
+                project,
+                list(Path("./tests/sample_project_vector").glob("*.jpg")),
+                annotation_status="InProgress"
+            )
+            assert len(uploaded) == 4
+            images = await aio.search_images(project)
+            assert sorted(images) == sorted(sa.search_images(project))
+
+            sa.upload_annotations_from_folder_to_project(
+                project, "./tests/sample_project_vector"
+            )
+            annotations = await aio.get_image_annotations(
+                project, "example_image_1.jpg"
+            )
+            assert annotations == sa.get_image_annotations(
+                project, "example_image_1.jpg"
+            )
+
+            downloaded, failed = await aio.download_images_from_project(
+                project, tmpdir
+            )
+            assert failed == []
+            assert len(downloaded) == 4
+        finally:
+            await aio.AsyncAPI.get_instance().close()
+
+    asyncio.get_event_loop().run_until_complete(run())
@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+from superannotate.exceptions import SABaseException
+
+aio = pytest.importorskip("superannotate.aio")
+
+
+def test_async_api_connection_limit():
+    async def run():
+        api = aio.AsyncAPI.get_instance(limit=20)
+        assert aio.AsyncAPI.get_instance() is api
+        assert api._get_download_session().connector.limit == 20
+        with pytest.raises(SABaseException):
+            aio.AsyncAPI.get_instance(limit=30)
+        await api.close()
+
+        api = aio.AsyncAPI.get_instance(limit=30)
+        assert api._get_download_session().connector.limit == 30
+        await api.close()
+
+    asyncio.run(run())
@@ -224,3 +224,27 @@ def test_add_bbox_noinit(tmpdir):
         open(tmpdir / f"{image_name}___objects.json")
     )
     assert len(annotations_new_export) == 2
+
+
+def test_edit_images_annotations_session():
+    project = sa.search_projects(PROJECT_NAME)[0]
+    image_names = sa.search_images(project, "example_image_")[:2]
+    annotations = {
+        image_name:
+            sa.get_image_annotations(project, image_name)["annotation_json"]
+        for image_name in image_names
+    }
+
+    with sa.edit_images_annotations(project, image_names) as session:
+        for i in range(10):
+            session.add_annotation_bbox(
+                image_names[0], [i, i, i + 10, i + 10], "test_add"
+            )
+        session.add_annotation_point(image_names[1], [5, 5], "test_add")
+
+    assert len(
+        sa.get_image_annotations(project, image_names[0])["annotation_json"]
+    ) == len(annotations[image_names[0]]) + 10
+    assert len(
+        sa.get_image_annotations(project, image_names[1])["annotation_json"]
+    ) == len(annotations[image_names[1]]) + 1
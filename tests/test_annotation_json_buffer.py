@@ -0,0 +1,122 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import superannotate as sa
+
+
+def test_edit_annotation_json(tmpdir):
+    path = Path(tmpdir) / "example_image_1.jpg___objects.json"
+    sa.add_annotation_bbox_to_json(path, [10, 10, 20, 20], "car")
+
+    with sa.edit_annotation_json(path) as annotation_json:
+        for i in range(100):
+            sa.add_annotation_point_to_json(annotation_json, [i, i], "person")
+        assert json.load(open(path))[0]["type"] == "bbox"
+        assert len(json.load(open(path))) == 1
+
+    annotations = json.load(open(path))
+    assert len(annotations) == 101
+    assert annotations[100]["x"] == 99
+    assert not path.with_name(path.name + ".part").exists()
+
+    with pytest.raises(ValueError):
+        with sa.edit_annotation_json(path) as annotation_json:
+            sa.add_annotation_point_to_json(annotation_json, [0, 0], "person")
+            raise ValueError()
+    assert len(json.load(open(path))) == 101
+
+
+def test_edit_annotation_jsons_in_folder(tmpdir):
+    tmpdir = Path(tmpdir)
+    with sa.edit_annotation_jsons_in_folder(tmpdir, 2) as writer:
+        for i in range(10):
+            for image_id in range(5):
+                sa.add_annotation_polygon_to_json(
+                    writer[f"{image_id}.jpg___objects.json"],
+                    [0, 0, i, i, 0, i], "car"
+                )
+            assert sum(
+                buffer._annotations is not None
+                for buffer in writer._buffers.values()
+            ) <= 2
+
+    for image_id in range(5):
+        annotations = json.load(open(tmpdir / f"{image_id}.jpg___objects.json"))
+        assert [a["points"][2] for a in annotations] == list(range(10))
+
+
+def test_add_annotations_from_arrays(tmpdir):
+    path = Path(tmpdir) / "example_image_1.jpg___objects.json"
+    bboxes = np.array([[10, 10, 20, 20], [30.5, 30, 40, 40]])
+
+    sa.add_annotation_bboxes_to_json(
+        path, bboxes, ["car", "person"], scores=np.array([0.9, 0.456])
+    )
+    sa.add_annotation_polygons_to_json(
+        path, [[0, 0, 1, 1, 0, 1],
+               np.array([0, 0, 2, 2, 2, 0, 0, 2])], "car"
+    )
+    annotations = sa.add_annotation_points_to_json(
+        path, np.empty((0, 2)), "car"
+    )
+
+    expected = sa.add_annotation_bbox_to_json(None, [10, 10, 20, 20], "car")
+    expected[0]["probability"] = 90
+    assert annotations[0] == expected[0]
+    assert annotations[1]["points"]["x1"] == 30.5
+    assert annotations[1]["probability"] == 46
+    assert annotations[3]["points"] == [0, 0, 2, 2, 2, 0, 0, 2]
+    assert json.load(open(path)) == annotations
+    assert len(annotations) == 4
+
+    with pytest.raises(sa.SABaseException):
+        sa.add_annotation_bboxes_to_json(path, np.zeros((2, 3)), "car")
+    with pytest.raises(sa.SABaseException):
+        sa.add_annotation_points_to_json(path, np.zeros((2, 2)), ["car"])
+    with pytest.raises(sa.SABaseException):
+        sa.add_annotation_polygons_to_json(path, [[0, 0, 1]], "car")
+
+
+def test_label_map_to_pixel_annotation():
+    label_map = np.zeros((20, 30), dtype=np.int32)
+    label_map[2:5, 3:9] = 7
+    label_map[10:, 20:] = 3
+
+    annotation_json, mask = sa.label_map_to_pixel_annotation(
+        label_map, {
+            3: "car",
+            7: "person"
+        }, scores={
+            3: 0.5,
+            7: 1
+        }
+    )
+
+    assert [a["className"] for a in annotation_json] == ["car", "person"]
+    assert [a["probability"] for a in annotation_json] == [50, 100]
+    assert [a["parts"][0]["color"]
+            for a in annotation_json] == ["#00000f", "#00001e"]
+    assert mask.shape == (20, 30, 4)
+    assert (mask[label_map == 0] == 0).all()
+    assert (mask[label_map == 3] == [0, 0, 15, 255]).all()
+    assert (mask[label_map == 7] == [0, 0, 30, 255]).all()
+
+    preannotations = list(
+        sa.label_maps_to_pixel_preannotations(
+            [("example_image_1.jpg", label_map * 1000000, "car")]
+        )
+    )
+    assert preannotations[0][0] == "example_image_1.jpg"
+    assert (preannotations[0][2] == mask).all()
+
+    with pytest.raises(sa.SABaseException):
+        sa.label_map_to_pixel_annotation(label_map, {3: "car"})
+
+    annotation_json, mask = sa.label_map_to_pixel_annotation(
+        np.zeros((0, 0), dtype=np.int32), "car"
+    )
+    assert annotation_json == []
+    assert mask.shape == (0, 0, 4)
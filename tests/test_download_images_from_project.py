@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import superannotate as sa
+
+sa.init(Path.home() / ".superannotate" / "config.json")
+
+PROJECT_NAME = "test download images from project"
+
+
+def test_download_images_from_project(tmpdir):
+    tmpdir = Path(tmpdir)
+
+    projects_found = sa.search_projects(PROJECT_NAME)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project,
+        "./tests/sample_project_vector",
+        annotation_status="InProgress"
+    )
+    sa.set_image_annotation_status(project, "example_image_1.jpg", "Completed")
+
+    downloaded, failed = sa.download_images_from_project(
+        project, tmpdir, annotation_status="Completed"
+    )
+    assert failed == []
+    assert downloaded == [str(tmpdir / "example_image_1.jpg")]
+
+    downloaded, failed = sa.download_images_from_project(project, tmpdir)
+    assert failed == []
+    assert len(downloaded) == 4
+    for image in Path("./tests/sample_project_vector").glob("*.jpg"):
+        assert (tmpdir / image.name).stat().st_size == image.stat().st_size
+    assert not list(tmpdir.glob("*.part"))
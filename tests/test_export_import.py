@@ -40,3 +40,18 @@ def test_basic_export(tmpdir):
     len_new = len(sa.search_images(project_new))
 
     assert len_new == len_orig
+
+
+def test_export_download_zip_integrity(tmpdir):
+    tmpdir = Path(tmpdir)
+
+    project = sa.search_projects(PROJECT_NAME)[0]
+    export = sa.prepare_export(project)
+
+    sa.download_export(
+        export, tmpdir, extract_zip_contents=False, check_integrity=True
+    )
+
+    zip_files = list(tmpdir.glob("*.zip"))
+    assert len(zip_files) == 1
+    assert not list(tmpdir.glob("*.part"))
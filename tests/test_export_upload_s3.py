@@ -56,6 +56,24 @@ def test_export_s3(tmpdir):
     assert len(local_files) == len(files)
 
 
+def test_export_s3_zip():
+    project = sa.search_projects(PROJECT_NAME)[0]
+    new_export = sa.prepare_export(project)
+    sa.download_export(
+        new_export,
+        S3_PREFIX + "_zip",
+        extract_zip_contents=False,
+        to_s3_bucket=S3_BUCKET
+    )
+
+    response = s3_client.list_objects_v2(
+        Bucket=S3_BUCKET, Prefix=S3_PREFIX + "_zip/"
+    )
+    keys = [object_data['Key'] for object_data in response['Contents']]
+    assert len(keys) == 1 and keys[0].endswith(".zip")
+    s3_client.delete_object(Bucket=S3_BUCKET, Key=keys[0])
+
+
 def test_from_s3_upload():
     projects = sa.search_projects(PROJECT_NAME)
     for project in projects:
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import superannotate as sa
+
+sa.init(Path.home() / ".superannotate" / "config.json")
+
+PROJECT_NAME = "test image metadata index"
+
+
+def test_image_metadata_index():
+    projects_found = sa.search_projects(PROJECT_NAME)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project,
+        "./tests/sample_project_vector",
+        annotation_status="InProgress"
+    )
+    assert sa.build_image_metadata_index(project) == 4
+
+    metadata = sa.get_image_metadata(project, "example_image_1.jpg")
+    assert metadata["name"] == "example_image_1.jpg"
+
+    sa.set_image_annotation_status(
+        project, "example_image_1.jpg", "QualityCheck"
+    )
+    metadata = sa.get_image_metadata(project, "example_image_1.jpg")
+    assert metadata["annotation_status"] == 3
+
+    sa.delete_image(project, "example_image_2.jpg")
+    try:
+        sa.get_image_metadata(project, "example_image_2.jpg")
+    except sa.SABaseException:
+        pass
+    else:
+        assert False
+
+    sa.copy_image(project, "example_image_1.jpg", project)
+    metadata = sa.get_image_metadata(project, "example_image_1_(1).jpg")
+    assert metadata["name"] == "example_image_1_(1).jpg"
+
+    sa.clear_image_metadata_index(project)
+
+
+def test_set_images_annotation_statuses():
+    projects_found = sa.search_projects(PROJECT_NAME)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project,
+        "./tests/sample_project_vector",
+        annotation_status="InProgress"
+    )
+    images = sa.search_images(project, return_metadata=True)
+    failed = sa.set_images_annotation_statuses(project, images, "Completed")
+    assert failed == []
+    assert len(sa.search_images(project, annotation_status="Completed")) == 4
+
+    failed = sa.set_images_annotation_statuses(
+        project, ["example_image_1.jpg"], "Returned"
+    )
+    assert failed == []
+    assert sa.search_images(project, annotation_status="Returned") == [
+        "example_image_1.jpg"
+    ]
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import superannotate as sa
+
+sa.init(Path.home() / ".superannotate" / "config.json")
+
+PROJECT_NAME = "test get images annotations"
+
+
+def test_get_images_annotations():
+    projects_found = sa.search_projects(PROJECT_NAME)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project, "./tests/sample_project_vector"
+    )
+    sa.create_annotation_classes_from_classes_json(
+        project, "./tests/sample_project_vector/classes/classes.json"
+    )
+    sa.upload_annotations_from_folder_to_project(
+        project, "./tests/sample_project_vector"
+    )
+
+    annotations = {
+        image_name: (annotation_json, mask)
+        for image_name, annotation_json, mask in
+        sa.get_images_annotations(project)
+    }
+    assert len(annotations) == 4
+    for image_name, (annotation_json, mask) in annotations.items():
+        assert mask is None
+        assert annotation_json == sa.get_image_annotations(project, image_name
+                                                          )["annotation_json"]
+
+    images = sa.search_images(project, "example_image_1", return_metadata=True)
+    assert [
+        image_name
+        for image_name, _, _ in sa.get_images_annotations(project, images)
+    ] == ["example_image_1.jpg"]
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import superannotate as sa
+
+sa.init(Path.home() / ".superannotate" / "config.json")
+
+PROJECT_NAME = "test iterators"
+
+
+def test_iterators():
+    projects_found = sa.search_projects(PROJECT_NAME)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project, "./tests/sample_project_vector"
+    )
+    sa.create_annotation_classes_from_classes_json(
+        project, "./tests/sample_project_vector/classes/classes.json"
+    )
+
+    assert list(sa.iter_projects(PROJECT_NAME)
+               ) == sa.search_projects(PROJECT_NAME)
+    assert list(sa.iter_images(project)) == sa.search_images(project)
+    assert list(
+        sa.iter_images(project, "example_image_1", return_metadata=True)
+    ) == sa.search_images(project, "example_image_1", return_metadata=True)
+    assert list(sa.iter_annotation_classes(project)
+               ) == sa.search_annotation_classes(project)
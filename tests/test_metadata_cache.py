@@ -0,0 +1,23 @@
+import time
+
+from superannotate.db.cache import TTLCache
+
+
+def test_ttl_cache_expiry_and_invalidation():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return len(loads)
+
+    cache = TTLCache(ttl=0.2, maxsize=2)
+    assert cache.get("a", load) == 1
+    assert cache.get("a", load) == 1
+    cache.invalidate("a")
+    assert cache.get("a", load) == 2
+    time.sleep(0.3)
+    assert cache.get("a", load) == 3
+
+    cache.get("b", load)
+    cache.get("c", load)
+    assert cache.get("a", load) == 6
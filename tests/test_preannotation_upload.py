@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pytest
@@ -43,3 +44,55 @@ def test_preannotation_folder_upload_download(
     count_out = len(list(Path(tmpdir).glob("*.json")))
 
     assert count_in == count_out
+
+
+@pytest.mark.parametrize(
+    "project_type,name,description,from_folder", [
+        (
+            "Vector", "Example Project test vector iterable", "test vector",
+            Path("./tests/sample_project_vector")
+        ),
+        (
+            "Pixel", "Example Project test pixel iterable", "test pixel",
+            Path("./tests/sample_project_pixel")
+        ),
+    ]
+)
+def test_preannotation_iterable_upload_download(
+    project_type, name, description, from_folder, tmpdir
+):
+    projects_found = sa.search_projects(name)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(name, description, project_type)
+    sa.upload_images_from_folder_to_project(
+        project, from_folder, annotation_status="InProgress"
+    )
+    sa.create_annotation_classes_from_classes_json(
+        project, from_folder / "classes" / "classes.json"
+    )
+    postfix = "___objects.json" if project_type == "Vector" else "___pixel.json"
+
+    def preannotations():
+        for json_path in from_folder.glob("*" + postfix):
+            image_name = json_path.name[:-len(postfix)]
+            annotation_json = json.load(open(json_path))
+            if project_type == "Vector":
+                yield image_name, annotation_json
+            else:
+                mask_path = from_folder / (image_name + "___save.png")
+                yield image_name, annotation_json, mask_path.read_bytes()
+
+    uploaded = sa.upload_preannotations_from_iterable(
+        project, preannotations(), max_pending=2
+    )
+    count_in = len(list(from_folder.glob("*" + postfix)))
+    assert len(uploaded) == count_in
+
+    for image_name in uploaded:
+        sa.download_image_preannotations(project, image_name, tmpdir)
+
+    count_out = len(list(Path(tmpdir).glob("*.json")))
+
+    assert count_in == count_out
@@ -0,0 +1,107 @@
+import multiprocessing
+import io
+import logging
+import os
+import time
+
+import numpy as np
+from PIL import Image
+import pytest
+
+from superannotate.db.projects import (
+    _decode_image_to_upload, _encode_image_lores, _encode_image_orig,
+    _encode_image_thumbnail, get_image_array_to_upload
+)
+
+IMAGE_SIZES = [(2000, 1500), (5472, 3648), (8000, 6000)]
+PROJECT_TYPES = {"Vector": 1, "Pixel": 2}
+IMAGE_QUALITY_IN_EDITOR = 60
+
+logger = logging.getLogger(__name__)
+
+
+def _make_jpeg(width, height):
+    x = np.linspace(0, 255, width, dtype=np.uint8)
+    y = np.linspace(0, 255, height, dtype=np.uint8)
+    img = np.dstack(
+        [
+            np.tile(x, (height, 1)),
+            np.tile(y[:, None], (1, width)),
+            np.random.randint(0, 255, (height, width), dtype=np.uint8)
+        ]
+    )
+    byte_io = io.BytesIO()
+    Image.fromarray(img).save(byte_io, "JPEG", quality=95)
+    return byte_io.getvalue()
+
+
+def _time_variants(data, project_type):
+    timings = {}
+    start = time.perf_counter()
+    im, im_format, resized = _decode_image_to_upload(
+        io.BytesIO(data), project_type
+    )
+    im.load()
+    timings["decode"] = time.perf_counter() - start
+    if resized:
+        start = time.perf_counter()
+        _encode_image_orig(im, im_format)
+        timings["orig"] = time.perf_counter() - start
+    start = time.perf_counter()
+    _encode_image_lores(im, IMAGE_QUALITY_IN_EDITOR)
+    timings["lores"] = time.perf_counter() - start
+    start = time.perf_counter()
+    _encode_image_thumbnail(im)
+    timings["thumb"] = time.perf_counter() - start
+    return timings
+
+
+def _vm_hwm_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def _peak_memory_mb(path, project_type):
+    # runs in a fresh process, peak RSS is reset right before the measurement
+    with open(path, "rb") as f:
+        data = f.read()
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    before = _vm_hwm_mb()
+    get_image_array_to_upload(
+        io.BytesIO(data), project_type, IMAGE_QUALITY_IN_EDITOR
+    )
+    return _vm_hwm_mb() - before
+
+
+@pytest.mark.skipif(
+    "AO_TEST_LEVEL" not in os.environ or
+    os.environ["AO_TEST_LEVEL"] != "stress",
+    reason="Requires env variable to be set"
+)
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/clear_refs"),
+    reason="Peak memory measurement requires Linux procfs"
+)
+def test_image_variants_benchmark(tmpdir):
+    for width, height in IMAGE_SIZES:
+        data = _make_jpeg(width, height)
+        path = str(tmpdir / f"{width}x{height}.jpg")
+        with open(path, "wb") as f:
+            f.write(data)
+        for project_type_str, project_type in PROJECT_TYPES.items():
+            timings = _time_variants(data, project_type)
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                peak_memory = pool.apply(_peak_memory_mb, (path, project_type))
+            logger.info(
+                "%sx%s %s: %s, peak memory %.1f MB", width, height,
+                project_type_str, ", ".join(
+                    f"{variant} {t * 1000:.1f} ms"
+                    for variant, t in timings.items()
+                ), peak_memory
+            )
+            # at most two full resolution copies, Pillow keeps RGB as 4 bytes
+            # per pixel
+            assert peak_memory < 2 * width * height * 4 / 2**20 + 64
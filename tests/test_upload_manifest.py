@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+from superannotate.manifest import UploadManifest
+
+PROJECT = {"id": 1}
+
+
+def test_upload_manifest(tmpdir):
+    tmpdir = Path(tmpdir)
+    manifest_path = tmpdir / "manifest.jsonl"
+    paths = []
+    for i in range(3):
+        path = tmpdir / f"{i}.jpg"
+        path.write_bytes(b"image" * (i + 1))
+        paths.append(path)
+
+    with UploadManifest(manifest_path) as manifest:
+        assert manifest.filter_pending("image", PROJECT, paths) == paths
+        manifest.mark("image", PROJECT, paths[0])
+        manifest.mark("image", PROJECT, paths[1])
+        manifest.mark("image", PROJECT, paths[2], state="failed")
+    # interrupted write
+    with open(manifest_path, "a") as f:
+        f.write('{"kind": "ima')
+
+    os.utime(paths[0], (0, 0))
+    paths[1].write_bytes(b"changed")
+    with UploadManifest(manifest_path) as manifest:
+        assert manifest.filter_pending("image", PROJECT, paths) == paths[1:]
+        assert manifest.filter_pending("annotation", PROJECT, paths) == paths
+        assert manifest.filter_pending("image", {"id": 2}, paths) == paths
+        manifest.mark("image", PROJECT, paths[1])
+    with UploadManifest(manifest_path) as manifest:
+        assert manifest.filter_pending("image", PROJECT, paths) == paths[2:]
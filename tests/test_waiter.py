@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from superannotate.exceptions import SABaseException
+from superannotate.waiter import async_wait_until, wait_until
+
+
+def test_wait_until_backoff():
+    results = iter([None, None, None, "done"])
+    delays = []
+
+    result = wait_until(
+        lambda: next(results),
+        on_wait=lambda num_checks, delay: delays.append(delay),
+        initial_delay=0.01,
+        jitter=0
+    )
+
+    assert result == "done"
+    assert delays == [0.01, 0.02, 0.04]
+
+
+def test_wait_until_timeout():
+    with pytest.raises(SABaseException):
+        wait_until(lambda: None, timeout=0.1, initial_delay=0.01)
+
+
+def test_async_wait_until():
+    results = iter([None, "done"])
+
+    async def check():
+        return next(results)
+
+    result = asyncio.get_event_loop().run_until_complete(
+        async_wait_until(check, initial_delay=0.01)
+    )
+
+    assert result == "done"